@@ -4,12 +4,15 @@ Point d'entrée principal de l'application Excel to SQLite Converter
 import typer
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+from typing import Dict, List, Optional
 import time
 import sys
 
-# Imports pour la conversion Excel -> SQLite et SQLite -> Excel
-from src.core import ExcelReader, DatabaseReader, ExcelWriter, DatabaseManager
+# Les modules lourds (pandas, openpyxl, questionary) sont importés dans les
+# commandes qui s'en servent : version, info et --help démarrent sans eux
+from src.core.db_manager import DatabaseManager, parse_index_spec, parse_storage_spec, staging_table_name
+from src.core.temporal_formats import TEMPORAL_STORAGE_TYPES, DEFAULT_TEMPORAL_STORAGE
+from src.utils.name_cleaner import is_id_column
 from src.utils.logger import (
     setup_logger,
     log_conversion_start,
@@ -24,24 +27,6 @@ from src.ui.display import (
     show_database_stats,
     clear_screen
 )
-from src.ui.convert import (
-    prompt_excel_file,
-    prompt_database_name,
-    prompt_select_sheets,
-    prompt_conflict_action,
-    prompt_database_exists_action,
-    prompt_new_database_name,
-    show_conversion_summary
-)
-
-# Imports pour l'interface de conversion SQLite -> Excel
-from src.ui.reverse import (
-    prompt_database_file,
-    prompt_excel_name,
-    prompt_select_tables,
-    prompt_excel_exists_action,
-    show_reverse_summary
-)
 
 # Constantes
 DEFAULT_CHUNK_SIZE = 10000
@@ -52,11 +37,21 @@ console = Console()
 
 @app.command()
 def convert(
-    file_path: str = typer.Option(
+    file_paths: Optional[List[str]] = typer.Option(
         None,
         "--file",
         "-f",
-        help="Chemin vers le fichier Excel à convertir"
+        help="Chemin vers le fichier Excel à convertir (répétable : conversion par lots)"
+    ),
+    dir_path: Optional[str] = typer.Option(
+        None,
+        "--dir",
+        help="Convertir tous les classeurs d'un répertoire dans une même base (conversion par lots)"
+    ),
+    pattern: str = typer.Option(
+        "*.xls*",
+        "--pattern",
+        help="Motif des fichiers à convertir avec --dir (ex: 'ventes_2024-*.xlsx')"
     ),
     db_name: str = typer.Option(
         None,
@@ -69,6 +64,69 @@ def convert(
         "--yes",
         "-y",
         help="Accepter automatiquement toutes les confirmations"
+    ),
+    fast_load: bool = typer.Option(
+        False,
+        "--fast-load",
+        help="Chargement massif (journal WAL, sans synchronisation) pendant la conversion"
+    ),
+    index_specs: Optional[List[str]] = typer.Option(
+        None,
+        "--index",
+        "-i",
+        help="Index à créer après le chargement, ex: 'Commandes:id_client,date' (répétable)"
+    ),
+    unique_index_specs: Optional[List[str]] = typer.Option(
+        None,
+        "--unique-index",
+        help="Index unique à créer après le chargement, même format que --index (répétable)"
+    ),
+    auto_index: bool = typer.Option(
+        False,
+        "--auto-index",
+        help="Indexer automatiquement les colonnes identifiants (id, id_*, *_id)"
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help="Nombre de processus pour lire les feuilles en parallèle"
+    ),
+    pipeline: bool = typer.Option(
+        True,
+        "--pipeline/--no-pipeline",
+        help="Lire le bloc suivant pendant l'insertion du bloc courant"
+    ),
+    datetime_storage: str = typer.Option(
+        DEFAULT_TEMPORAL_STORAGE,
+        "--datetime-storage",
+        help="Stockage des dates: iso (texte), epoch, epoch_ms ou julian"
+    ),
+    column_storage_specs: Optional[List[str]] = typer.Option(
+        None,
+        "--column-storage",
+        help="Stockage d'une colonne date, ex: 'Commandes:date=epoch' (répétable)"
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Ignorer les feuilles inchangées depuis la dernière conversion et remplacer les autres"
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Valider chaque bloc et reprendre une conversion interrompue là où elle s'est arrêtée"
+    ),
+    merge_key_specs: Optional[List[str]] = typer.Option(
+        None,
+        "--merge-key",
+        help="Clé de fusion d'une table existante, ex: 'Commandes:id' (répétable)"
+    ),
+    merge_delete: bool = typer.Option(
+        False,
+        "--merge-delete",
+        help="Lors d'une fusion, supprimer les lignes absentes de la feuille"
     )
 ):
     """
@@ -76,6 +134,21 @@ def convert(
     
     Mode interactif avec guidage pas à pas.
     """
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+    from src.core import ExcelReader
+    from src.core.parallel_reader import ParallelSheetReader
+    from src.core.pipeline import prefetch_chunks
+    from src.ui.convert import (
+        prompt_excel_file,
+        prompt_database_name,
+        prompt_select_sheets,
+        prompt_conflict_action,
+        prompt_database_exists_action,
+        prompt_new_database_name,
+        show_conversion_summary,
+        show_merge_result
+    )
+    
     # Nettoyer l'écran pour démarrer
     clear_screen()
     
@@ -84,7 +157,89 @@ def convert(
     log_file = project_dir / "excel_to_db.log"
     logger = setup_logger(log_file=log_file)
     
+    # Fermés dans le bloc finally, y compris après une erreur
+    reader = None
+    db_manager: Optional[DatabaseManager] = None
+    
     try:
+        # Valider les déclarations d'index avant tout traitement
+        try:
+            requested_indexes = (
+                [parse_index_spec(spec) for spec in index_specs or []] +
+                [parse_index_spec(spec, unique=True) for spec in unique_index_specs or []]
+            )
+        except ValueError as e:
+            show_error("Déclaration d'index invalide", e)
+            return
+        
+        # Valider les formats de stockage des dates
+        datetime_storage = datetime_storage.lower()
+        if datetime_storage not in TEMPORAL_STORAGE_TYPES:
+            show_error(
+                f"Format de stockage des dates inconnu: '{datetime_storage}' "
+                f"(formats acceptés: {', '.join(TEMPORAL_STORAGE_TYPES)})"
+            )
+            return
+        
+        column_storage: Dict[str, Dict[str, str]] = {}
+        try:
+            for spec in column_storage_specs or []:
+                storage_spec = parse_storage_spec(spec)
+                column_storage.setdefault(storage_spec['table'], {})[storage_spec['column']] = storage_spec['storage']
+        except ValueError as e:
+            show_error("Format de stockage de colonne invalide", e)
+            return
+        
+        # Clés de fusion, même format que les déclarations d'index
+        try:
+            merge_keys: Dict[str, List[str]] = {
+                merge_spec['table']: merge_spec['columns']
+                for merge_spec in (parse_index_spec(spec) for spec in merge_key_specs or [])
+            }
+        except ValueError as e:
+            show_error("Clé de fusion invalide", e)
+            return
+        
+        # Conversion par lots : plusieurs fichiers vers une même base
+        if dir_path or len(file_paths or []) > 1:
+            if incremental or resume:
+                show_error("--incremental et --resume ne sont pas disponibles en conversion par lots")
+                return
+            if not db_name:
+                show_error("--database est requis en conversion par lots")
+                return
+            
+            if dir_path:
+                batch_files = sorted(
+                    path for path in Path(dir_path).glob(pattern)
+                    if path.is_file() and not path.name.startswith('~$')
+                )
+            else:
+                batch_files = [Path(path) for path in file_paths]
+            
+            if not batch_files:
+                show_error(f"Aucun fichier '{pattern}' trouvé dans {dir_path}")
+                return
+            
+            _convert_batch(
+                batch_files,
+                Path(db_name if db_name.endswith('.db') else f"{db_name}.db"),
+                logger,
+                log_file,
+                fast_load=fast_load,
+                workers=workers,
+                pipeline=pipeline,
+                datetime_storage=datetime_storage,
+                column_storage=column_storage,
+                merge_keys=merge_keys,
+                merge_delete=merge_delete,
+                requested_indexes=requested_indexes,
+                auto_index=auto_index
+            )
+            return
+        
+        file_path = file_paths[0] if file_paths else None
+        
         # ÉTAPE 1: Sélection du fichier Excel
         if file_path:
             excel_path = Path(file_path)
@@ -106,7 +261,7 @@ def convert(
         with console.status("[bold green]Analyse du fichier en cours..."):
             reader = ExcelReader(excel_path, logger)
             
-            sheets_info = reader.get_all_sheets_info()
+            sheets_info = reader.discover_sheets()
         
         if not sheets_info:
             show_error("Aucune feuille valide trouvée dans le fichier")
@@ -114,7 +269,7 @@ def convert(
         
         show_success(f"{len(sheets_info)} feuille(s) détectée(s)")
         console.print()
-
+        
         # ÉTAPE 4: Choix du nom de base de données
         console.print("\n[bold cyan]Configuration de la base de données[/bold cyan]\n")
         
@@ -184,12 +339,97 @@ def convert(
         # ÉTAPE 6: Conversion
         console.print("\n[bold cyan]Conversion en cours...[/bold cyan]\n")
         
-        db_manager = DatabaseManager(db_path, logger)
+        db_manager = DatabaseManager(db_path, logger, fast_load=fast_load)
         
         total_rows_inserted = 0
         sheets_converted = 0
+        converted_sheets = []
         conversion_start_time = time.time()
         
+        # En mode incrémental, comparer l'empreinte de chaque feuille à
+        # celle enregistrée dans le manifeste de la base ; en mode reprise,
+        # l'empreinte identifie la source des points de reprise
+        content_hashes: Dict[str, str] = {}
+        if incremental or resume:
+            with console.status("[bold green]Calcul des empreintes des feuilles..."):
+                content_hashes = reader.get_content_hashes()
+        
+        # Résoudre les conflits de tables avant de lancer la conversion
+        conversion_plan = []
+        sheets_unchanged = 0
+        resume_rows: Dict[str, int] = {}
+        
+        for sheet_info in sheets_to_convert:
+            sheet_name = sheet_info['name']
+            table_name = sheet_info['table_name']
+            
+            table_exists = db_manager.table_exists(table_name)
+            checkpoint = db_manager.get_checkpoint(table_name) if resume and table_exists else None
+            
+            # Table déjà convertie à partir du même contenu
+            if (incremental or resume) and table_exists and checkpoint is None:
+                entry = db_manager.get_manifest_entry(table_name)
+                if entry is not None and entry['content_hash'] == content_hashes.get(sheet_name):
+                    show_info(f"Feuille '{sheet_name}' inchangée, ignorée")
+                    logger.info(f"Feuille '{sheet_name}' inchangée depuis le {entry['converted_at']}")
+                    sheets_unchanged += 1
+                    continue
+            
+            if checkpoint is not None:
+                if (checkpoint['sheet_name'] == sheet_name
+                        and checkpoint['source_hash'] == content_hashes.get(sheet_name)):
+                    # Poursuivre le chargement interrompu après la dernière ligne
+                    # validée, dans la table de chargement s'il s'agissait d'un
+                    # remplacement
+                    resume_rows[sheet_name] = checkpoint['rows_committed']
+                    show_info(
+                        f"Reprise de '{sheet_name}' après {checkpoint['rows_committed']:,} lignes"
+                    )
+                    staged = db_manager.table_exists(staging_table_name(table_name))
+                    if_exists = 'replace' if staged else 'append'
+                else:
+                    # La table ne contient qu'un chargement partiel d'une autre version
+                    show_info(
+                        f"La feuille '{sheet_name}' a changé depuis l'interruption, "
+                        f"conversion reprise depuis le début"
+                    )
+                    if_exists = db_manager.handle_table_conflict(table_name, 'overwrite')
+            
+            elif incremental and table_exists:
+                # Contenu modifié (ou d'origine inconnue) : remplacer la table
+                if_exists = db_manager.handle_table_conflict(table_name, 'overwrite')
+            
+            # Vérifier si la table existe déjà
+            elif table_exists:
+                existing_rows = db_manager.get_row_count(table_name)
+                
+                if auto_yes:
+                    conflict_action = 'merge' if table_name in merge_keys else 'append'
+                else:
+                    conflict_action = prompt_conflict_action(
+                        table_name, existing_rows, merge_keys.get(table_name)
+                    )
+                
+                if conflict_action == 'cancel' or conflict_action is None:
+                    show_info("Conversion annulée par l'utilisateur")
+                    db_manager.close()
+                    reader.close()
+                    return
+                
+                if conflict_action == 'skip':
+                    show_info(f"Feuille '{sheet_name}' ignorée")
+                    continue
+                
+                # Convertir l'action choisie en paramètre d'insertion
+                if_exists = db_manager.handle_table_conflict(table_name, conflict_action)
+            else:
+                if_exists = 'fail'
+            
+            conversion_plan.append((sheet_info, if_exists))
+        
+        plan_by_name = {sheet_info['name']: (sheet_info, if_exists) for sheet_info, if_exists in conversion_plan}
+        sheet_names = list(plan_by_name)
+        
         # Progress bar pour chaque feuille
         with Progress(
             SpinnerColumn(),
@@ -199,77 +439,146 @@ def convert(
             console=console
         ) as progress:
             
-            for sheet_info in sheets_to_convert:
-                sheet_name = sheet_info['name']
-                table_name = sheet_info['table_name']
-                total_rows = sheet_info['rows']
-                
-                # Vérifier si la table existe déjà
-                if db_manager.table_exists(table_name):
-                    existing_rows = db_manager.get_row_count(table_name)
-                    
-                    if auto_yes:
-                        conflict_action = 'append'
-                    else:
-                        conflict_action = prompt_conflict_action(table_name, existing_rows)
-                    
-                    if conflict_action == 'cancel' or conflict_action is None:
-                        show_info("Conversion annulée par l'utilisateur")
-                        db_manager.close()
-                        return
-                    
-                    if conflict_action == 'skip':
-                        show_info(f"Feuille '{sheet_name}' ignorée")
-                        continue
-                    
-                    # Convertir l'action choisie en paramètre pour to_sql
-                    if_exists = db_manager.handle_table_conflict(table_name, conflict_action)
-                else:
-                    if_exists = 'fail'
-                
-                # Créer une tâche pour la barre de progression
-                task = progress.add_task(
-                    f"[cyan]{sheet_name}[/cyan]",
-                    total=total_rows
+            # Créer une tâche par feuille pour la barre de progression
+            tasks = {
+                sheet_info['name']: progress.add_task(
+                    f"[cyan]{sheet_info['name']}[/cyan]",
+                    total=sheet_info['rows']
                 )
+                for sheet_info, _ in conversion_plan
+            }
+            
+            # Lire les feuilles en flux, bloc par bloc (unique lecture
+            # complète, l'analyse n'a porté que sur un échantillon), ou dans
+            # un pool de processus avec --workers ; l'écriture reste ici
+            if workers > 1 and len(sheet_names) > 1:
+                parallel_reader = ParallelSheetReader(excel_path, workers, DEFAULT_CHUNK_SIZE, logger)
+                sheet_sources = parallel_reader.iter_sheets(sheet_names, skip_rows=resume_rows)
+            else:
+                sheet_sources = (
+                    (sheet_name, reader.iter_sheet_chunks(
+                        sheet_name, DEFAULT_CHUNK_SIZE, resume_rows.get(sheet_name, 0)
+                    ))
+                    for sheet_name in sheet_names
+                )
+            
+            for sheet_name, chunks in sheet_sources:
+                sheet_info, if_exists = plan_by_name[sheet_name]
+                table_name = sheet_info['table_name']
+                task = tasks[sheet_name]
+                start_row = resume_rows.get(sheet_name, 0)
                 
-                # Lire l'intégralité de la feuille
-                df = reader.read_sheet(sheet_name)
+                # Lire le bloc suivant dans un thread pendant l'insertion
+                if pipeline:
+                    chunks = prefetch_chunks(chunks, logger=logger)
                 
                 # Insérer dans la base de données
                 sheet_start_time = time.time()
                 
                 try:
                     rows_inserted = db_manager.insert_dataframe(
-                        df,
+                        chunks,
                         table_name,
                         if_exists=if_exists,
-                        chunk_size=DEFAULT_CHUNK_SIZE
+                        chunk_size=DEFAULT_CHUNK_SIZE,
+                        on_chunk=lambda rows, task=task, start_row=start_row: progress.update(
+                            task, completed=start_row + rows
+                        ),
+                        temporal_storage=datetime_storage,
+                        column_storage=column_storage.get(table_name),
+                        manifest={
+                            'source': excel_path.name,
+                            'sheet_name': sheet_name,
+                            'content_hash': content_hashes[sheet_name]
+                        } if (incremental or resume) and sheet_name in content_hashes else None,
+                        checkpoint={
+                            'source_hash': content_hashes[sheet_name],
+                            'sheet_name': sheet_name,
+                            'start_row': start_row
+                        } if resume and sheet_name in content_hashes and if_exists != 'merge' else None,
+                        indexes=_planned_indexes(sheet_info, requested_indexes, auto_index),
+                        merge_key=merge_keys.get(table_name),
+                        merge_delete=merge_delete
                     )
                     
                     sheet_duration = time.time() - sheet_start_time
                     
-                    # Mettre à jour la barre de progression
-                    progress.update(task, completed=total_rows)
+                    # Mettre à jour la barre de progression (le total de
+                    # l'analyse peut n'être qu'une estimation)
+                    progress.update(task, total=start_row + rows_inserted, completed=start_row + rows_inserted)
+                    
+                    # Une fusion n'écrit que les lignes nouvelles ou modifiées
+                    rows_written = rows_inserted
+                    if db_manager.last_merge is not None:
+                        show_merge_result(table_name, rows_inserted, db_manager.last_merge)
+                        rows_written = db_manager.last_merge['inserted'] + db_manager.last_merge['updated']
                     
                     # Enregistrer le succès dans les logs
-                    log_conversion_success(logger, table_name, rows_inserted, sheet_duration)
+                    log_conversion_success(logger, table_name, rows_written, sheet_duration)
                     
-                    total_rows_inserted += rows_inserted
+                    total_rows_inserted += rows_written
                     sheets_converted += 1
+                    converted_sheets.append(sheet_info)
                     
                 except Exception as e:
                     log_error(logger, e, f"Conversion de '{sheet_name}'")
                     show_error(f"Erreur lors de la conversion de '{sheet_name}'", e)
                     # Continuer avec les autres feuilles restantes
                     continue
+                
+                finally:
+                    # Arrêter le thread de lecture avant de passer à la feuille
+                    # suivante : il peut encore lire les blocs de celle-ci
+                    if pipeline:
+                        chunks.close()
         
-        # Fermer la connexion à la base de données
+        # ÉTAPE 7: Création des index, une fois toutes les lignes insérées
+        # (les tables remplacées ont reçu leurs index avant l'échange)
+        converted_tables = [info['table_name'] for info in converted_sheets]
+        
+        for spec in requested_indexes:
+            if spec['table'] not in converted_tables:
+                show_info(f"Index sur '{spec['table']}' ignoré (table non convertie)")
+        
+        index_plan = [
+            spec for info in converted_sheets
+            for spec in _planned_indexes(info, requested_indexes, auto_index)
+        ]
+        
+        indexes_created = []
+        if index_plan:
+            console.print("\n[bold cyan]Création des index...[/bold cyan]\n")
+            
+            for spec in index_plan:
+                columns_str = ', '.join(spec['columns'])
+                try:
+                    with console.status(f"[bold green]Index sur {spec['table']} ({columns_str})..."):
+                        index_info = db_manager.create_index(
+                            spec['table'],
+                            spec['columns'],
+                            unique=spec['unique']
+                        )
+                    indexes_created.append(index_info)
+                    if index_info['existing']:
+                        show_info(f"Index '{index_info['name']}' déjà présent")
+                    else:
+                        show_success(
+                            f"Index '{index_info['name']}' créé en {index_info['duration']:.2f}s"
+                        )
+                except Exception as e:
+                    log_error(logger, e, f"Index sur '{spec['table']}' ({columns_str})")
+                    show_error(f"Impossible de créer l'index sur '{spec['table']}' ({columns_str})", e)
+        
+        # Fermer la connexion à la base de données et le classeur
         db_manager.close()
+        reader.close()
         
         total_duration = time.time() - conversion_start_time
         
-        # ÉTAPE 7: Résumé final
+        if sheets_unchanged:
+            show_info(f"{sheets_unchanged} feuille(s) inchangée(s) depuis la dernière conversion")
+        
+        # ÉTAPE 8: Résumé final
         console.print()
         
         # Obtenir la taille finale de la base de données
@@ -291,7 +600,8 @@ def convert(
             total_rows_inserted,
             total_duration,
             size_str,
-            str(log_file)
+            str(log_file),
+            indexes=indexes_created
         )
         
     except KeyboardInterrupt:
@@ -302,6 +612,183 @@ def convert(
         log_error(logger, e, "Erreur fatale")
         show_error("Une erreur inattendue s'est produite", e)
         sys.exit(1)
+    finally:
+        # Rétablir le profil de chargement massif et fermer la base même si
+        # la conversion s'interrompt ; ce qui n'est pas validé est annulé
+        if db_manager is not None:
+            db_manager.close(rollback=True)
+        if reader is not None:
+            reader.close()
+
+
+def _planned_indexes(info: Dict, requested_indexes: List[Dict], auto_index: bool) -> List[Dict]:
+    """Index à créer sur la table d'une feuille (déclarés puis automatiques)."""
+    specs = [spec for spec in requested_indexes if spec['table'] == info['table_name']]
+    if auto_index:
+        planned = {tuple(spec['columns']) for spec in specs}
+        specs += [
+            {'table': info['table_name'], 'columns': [column], 'unique': False}
+            for column in info['column_names']
+            if is_id_column(column) and (column,) not in planned
+        ]
+    return specs
+
+
+def _convert_batch(
+    files: List[Path],
+    db_path: Path,
+    logger,
+    log_file: Path,
+    fast_load: bool,
+    workers: int,
+    pipeline: bool,
+    datetime_storage: str,
+    column_storage: Dict[str, Dict[str, str]],
+    merge_keys: Dict[str, List[str]],
+    merge_delete: bool,
+    requested_indexes: List[Dict],
+    auto_index: bool
+) -> None:
+    """
+    Convertir une série de classeurs dans une même base (sans interaction).
+    
+    Une seule connexion est utilisée pour tous les fichiers et chaque fichier
+    est chargé dans sa propre transaction : un fichier en erreur est annulé
+    en entier sans affecter les autres. Les tables existantes sont
+    complétées (ou fusionnées si une clé est déclarée), comme avec --yes.
+    Les classeurs sont lus en parallèle avec --workers, l'écriture reste
+    séquentielle.
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+    from src.core.parallel_reader import ParallelWorkbookReader
+    from src.core.pipeline import prefetch_chunks
+    from src.ui.convert import show_batch_summary, show_merge_result
+    
+    console.print(f"\n[bold cyan]Conversion par lots : {len(files)} fichier(s) → {db_path}[/bold cyan]\n")
+    
+    # Base fermée (profil de chargement rétabli) même si le lot s'interrompt ;
+    # le fichier en cours de chargement est alors annulé
+    with DatabaseManager(db_path, logger, fast_load=fast_load) as db_manager:
+        conn = db_manager.connect()
+        workbook_reader = ParallelWorkbookReader(workers, DEFAULT_CHUNK_SIZE, logger)
+        
+        results = []
+        converted_sheets: Dict[str, Dict] = {}
+        batch_start_time = time.time()
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            TaskProgressColumn(),
+            console=console
+        ) as progress:
+            files_task = progress.add_task("[cyan]Fichiers[/cyan]", total=len(files))
+            
+            for excel_path, sheets, read_error in workbook_reader.iter_workbooks(files):
+                log_conversion_start(logger, excel_path)
+                file_start_time = time.time()
+                file_rows = 0
+                file_sheets = []
+                error = read_error
+                
+                if error is None:
+                    conn.execute("BEGIN")
+                    try:
+                        for sheet_info, chunks in sheets:
+                            table_name = sheet_info['table_name']
+                            if db_manager.table_exists(table_name):
+                                if_exists = 'merge' if table_name in merge_keys else 'append'
+                            else:
+                                if_exists = 'fail'
+                            
+                            if pipeline:
+                                chunks = prefetch_chunks(chunks, logger=logger)
+                            
+                            sheet_start_time = time.time()
+                            try:
+                                rows_inserted = db_manager.insert_dataframe(
+                                    chunks,
+                                    table_name,
+                                    if_exists=if_exists,
+                                    chunk_size=DEFAULT_CHUNK_SIZE,
+                                    temporal_storage=datetime_storage,
+                                    column_storage=column_storage.get(table_name),
+                                    merge_key=merge_keys.get(table_name),
+                                    merge_delete=merge_delete
+                                )
+                            finally:
+                                if pipeline:
+                                    chunks.close()
+                            rows_written = rows_inserted
+                            if db_manager.last_merge is not None:
+                                show_merge_result(table_name, rows_inserted, db_manager.last_merge)
+                                rows_written = db_manager.last_merge['inserted'] + db_manager.last_merge['updated']
+                            
+                            log_conversion_success(
+                                logger, table_name, rows_written, time.time() - sheet_start_time
+                            )
+                            file_rows += rows_written
+                            file_sheets.append(sheet_info)
+                        
+                        conn.commit()
+                    except Exception as e:
+                        # Le fichier est annulé en entier
+                        conn.rollback()
+                        error = e
+                        file_rows = 0
+                        file_sheets = []
+                
+                result = {
+                    'file': excel_path.name,
+                    'sheets': len(file_sheets),
+                    'rows': file_rows,
+                    'duration': time.time() - file_start_time,
+                    'error': None if error is None else str(error)
+                }
+                results.append(result)
+                
+                if error is None:
+                    for sheet_info in file_sheets:
+                        converted_sheets.setdefault(sheet_info['table_name'], sheet_info)
+                else:
+                    log_error(logger, error, f"Conversion de '{excel_path.name}'")
+                    progress.console.print(f"[red]✗ {excel_path.name}: {error}[/red]")
+                
+                progress.update(files_task, advance=1)
+        
+        # Index créés une fois tous les fichiers chargés
+        indexes_created = []
+        for info in converted_sheets.values():
+            for spec in _planned_indexes(info, requested_indexes, auto_index):
+                try:
+                    indexes_created.append(
+                        db_manager.create_index(spec['table'], spec['columns'], unique=spec['unique'])
+                    )
+                except Exception as e:
+                    log_error(logger, e, f"Index sur '{spec['table']}' ({', '.join(spec['columns'])})")
+                    show_error(f"Impossible de créer l'index sur '{spec['table']}'", e)
+    
+    total_duration = time.time() - batch_start_time
+    size_bytes, size_str = DatabaseManager(db_path, logger).get_database_size()
+    
+    converted = [result for result in results if result['error'] is None]
+    log_conversion_summary(
+        logger,
+        db_path,
+        sum(result['sheets'] for result in converted),
+        sum(result['rows'] for result in converted),
+        total_duration
+    )
+    
+    show_batch_summary(
+        str(db_path),
+        results,
+        total_duration,
+        size_str,
+        str(log_file),
+        indexes=indexes_created
+    )
 
 
 @app.command()
@@ -323,6 +810,23 @@ def reverse(
         "--yes",
         "-y",
         help="Accepter automatiquement toutes les confirmations"
+    ),
+    autofit: bool = typer.Option(
+        True,
+        "--autofit/--no-autofit",
+        help="Ajuster la largeur des colonnes au contenu (estimée sur un échantillon)"
+    ),
+    approx: bool = typer.Option(
+        False,
+        "--approx",
+        help="Estimer le nombre de lignes des tables sans les parcourir (analyse rapide)"
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        "-w",
+        min=1,
+        help="Nombre de processus pour exporter les tables en parallèle"
     )
 ):
     """
@@ -330,6 +834,17 @@ def reverse(
     
     Mode interactif avec guidage pas à pas.
     """
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+    from src.core import DatabaseReader, ExcelWriter
+    from src.core.parallel_writer import ParallelExcelExporter
+    from src.ui.reverse import (
+        prompt_database_file,
+        prompt_excel_name,
+        prompt_select_tables,
+        prompt_excel_exists_action,
+        show_reverse_summary
+    )
+    
     # Nettoyer l'écran pour démarrer
     clear_screen()
     
@@ -338,6 +853,10 @@ def reverse(
     log_file = project_dir / "excel_to_db.log"
     logger = setup_logger(log_file=log_file)
     
+    # Feuilles temporaires de l'export parallèle, supprimées dans le bloc
+    # finally même si l'export s'interrompt avant la sauvegarde
+    excel_writer = None
+    
     try:
         # ÉTAPE 1: Sélection de la base de données
         if db_path:
@@ -359,7 +878,7 @@ def reverse(
         
         with console.status("[bold green]Analyse de la base en cours..."):
             reader = DatabaseReader(database_path, logger)
-            tables_info = reader.get_all_tables_info()
+            tables_info = reader.get_all_tables_info(exact=not approx)
         
         if not tables_info:
             show_error("Aucune table trouvée dans la base de données")
@@ -442,9 +961,18 @@ def reverse(
         tables_exported = 0
         conversion_start_time = time.time()
         
-        # Créer l'écrivain Excel
-        excel_writer = ExcelWriter(excel_path, logger)
-        excel_writer.create_workbook()
+        table_names = [table_info['name'] for table_info in tables_to_export]
+        parallel = workers > 1 and len(table_names) > 1
+        
+        if parallel:
+            # Une connexion en lecture seule et une feuille XML par processus
+            excel_writer = ParallelExcelExporter(
+                excel_path, database_path, workers, DEFAULT_CHUNK_SIZE, autofit, logger
+            )
+        else:
+            # Créer l'écrivain Excel (écriture en flux, sans cellules en mémoire)
+            excel_writer = ExcelWriter(excel_path, logger, write_only=True, autofit=autofit)
+            excel_writer.create_workbook()
         
         # Progress bar pour chaque table
         with Progress(
@@ -455,36 +983,47 @@ def reverse(
             console=console
         ) as progress:
             
-            for table_info in tables_to_export:
-                table_name = table_info['name']
-                total_rows = table_info['rows']
-                
-                # Créer une tâche pour la barre de progression
-                task = progress.add_task(
-                    f"[cyan]{table_name}[/cyan]",
-                    total=total_rows
+            # Créer une tâche par table pour la barre de progression
+            tasks = {
+                table_info['name']: progress.add_task(
+                    f"[cyan]{table_info['name']}[/cyan]",
+                    total=table_info['rows']
                 )
-                
-                try:
-                    # Lire la table
-                    df = reader.read_table(table_name)
-                    
-                    # Ajouter au fichier Excel
-                    excel_writer.add_dataframe(df, table_name, style_header=True)
-                    
-                    # Mettre à jour la barre de progression
-                    progress.update(task, completed=total_rows)
-                    
-                    total_rows_exported += total_rows
-                    tables_exported += 1
-                    
-                    logger.info(f"Table '{table_name}' exportée: {total_rows} lignes")
-                    
-                except Exception as e:
-                    log_error(logger, e, f"Export de '{table_name}'")
-                    show_error(f"Erreur lors de l'export de '{table_name}'", e)
+                for table_info in tables_to_export
+            }
+            
+            def export_sequentially():
+                """Lire chaque table par blocs et les écrire au fil de l'eau."""
+                for table_name in table_names:
+                    try:
+                        chunks = reader.iter_table_chunks(table_name, DEFAULT_CHUNK_SIZE)
+                        rows = excel_writer.add_dataframe_chunks(
+                            chunks,
+                            table_name,
+                            style_header=True,
+                            on_chunk=lambda rows, task=tasks[table_name]: progress.update(task, completed=rows)
+                        )
+                    except Exception as e:
+                        yield table_name, 0, e
+                        continue
+                    yield table_name, rows, None
+            
+            results = excel_writer.iter_tables(table_names) if parallel else export_sequentially()
+            
+            for table_name, rows_exported, error in results:
+                if error is not None:
+                    log_error(logger, error, f"Export de '{table_name}'")
+                    show_error(f"Erreur lors de l'export de '{table_name}'", error)
                     # Continuer avec les autres tables
                     continue
+                
+                # Mettre à jour la barre de progression
+                progress.update(tasks[table_name], total=rows_exported, completed=rows_exported)
+                
+                total_rows_exported += rows_exported
+                tables_exported += 1
+                
+                logger.info(f"Table '{table_name}' exportée: {rows_exported} lignes")
         
         # Sauvegarder le fichier Excel
         console.print()
@@ -529,11 +1068,19 @@ def reverse(
         log_error(logger, e, "Erreur fatale")
         show_error("Une erreur inattendue s'est produite", e)
         sys.exit(1)
+    finally:
+        if isinstance(excel_writer, ParallelExcelExporter):
+            excel_writer.cleanup()
 
 
 @app.command()
 def info(
-    db_path: str = typer.Argument(..., help="Chemin vers la base de données SQLite")
+    db_path: str = typer.Argument(..., help="Chemin vers la base de données SQLite"),
+    approx: bool = typer.Option(
+        False,
+        "--approx",
+        help="Estimer le nombre de lignes des tables sans les parcourir"
+    )
 ):
     """
     Afficher les informations d'une base de données SQLite.
@@ -551,7 +1098,7 @@ def info(
     db_manager = DatabaseManager(db_file, logger)
     
     try:
-        stats = db_manager.get_database_stats()
+        stats = db_manager.get_database_stats(exact=not approx)
         show_database_stats(stats)
     except Exception as e:
         show_error("Erreur lors de la lecture de la base de données", e)
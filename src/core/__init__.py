@@ -1,12 +1,22 @@
 """
 Module core pour la conversion Excel ↔ SQLite
 """
+import importlib
 
-from .excel_reader import ExcelReader
-from .database_reader import DatabaseReader
-from .excel_writer import ExcelWriter
-from .type_detector import infer_column_types, get_type_stats, convert_datetime_columns
-from .db_manager import DatabaseManager
+# Les classes sont importées à la première utilisation (PEP 562) : importer
+# un sous-module léger (db_manager, page_walker) ne charge pas pandas ni openpyxl
+_LAZY_IMPORTS = {
+    'ExcelReader': '.excel_reader',
+    'DatabaseReader': '.database_reader',
+    'ExcelWriter': '.excel_writer',
+    'DatabaseManager': '.db_manager',
+    'infer_column_types': '.type_detector',
+    'infer_column_types_sampled': '.type_detector',
+    'TypeSampler': '.type_detector',
+    'get_type_stats': '.type_detector',
+    'convert_datetime_columns': '.type_detector',
+    'restore_datetime_columns': '.type_detector'
+}
 
 __all__ = [
     'ExcelReader',
@@ -14,6 +24,25 @@ __all__ = [
     'ExcelWriter',
     'DatabaseManager',
     'infer_column_types',
+    'infer_column_types_sampled',
+    'TypeSampler',
     'get_type_stats',
-    'convert_datetime_columns'
+    'convert_datetime_columns',
+    'restore_datetime_columns'
 ]
+
+
+def __getattr__(name: str):
+    """Importer à la demande les classes et fonctions exportées."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Lister aussi les noms importés à la demande."""
+    return sorted(set(globals()) | set(__all__))
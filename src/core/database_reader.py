@@ -4,25 +4,71 @@ Lecture des données depuis une base de données SQLite
 import sqlite3
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 import logging
 
+from .db_manager import (
+    read_temporal_columns,
+    estimate_row_count,
+    quote_identifier,
+    INTERNAL_TABLE_PREFIX,
+    STAGING_TABLE_PREFIX
+)
+from .type_detector import restore_datetime_columns
+
+
+DEFAULT_CHUNK_ROWS = 10000
+
+# Types pandas imposés d'après le type déclaré des colonnes
+_DECLARED_DTYPES = {
+    'INTEGER': 'Int64',
+    'REAL': 'float64',
+}
+
+
+def _apply_declared_dtypes(df: pd.DataFrame, column_types: Dict[str, str]) -> pd.DataFrame:
+    """
+    Typer les colonnes d'un bloc d'après leur type SQLite déclaré.
+    
+    Les blocs d'une même table ont ainsi les mêmes types, même lorsqu'une
+    colonne n'y contient que des NULL. Une colonne dont les valeurs ne
+    respectent pas le type déclaré garde le type déduit par pandas.
+    """
+    for column, declared in column_types.items():
+        dtype = _DECLARED_DTYPES.get(declared.upper())
+        if dtype is None or column not in df.columns:
+            continue
+        try:
+            df[column] = df[column].astype(dtype)
+        except (TypeError, ValueError):
+            continue
+    
+    return df
+
 
 class DatabaseReader:
     """
     Classe pour lire les données d'une base de données SQLite.
     """
     
-    def __init__(self, db_path: Path, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        db_path: Path,
+        logger: Optional[logging.Logger] = None,
+        read_only: bool = False
+    ):
         """
         Initialiser le lecteur de base de données.
         
         Args:
             db_path: Chemin vers le fichier de base de données SQLite
             logger: Logger optionnel
+            read_only: Ouvrir la base en lecture seule (une connexion par
+                lecteur, utilisable en parallèle par plusieurs processus)
         """
         self.db_path = Path(db_path)
         self.logger = logger
+        self.read_only = read_only
         self._validate_database()
         self.conn: Optional[sqlite3.Connection] = None
         
@@ -51,7 +97,14 @@ class DatabaseReader:
             Connexion SQLite
         """
         if self.conn is None:
-            self.conn = sqlite3.connect(self.db_path)
+            if self.read_only:
+                # immutable=1 évite tout verrouillage, sauf si un journal WAL
+                # contient des pages pas encore reportées dans le fichier
+                wal_path = self.db_path.with_name(self.db_path.name + '-wal')
+                options = "mode=ro" if wal_path.exists() else "mode=ro&immutable=1"
+                self.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?{options}", uri=True)
+            else:
+                self.conn = sqlite3.connect(self.db_path)
             if self.logger:
                 self.logger.info(f"Connexion établie à la base: {self.db_path}")
         return self.conn
@@ -77,7 +130,14 @@ class DatabaseReader:
         cursor = conn.cursor()
         
         cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+            "SELECT name FROM sqlite_master WHERE type='table' "
+            "AND substr(name, 1, ?) != ? AND substr(name, 1, ?) != ? "
+            "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+            "ORDER BY name",
+            (
+                len(INTERNAL_TABLE_PREFIX), INTERNAL_TABLE_PREFIX,
+                len(STAGING_TABLE_PREFIX), STAGING_TABLE_PREFIX
+            )
         )
         
         tables = [row[0] for row in cursor.fetchall()]
@@ -87,17 +147,20 @@ class DatabaseReader:
         
         return tables
     
-    def get_table_info(self, table_name: str) -> Dict:
+    def get_table_info(self, table_name: str, exact: bool = True) -> Dict:
         """
         Obtenir les informations sur une table.
         
         Args:
             table_name: Nom de la table
+            exact: Compter les lignes avec COUNT(*) ; sinon le nombre de
+                lignes est estimé sans parcourir la table
             
         Returns:
             Dictionnaire avec les informations de la table:
             - name: nom de la table
             - rows: nombre de lignes
+            - rows_estimated: True si le nombre de lignes est une estimation
             - columns: nombre de colonnes
             - column_names: liste des noms de colonnes
             - column_types: types SQLite des colonnes
@@ -106,19 +169,23 @@ class DatabaseReader:
         cursor = conn.cursor()
         
         # Obtenir les informations sur les colonnes
-        cursor.execute(f"PRAGMA table_info({table_name})")
+        cursor.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
         columns = cursor.fetchall()
         
         column_names = [col[1] for col in columns]
         column_types = {col[1]: col[2] for col in columns}
         
-        # Compter le nombre de lignes
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        row_count = cursor.fetchone()[0]
+        # Compter le nombre de lignes (ou l'estimer)
+        row_count = None if exact else estimate_row_count(conn, table_name)
+        rows_estimated = row_count is not None
+        if row_count is None:
+            cursor.execute(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}")
+            row_count = cursor.fetchone()[0]
         
         info = {
             'name': table_name,
             'rows': row_count,
+            'rows_estimated': rows_estimated,
             'columns': len(column_names),
             'column_names': column_names,
             'column_types': column_types
@@ -132,10 +199,13 @@ class DatabaseReader:
         
         return info
     
-    def get_all_tables_info(self) -> List[Dict]:
+    def get_all_tables_info(self, exact: bool = True) -> List[Dict]:
         """
         Obtenir les informations de toutes les tables de la base.
         
+        Args:
+            exact: Compter les lignes avec COUNT(*) plutôt que les estimer
+        
         Returns:
             Liste de dictionnaires avec les informations de chaque table
         """
@@ -144,7 +214,7 @@ class DatabaseReader:
         
         for table_name in table_names:
             try:
-                info = self.get_table_info(table_name)
+                info = self.get_table_info(table_name, exact=exact)
                 tables_info.append(info)
             except Exception as e:
                 if self.logger:
@@ -160,6 +230,9 @@ class DatabaseReader:
         """
         Lire toutes les données d'une table dans un DataFrame.
         
+        Les colonnes date/heure enregistrées lors de la conversion sont
+        reconverties en datetime, quel que soit leur format de stockage.
+        
         Args:
             table_name: Nom de la table à lire
             
@@ -172,7 +245,8 @@ class DatabaseReader:
         conn = self.connect()
         
         try:
-            df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
+            df = pd.read_sql_query(f"SELECT * FROM {quote_identifier(table_name)}", conn)
+            df = restore_datetime_columns(df, read_temporal_columns(conn, table_name))
             
             if self.logger:
                 self.logger.info(
@@ -188,6 +262,69 @@ class DatabaseReader:
                 )
             raise Exception(f"Impossible de lire la table '{table_name}': {str(e)}")
     
+    def iter_table_chunks(
+        self,
+        table_name: str,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lire une table bloc par bloc.
+        
+        Les lignes sont lues avec fetchmany sur un curseur ouvert : seul le
+        bloc courant est en mémoire. Les colonnes sont typées d'après
+        PRAGMA table_info et les colonnes date/heure sont reconverties
+        comme dans read_table.
+        
+        Args:
+            table_name: Nom de la table à lire
+            chunk_rows: Nombre de lignes par bloc
+            
+        Yields:
+            DataFrames d'au plus chunk_rows lignes (un DataFrame vide avec
+            les colonnes de la table si elle ne contient aucune ligne)
+            
+        Raises:
+            Exception: Si la table ne peut pas être lue
+        """
+        conn = self.connect()
+        
+        try:
+            cursor = conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
+            column_types = {row[1]: row[2] for row in cursor.fetchall()}
+            temporal_columns = read_temporal_columns(conn, table_name)
+            
+            cursor = conn.execute(f"SELECT * FROM {quote_identifier(table_name)}")
+            columns = [description[0] for description in cursor.description]
+        except Exception as e:
+            if self.logger:
+                self.logger.error(
+                    f"Erreur lors de la lecture de la table '{table_name}': {str(e)}"
+                )
+            raise Exception(f"Impossible de lire la table '{table_name}': {str(e)}")
+        
+        rows_read = 0
+        
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows and rows_read:
+                break
+            
+            chunk = pd.DataFrame.from_records(rows, columns=columns)
+            chunk.index += rows_read
+            chunk = _apply_declared_dtypes(chunk, column_types)
+            rows_read += len(rows)
+            
+            yield restore_datetime_columns(chunk, temporal_columns)
+            
+            if not rows:
+                break
+        
+        if self.logger:
+            self.logger.info(
+                f"Table '{table_name}' lue par blocs: {rows_read} lignes, "
+                f"{len(columns)} colonnes"
+            )
+    
     def __enter__(self):
         """Support du context manager."""
         self.connect()
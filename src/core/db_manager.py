@@ -2,16 +2,260 @@
 Gestion de la base de données SQLite
 """
 import sqlite3
-import pandas as pd
+from datetime import date, datetime, time as dt_time
 from pathlib import Path
-from typing import Optional, List, Dict, Literal, Tuple
+from typing import Optional, List, Dict, Literal, Tuple, Iterable, Union, Any, Callable, TYPE_CHECKING
 import logging
 import time
 
-from ..core.type_detector import convert_datetime_columns
+from ..core.temporal_formats import TEMPORAL_STORAGE_TYPES, DEFAULT_TEMPORAL_STORAGE
+from ..core.page_walker import PageWalker
+from ..utils.name_cleaner import clean_table_name, clean_column_name
+from ..utils.formatting import format_file_size
 
+# pandas et numpy ne sont chargés qu'à l'insertion : les commandes qui se
+# contentent d'interroger la base (info, statistiques) démarrent sans eux
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
 
-ConflictAction = Literal['overwrite', 'append', 'skip', 'cancel']
+
+ConflictAction = Literal['overwrite', 'append', 'merge', 'skip', 'cancel']
+
+# Profil "chargement massif" : journal WAL sans synchronisation disque,
+# grand cache et verrou exclusif pendant la durée de la conversion
+BULK_LOAD_PRAGMAS = [
+    ('locking_mode', 'EXCLUSIVE'),
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'OFF'),
+    ('cache_size', '-262144'),  # 256 Mo (valeur négative = Kio)
+    ('temp_store', 'MEMORY'),
+]
+
+# Tables internes de l'outil, exclues des listes de tables
+INTERNAL_TABLE_PREFIX = '_e2db_'
+COLUMNS_METADATA_TABLE = '_e2db_columns'
+MANIFEST_TABLE = '_e2db_manifest'
+CHECKPOINTS_TABLE = '_e2db_checkpoints'
+
+# Tables de chargement d'un remplacement, échangées avec la table en place
+STAGING_TABLE_PREFIX = '_staging_'
+
+# Types Python que sqlite3 sait lier sans adaptateur
+_SQLITE_NATIVE_TYPES = (str, int, float, bytes, type(None))
+
+
+def quote_identifier(name: str) -> str:
+    """
+    Protéger un nom de table ou de colonne pour l'inclure dans une requête SQL.
+    
+    Args:
+        name: Nom brut
+        
+    Returns:
+        Nom entre guillemets doubles
+        
+    Examples:
+        >>> quote_identifier('clients')
+        '"clients"'
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def staging_table_name(table_name: str) -> str:
+    """Nom de la table de chargement utilisée pour remplacer une table."""
+    return f"{STAGING_TABLE_PREFIX}{table_name}"
+
+
+def parse_index_spec(spec: str, unique: bool = False) -> Dict:
+    """
+    Analyser une déclaration d'index de la forme 'table:col1,col2'.
+    
+    Les noms de feuille et de colonnes peuvent être donnés tels qu'ils
+    apparaissent dans Excel : ils sont nettoyés comme lors de la conversion.
+    
+    Args:
+        spec: Déclaration 'feuille:colonne[,colonne...]'
+        unique: Index unique
+        
+    Returns:
+        Dictionnaire {'table', 'columns', 'unique'}
+        
+    Raises:
+        ValueError: Si la déclaration est invalide
+        
+    Examples:
+        >>> parse_index_spec('Commandes:ID Client,Date')
+        {'table': 'commandes', 'columns': ['id_client', 'date'], 'unique': False}
+    """
+    table, sep, columns = spec.rpartition(':')
+    column_names = [column.strip() for column in columns.split(',') if column.strip()]
+    
+    if not sep or not table.strip() or not column_names:
+        raise ValueError(
+            f"Déclaration d'index invalide: '{spec}' (format attendu: feuille:col1,col2)"
+        )
+    
+    return {
+        'table': clean_table_name(table.strip()),
+        'columns': [clean_column_name(column) for column in column_names],
+        'unique': unique
+    }
+
+
+def parse_storage_spec(spec: str) -> Dict:
+    """
+    Analyser un format de stockage de colonne de la forme 'table:colonne=format'.
+    
+    Args:
+        spec: Déclaration 'feuille:colonne=format' (format parmi
+            TEMPORAL_STORAGE_TYPES)
+        
+    Returns:
+        Dictionnaire {'table', 'column', 'storage'} avec les noms nettoyés
+        
+    Raises:
+        ValueError: Si la déclaration est mal formée ou le format inconnu
+    """
+    target, sep, storage = spec.rpartition('=')
+    table, colon, column = target.rpartition(':')
+    storage = storage.strip().lower()
+    
+    if not sep or not colon or not table.strip() or not column.strip():
+        raise ValueError(
+            f"Format de colonne invalide: '{spec}' (format attendu: feuille:colonne=format)"
+        )
+    if storage not in TEMPORAL_STORAGE_TYPES:
+        raise ValueError(
+            f"Format de stockage inconnu: '{storage}' "
+            f"(formats acceptés: {', '.join(TEMPORAL_STORAGE_TYPES)})"
+        )
+    
+    return {
+        'table': clean_table_name(table.strip()),
+        'column': clean_column_name(column.strip()),
+        'storage': storage
+    }
+
+
+def read_temporal_columns(conn: sqlite3.Connection, table_name: str) -> Dict[str, str]:
+    """
+    Lire le format de stockage des colonnes date/heure d'une table.
+    
+    Args:
+        conn: Connexion SQLite
+        table_name: Nom de la table
+        
+    Returns:
+        Dictionnaire {nom_colonne: format}, vide pour une table créée sans
+        métadonnées
+    """
+    cursor = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+        (COLUMNS_METADATA_TABLE,)
+    )
+    if cursor.fetchone() is None:
+        return {}
+    
+    cursor = conn.execute(
+        f"SELECT column_name, storage FROM {COLUMNS_METADATA_TABLE} WHERE table_name=?",
+        (table_name,)
+    )
+    return dict(cursor.fetchall())
+
+
+def estimate_row_count(conn: sqlite3.Connection, table_name: str) -> Optional[int]:
+    """
+    Estimer le nombre de lignes d'une table sans la parcourir.
+    
+    Le nombre enregistré par ANALYZE dans sqlite_stat1 est utilisé en
+    priorité. À défaut, MAX(rowid) est lu dans le B-tree de la table en
+    quelques pages : il est exact pour une table alimentée uniquement par
+    ajouts, et majore le nombre de lignes après des suppressions. Il n'est
+    pas utilisé lorsque le rowid est une colonne INTEGER PRIMARY KEY, dont
+    les valeurs sont choisies librement et peuvent être très espacées.
+    
+    Args:
+        conn: Connexion SQLite
+        table_name: Nom de la table
+        
+    Returns:
+        Nombre de lignes estimé, ou None si aucune estimation n'est possible
+    """
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'"
+    ).fetchone()
+    if has_stats:
+        # La colonne stat commence par le nombre de lignes (de la table ou de l'index)
+        row = conn.execute(
+            "SELECT MAX(CAST(stat AS INTEGER)) FROM sqlite_stat1 WHERE tbl=?",
+            (table_name,)
+        ).fetchone()
+        if row and row[0] is not None:
+            return row[0]
+    
+    columns = conn.execute(f"PRAGMA table_info({quote_identifier(table_name)})").fetchall()
+    
+    # Clé INTEGER PRIMARY KEY : alias du rowid, valeurs non contiguës
+    primary_key = [column for column in columns if column[5]]
+    if len(primary_key) == 1 and primary_key[0][2].upper() == 'INTEGER':
+        return None
+    
+    # Le rowid n'est accessible que sous un nom qui n'est pas déjà une colonne
+    column_names = {column[1].lower() for column in columns}
+    rowid_name = next(
+        (name for name in ('rowid', '_rowid_', 'oid') if name not in column_names), None
+    )
+    if rowid_name is None:
+        return None
+    
+    try:
+        max_rowid = conn.execute(
+            f"SELECT MAX({rowid_name}) FROM {quote_identifier(table_name)}"
+        ).fetchone()[0]
+    except sqlite3.OperationalError:
+        # Table WITHOUT ROWID
+        return None
+    return max_rowid or 0
+
+
+def _to_sqlite_value(value: Any) -> Any:
+    """Convertir une valeur Python non supportée par sqlite3 (dates, heures...)."""
+    import numpy as np
+    
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, (date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return str(value)
+
+
+def _column_values(series: 'pd.Series') -> 'np.ndarray':
+    """
+    Extraire les valeurs d'une colonne sous une forme liable par sqlite3.
+    
+    La conversion se fait sur le tableau de la colonne entière (scalaires
+    numpy -> objets Python natifs, valeurs manquantes -> None) ; seules les
+    colonnes 'object' contenant des types exotiques sont parcourues.
+    """
+    import numpy as np
+    import pandas as pd
+    
+    values = series.to_numpy(dtype=object, na_value=None)
+    
+    if pd.api.types.is_object_dtype(series.dtype):
+        if not all(value_type in _SQLITE_NATIVE_TYPES for value_type in set(map(type, values))):
+            values = np.array(
+                [value if isinstance(value, _SQLITE_NATIVE_TYPES) else _to_sqlite_value(value)
+                 for value in values],
+                dtype=object
+            )
+    
+    return values
 
 
 class DatabaseManager:
@@ -19,17 +263,29 @@ class DatabaseManager:
     Classe pour gérer les opérations sur la base de données SQLite.
     """
     
-    def __init__(self, db_path: Path, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        db_path: Path,
+        logger: Optional[logging.Logger] = None,
+        fast_load: bool = False
+    ):
         """
         Initialiser le gestionnaire de base de données.
         
         Args:
             db_path: Chemin vers le fichier de base de données SQLite
             logger: Logger optionnel
+            fast_load: Activer le profil de chargement massif (BULK_LOAD_PRAGMAS)
+                le temps de la connexion
         """
         self.db_path = Path(db_path)
         self.logger = logger
+        self.fast_load = fast_load
         self.conn: Optional[sqlite3.Connection] = None
+        self._saved_journal_mode: Optional[str] = None
+        self._outer_transaction = False
+        # Bilan de la dernière fusion (insert_dataframe en mode 'merge')
+        self.last_merge: Optional[Dict] = None
     
     def connect(self) -> sqlite3.Connection:
         """
@@ -42,13 +298,71 @@ class DatabaseManager:
             self.conn = sqlite3.connect(self.db_path)
             if self.logger:
                 self.logger.info(f"Connexion établie à la base: {self.db_path}")
+            if self.fast_load:
+                self._apply_bulk_load_profile()
         return self.conn
     
-    def close(self) -> None:
+    def _commit_step(self) -> None:
+        """
+        Valider l'étape en cours et ouvrir la transaction suivante.
+        
+        Sans effet dans une transaction ouverte par l'appelant : c'est alors
+        lui qui valide (ou annule) l'ensemble.
+        """
+        if not self._outer_transaction:
+            self.conn.commit()
+            self.conn.execute("BEGIN")
+    
+    def _apply_bulk_load_profile(self) -> None:
+        """
+        Appliquer les réglages de chargement massif à la connexion.
+        """
+        cursor = self.conn.cursor()
+        self._saved_journal_mode = cursor.execute("PRAGMA journal_mode").fetchone()[0]
+        
+        for pragma, value in BULK_LOAD_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}={value}")
+        
+        if self.logger:
+            self.logger.info("Profil de chargement massif activé")
+    
+    def _restore_safe_profile(self) -> None:
+        """
+        Rétablir des réglages sûrs et écrire durablement les données chargées.
+        
+        La synchronisation complète est rétablie avant le checkpoint du
+        journal WAL : le contenu du journal est recopié puis synchronisé sur
+        disque avant le retour de close().
+        """
+        cursor = self.conn.cursor()
+        self.conn.commit()
+        
+        cursor.execute("PRAGMA synchronous=FULL")
+        cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        cursor.execute(f"PRAGMA journal_mode={self._saved_journal_mode or 'DELETE'}")
+        cursor.execute("PRAGMA locking_mode=NORMAL")
+        # Le verrou exclusif n'est relâché qu'au prochain accès à la base
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+        
+        if self.logger:
+            self.logger.info("Profil de chargement massif désactivé (checkpoint effectué)")
+    
+    def close(self, rollback: bool = False) -> None:
         """
         Fermer la connexion à la base de données.
+        
+        Avec le profil de chargement massif, les réglages sûrs sont rétablis
+        et les données synchronisées sur disque avant la fermeture.
+        
+        Args:
+            rollback: Annuler la transaction en cours au lieu de la valider
+                (fermeture après une erreur ou une interruption)
         """
         if self.conn:
+            if rollback and self.conn.in_transaction:
+                self.conn.rollback()
+            if self.fast_load:
+                self._restore_safe_profile()
             self.conn.close()
             self.conn = None
             if self.logger:
@@ -86,7 +400,14 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+            "SELECT name FROM sqlite_master WHERE type='table' "
+            "AND substr(name, 1, ?) != ? AND substr(name, 1, ?) != ? "
+            "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' "
+            "ORDER BY name",
+            (
+                len(INTERNAL_TABLE_PREFIX), INTERNAL_TABLE_PREFIX,
+                len(STAGING_TABLE_PREFIX), STAGING_TABLE_PREFIX
+            )
         )
         
         tables = [row[0] for row in cursor.fetchall()]
@@ -105,7 +426,7 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         
-        cursor.execute(f"PRAGMA table_info({table_name})")
+        cursor.execute(f"PRAGMA table_info({quote_identifier(table_name)})")
         
         columns = []
         for row in cursor.fetchall():
@@ -133,7 +454,7 @@ class DatabaseManager:
         conn = self.connect()
         cursor = conn.cursor()
         
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+        cursor.execute(f"SELECT COUNT(*) FROM {quote_identifier(table_name)}")
         count = cursor.fetchone()[0]
         
         return count
@@ -149,86 +470,866 @@ class DatabaseManager:
         cursor = conn.cursor()
         
         cursor.execute(f"DROP TABLE IF EXISTS {table_name}")
+        self._record_temporal_columns(table_name, {})
+        self._record_manifest(table_name, None)
+        self._record_checkpoint(table_name, None)
         conn.commit()
         
         if self.logger:
             self.logger.info(f"Table '{table_name}' supprimée")
     
+    def create_table(self, table_name: str, column_types: Dict[str, str]) -> None:
+        """
+        Créer une table si elle n'existe pas encore.
+        
+        N'effectue pas de commit : la création fait partie de la transaction
+        en cours.
+        
+        Args:
+            table_name: Nom de la table
+            column_types: Dictionnaire {nom_colonne: type_sqlite}
+        """
+        columns_sql = ', '.join(
+            f"{quote_identifier(column)} {sqlite_type}"
+            for column, sqlite_type in column_types.items()
+        )
+        self.connect().execute(
+            f"CREATE TABLE IF NOT EXISTS {quote_identifier(table_name)} ({columns_sql})"
+        )
+    
+    def get_temporal_columns(self, table_name: str) -> Dict[str, str]:
+        """
+        Obtenir le format de stockage des colonnes date/heure d'une table.
+        
+        Args:
+            table_name: Nom de la table
+            
+        Returns:
+            Dictionnaire {nom_colonne: format}
+        """
+        return read_temporal_columns(self.connect(), table_name)
+    
+    def _record_temporal_columns(self, table_name: str, temporal_columns: Dict[str, str]) -> None:
+        """
+        Enregistrer le format de stockage des colonnes date/heure d'une table.
+        
+        Les métadonnées précédentes de la table sont remplacées. N'effectue
+        pas de commit.
+        
+        Args:
+            table_name: Nom de la table
+            temporal_columns: Dictionnaire {nom_colonne: format}
+        """
+        conn = self.connect()
+        
+        if not temporal_columns and not self.table_exists(COLUMNS_METADATA_TABLE):
+            return
+        
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {COLUMNS_METADATA_TABLE} ("
+            "table_name TEXT NOT NULL, column_name TEXT NOT NULL, storage TEXT NOT NULL, "
+            "PRIMARY KEY (table_name, column_name))"
+        )
+        conn.execute(f"DELETE FROM {COLUMNS_METADATA_TABLE} WHERE table_name=?", (table_name,))
+        conn.executemany(
+            f"INSERT INTO {COLUMNS_METADATA_TABLE} (table_name, column_name, storage) VALUES (?, ?, ?)",
+            [(table_name, column, storage) for column, storage in temporal_columns.items()]
+        )
+    
+    def get_manifest_entry(self, table_name: str) -> Optional[Dict]:
+        """
+        Obtenir l'entrée du manifeste d'une table.
+        
+        Args:
+            table_name: Nom de la table
+            
+        Returns:
+            Dictionnaire {source, sheet_name, content_hash, rows, converted_at}
+            ou None si la table n'a pas d'entrée
+        """
+        if not self.table_exists(MANIFEST_TABLE):
+            return None
+        
+        row = self.connect().execute(
+            f"SELECT source, sheet_name, content_hash, rows, converted_at "
+            f"FROM {MANIFEST_TABLE} WHERE table_name=?",
+            (table_name,)
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        return dict(zip(('source', 'sheet_name', 'content_hash', 'rows', 'converted_at'), row))
+    
+    def _record_manifest(self, table_name: str, entry: Optional[Dict], rows: int = 0) -> None:
+        """
+        Enregistrer l'origine du contenu d'une table dans le manifeste.
+        
+        L'entrée précédente de la table est remplacée ; sans entrée, elle est
+        seulement supprimée. N'effectue pas de commit.
+        
+        Args:
+            table_name: Nom de la table
+            entry: Dictionnaire {source, sheet_name, content_hash} ou None
+            rows: Nombre de lignes de la table
+        """
+        conn = self.connect()
+        
+        if entry is None and not self.table_exists(MANIFEST_TABLE):
+            return
+        
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} ("
+            "table_name TEXT PRIMARY KEY, source TEXT NOT NULL, sheet_name TEXT NOT NULL, "
+            "content_hash TEXT NOT NULL, rows INTEGER NOT NULL, converted_at TEXT NOT NULL)"
+        )
+        conn.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name=?", (table_name,))
+        if entry is not None:
+            conn.execute(
+                f"INSERT INTO {MANIFEST_TABLE} "
+                "(table_name, source, sheet_name, content_hash, rows, converted_at) "
+                "VALUES (?, ?, ?, ?, ?, datetime('now'))",
+                (table_name, entry['source'], entry['sheet_name'], entry['content_hash'], rows)
+            )
+    
+    def get_checkpoint(self, table_name: str) -> Optional[Dict]:
+        """
+        Obtenir le point de reprise d'une conversion interrompue.
+        
+        Args:
+            table_name: Nom de la table
+            
+        Returns:
+            Dictionnaire {source_hash, sheet_name, rows_committed, updated_at}
+            ou None si aucune conversion de la table n'est en cours
+        """
+        if not self.table_exists(CHECKPOINTS_TABLE):
+            return None
+        
+        row = self.connect().execute(
+            f"SELECT source_hash, sheet_name, rows_committed, updated_at "
+            f"FROM {CHECKPOINTS_TABLE} WHERE table_name=?",
+            (table_name,)
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        return dict(zip(('source_hash', 'sheet_name', 'rows_committed', 'updated_at'), row))
+    
+    def _record_checkpoint(self, table_name: str, checkpoint: Optional[Dict], rows: int = 0) -> None:
+        """
+        Enregistrer le nombre de lignes source validées pour une table.
+        
+        Sans point de reprise, l'entrée de la table est supprimée (conversion
+        terminée). N'effectue pas de commit.
+        
+        Args:
+            table_name: Nom de la table
+            checkpoint: Dictionnaire {source_hash, sheet_name} ou None
+            rows: Nombre de lignes source validées
+        """
+        conn = self.connect()
+        
+        if checkpoint is None and not self.table_exists(CHECKPOINTS_TABLE):
+            return
+        
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {CHECKPOINTS_TABLE} ("
+            "table_name TEXT PRIMARY KEY, source_hash TEXT NOT NULL, sheet_name TEXT NOT NULL, "
+            "rows_committed INTEGER NOT NULL, updated_at TEXT NOT NULL)"
+        )
+        if checkpoint is None:
+            conn.execute(f"DELETE FROM {CHECKPOINTS_TABLE} WHERE table_name=?", (table_name,))
+        else:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {CHECKPOINTS_TABLE} "
+                "(table_name, source_hash, sheet_name, rows_committed, updated_at) "
+                "VALUES (?, ?, ?, ?, datetime('now'))",
+                (table_name, checkpoint['source_hash'], checkpoint['sheet_name'], rows)
+            )
+    
     def insert_dataframe(
         self,
-        df: pd.DataFrame,
+        df: Union['pd.DataFrame', Iterable['pd.DataFrame']],
         table_name: str,
-        if_exists: Literal['fail', 'replace', 'append'] = 'fail',
-        chunk_size: int = 10000
+        if_exists: Literal['fail', 'replace', 'append', 'merge'] = 'fail',
+        chunk_size: int = 10000,
+        on_chunk: Optional[Callable[[int], None]] = None,
+        temporal_storage: str = DEFAULT_TEMPORAL_STORAGE,
+        column_storage: Optional[Dict[str, str]] = None,
+        manifest: Optional[Dict] = None,
+        checkpoint: Optional[Dict] = None,
+        indexes: Optional[List[Dict]] = None,
+        merge_key: Optional[List[str]] = None,
+        merge_delete: bool = False
     ) -> int:
         """
         Insérer un DataFrame pandas dans une table SQLite.
         
+        Accepte aussi un itérable de DataFrames (par exemple
+        ExcelReader.iter_sheet_chunks) : les blocs sont alors insérés au fur
+        et à mesure, sans jamais charger toute la feuille en mémoire.
+        
+        La table est créée à partir des types détectés sur le premier bloc,
+        puis les lignes passent par une requête INSERT préparée exécutée avec
+        executemany, le tout dans une seule transaction.
+        
+        Les colonnes date/heure sont stockées au format demandé et ce format
+        est enregistré dans la table COLUMNS_METADATA_TABLE ; en mode 'append'
+        le format déjà enregistré pour la table est conservé.
+        
+        L'entrée `manifest` est enregistrée dans MANIFEST_TABLE dans la même
+        transaction que les lignes : une table remplacée et son empreinte
+        sont validées ensemble. Sans entrée, ou lors d'un ajout à une table
+        existante, l'entrée précédente est supprimée : le contenu ne
+        correspond plus à l'empreinte enregistrée.
+        
+        Avec `checkpoint`, chaque bloc est validé dans sa propre transaction
+        avec le nombre de lignes source déjà converties (CHECKPOINTS_TABLE) :
+        une conversion interrompue reprend au bloc suivant en passant
+        `start_row` au lecteur et à cette méthode. L'entrée est supprimée à
+        la fin de la conversion.
+        
+        En mode 'replace', une table existante n'est pas supprimée avant le
+        chargement : les lignes sont insérées dans une table de chargement
+        (staging_table_name), ses index sont construits, puis elle remplace
+        la table en place dans une transaction courte (_swap_staging_table).
+        
+        Si une transaction est déjà ouverte sur la connexion (conversion par
+        lots, une transaction par fichier), le chargement s'y inscrit : rien
+        n'est validé ni annulé ici, l'appelant valide ou annule l'ensemble.
+        
+        En mode 'merge', les lignes sont chargées dans une table temporaire
+        puis fusionnées dans la table existante selon `merge_key`
+        (_merge_rows) : seules les lignes nouvelles ou modifiées sont écrites.
+        Le bilan de la fusion est disponible dans `last_merge`.
+        
         Args:
-            df: DataFrame à insérer
+            df: DataFrame ou itérable de DataFrames à insérer
             table_name: Nom de la table de destination
-            if_exists: Action si la table existe ('fail', 'replace', 'append')
-            chunk_size: Taille des chunks pour l'insertion
+            if_exists: Action si la table existe ('fail', 'replace', 'append',
+                'merge')
+            chunk_size: Nombre de lignes par appel à executemany
+            on_chunk: Fonction appelée après chaque bloc avec le nombre total
+                de lignes insérées (suivi de la progression)
+            temporal_storage: Format de stockage des dates ('iso', 'epoch',
+                'epoch_ms', 'julian')
+            column_storage: Format par colonne {nom_colonne: format},
+                prioritaire sur temporal_storage
+            manifest: Origine du contenu {source, sheet_name, content_hash}
+            checkpoint: Point de reprise {source_hash, sheet_name, start_row},
+                start_row étant le nombre de lignes déjà converties
+            indexes: Index {columns, unique} à construire sur la table de
+                chargement avant l'échange, en plus de ceux de la table en
+                place (mode 'replace')
+            merge_key: Colonnes identifiant une ligne (mode 'merge')
+            merge_delete: Supprimer les lignes absentes de la source (mode
+                'merge')
             
         Returns:
-            Nombre de lignes insérées
+            Nombre de lignes insérées (lignes lues en mode 'merge')
             
         Raises:
-            ValueError: Si if_exists='fail' et la table existe
+            ValueError: Si if_exists='fail' et la table existe, ou si la clé
+                de fusion est invalide
         """
+        import pandas as pd
+        from ..core.type_detector import convert_datetime_columns, TypeSampler
+        
         conn = self.connect()
+        cursor = conn.cursor()
         
-        # Convertir les colonnes datetime en string
-        df_to_insert = convert_datetime_columns(df)
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
         
         start_time = time.time()
+        rows_inserted = 0
+        insert_sql = None
+        appended = False
+        target = table_name
+        staging: Optional[str] = None
+        merge_table: Optional[str] = None
+        merge_index: Optional[str] = None
+        self.last_merge = None
+        saved_cache_size: Optional[int] = None
+        start_row = checkpoint.get('start_row', 0) if checkpoint else 0
+        temporal_columns: Dict[str, str] = {}
+        
+        # Suivre les types par échantillonnage pour signaler les colonnes
+        # dont le type change après la création de la table
+        sampler = TypeSampler()
+        
+        # Une transaction déjà ouverte (conversion par lots) englobe le chargement
+        self._outer_transaction = conn.in_transaction
         
         try:
-            # Insérer les données
-            df_to_insert.to_sql(
-                name=table_name,
-                con=conn,
-                if_exists=if_exists,
-                index=False,
-                method='multi',
-                chunksize=chunk_size
-            )
+            if not self._outer_transaction:
+                cursor.execute("BEGIN")
             
-            conn.commit()
+            for chunk in chunks:
+                promoted = sampler.update(chunk)
+                if promoted and self.logger:
+                    self.logger.warning(
+                        f"Table '{table_name}': type promu pour {', '.join(promoted)} "
+                        f"après la ligne {sampler.rows_seen - len(chunk)}"
+                    )
+                
+                # Le premier bloc fixe le schéma de la table
+                if insert_sql is None:
+                    target_exists = self.table_exists(table_name)
+                    if target_exists and if_exists == 'fail':
+                        raise ValueError(f"La table '{table_name}' existe déjà")
+                    
+                    if target_exists and if_exists == 'replace':
+                        # Charger à part : la table en place reste lisible
+                        # et intacte jusqu'à l'échange
+                        staging = staging_table_name(table_name)
+                        if not (start_row and self.table_exists(staging)):
+                            cursor.execute(f"DROP TABLE IF EXISTS {quote_identifier(staging)}")
+                            self._record_temporal_columns(staging, {})
+                        target = staging
+                        target_exists = self.table_exists(staging)
+                        
+                        # Tant que le cache n'est pas déversé sur disque, le
+                        # chargement ne prend pas de verrou exclusif et les
+                        # lecteurs continuent de lire la table en place
+                        saved_cache_size = cursor.execute("PRAGMA cache_size").fetchone()[0]
+                        cursor.execute(f"PRAGMA cache_size={dict(BULK_LOAD_PRAGMAS)['cache_size']}")
+                    
+                    if target_exists and if_exists == 'merge':
+                        # Charger dans une table temporaire, fusionnée en fin
+                        # de chargement par une seule requête
+                        merge_table, merge_index = self._create_merge_table(
+                            table_name, list(chunk.columns), merge_key or []
+                        )
+                    
+                    # Une reprise poursuit le chargement en cours
+                    appended = target_exists and not start_row
+                    if target_exists:
+                        # Garder le format des données déjà présentes
+                        temporal_columns = self.get_temporal_columns(target)
+                    else:
+                        temporal_columns = {
+                            column: (column_storage or {}).get(column, temporal_storage)
+                            for column, detected in sampler.detected_types.items()
+                            if detected == 'DATETIME'
+                        }
+                        column_types = sampler.column_types
+                        for column, storage in temporal_columns.items():
+                            column_types[column] = TEMPORAL_STORAGE_TYPES[storage]
+                        
+                        self.create_table(target, column_types)
+                        self._record_temporal_columns(target, temporal_columns)
+                    
+                    columns_sql = ', '.join(quote_identifier(column) for column in chunk.columns)
+                    placeholders = ', '.join('?' * len(chunk.columns))
+                    insert_target = (
+                        f"temp.{quote_identifier(merge_table)}" if merge_table
+                        else quote_identifier(target)
+                    )
+                    insert_sql = (
+                        f"INSERT INTO {insert_target} ({columns_sql}) "
+                        f"VALUES ({placeholders})"
+                    )
+                
+                # Convertir les colonnes datetime au format de stockage
+                chunk_to_insert = convert_datetime_columns(
+                    chunk, column_storage=temporal_columns
+                )
+                
+                # Construire les lignes à partir des tableaux de colonnes
+                for start in range(0, len(chunk_to_insert), chunk_size):
+                    part = chunk_to_insert.iloc[start:start + chunk_size]
+                    columns = [_column_values(part[column]) for column in part.columns]
+                    cursor.executemany(insert_sql, zip(*columns))
+                
+                rows_inserted += len(chunk)
+                
+                if checkpoint:
+                    self._record_checkpoint(table_name, checkpoint, start_row + rows_inserted)
+                    self._commit_step()
+                
+                if on_chunk:
+                    on_chunk(rows_inserted)
+            
+            if staging is not None:
+                self._swap_staging_table(table_name, staging, temporal_columns, indexes)
+            
+            if merge_table is not None:
+                self.last_merge = {
+                    **self._merge_rows(table_name, merge_table, merge_key, merge_delete),
+                    'index_created': merge_index
+                }
+            
+            if insert_sql is not None:
+                self._record_manifest(
+                    table_name, None if appended else manifest, start_row + rows_inserted
+                )
+                if checkpoint:
+                    self._record_checkpoint(table_name, None)
+            
+            if not self._outer_transaction:
+                conn.commit()
             
             duration = time.time() - start_time
-            rows_inserted = len(df)
+            sampler.finalize()
             
             if self.logger:
                 self.logger.info(
                     f"Table '{table_name}': {rows_inserted} lignes insérées "
                     f"en {duration:.2f}s"
                 )
+                for column, report in sampler.get_report().items():
+                    self.logger.info(
+                        f"  {column}: {report['sqlite_type'] or 'sans type'} "
+                        f"(confiance {report['confidence']:.0%}, "
+                        f"{report['sampled_values']} valeurs examinées)"
+                    )
             
             return rows_inserted
             
         except Exception as e:
-            conn.rollback()
+            # Dans une transaction de l'appelant, l'annulation lui revient
+            if not self._outer_transaction:
+                conn.rollback()
+            # Sans point de reprise, un chargement à part inachevé est inutile
+            if staging is not None and not checkpoint and not self._outer_transaction:
+                conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(staging)}")
+                self._record_temporal_columns(staging, {})
+                conn.commit()
             if self.logger:
                 self.logger.error(
                     f"Erreur lors de l'insertion dans '{table_name}': {str(e)}"
                 )
+            if isinstance(e, ValueError):
+                raise
             raise Exception(f"Impossible d'insérer les données: {str(e)}")
+        
+        finally:
+            if saved_cache_size is not None:
+                conn.execute(f"PRAGMA cache_size={saved_cache_size}")
+    
+    def _swap_staging_table(
+        self,
+        table_name: str,
+        staging: str,
+        temporal_columns: Dict[str, str],
+        indexes: Optional[List[Dict]] = None
+    ) -> None:
+        """
+        Remplacer une table par sa table de chargement.
+        
+        Le chargement est validé (sauf dans une transaction de l'appelant),
+        puis les index demandés sont construits sur la table de chargement.
+        L'échange (DROP + ALTER TABLE RENAME) se fait ensuite dans une
+        transaction courte, laissée ouverte pour les métadonnées de
+        l'appelant : les index de l'ancienne table y sont reconstruits sous
+        leur nom d'origine, libéré par le DROP. Un index impossible à
+        construire est ignoré.
+        
+        Args:
+            table_name: Nom de la table remplacée
+            staging: Nom de la table de chargement
+            temporal_columns: Format des colonnes date de la nouvelle table
+            indexes: Index supplémentaires {columns, unique}
+        """
+        conn = self.connect()
+        cursor = conn.cursor()
+        self._commit_step()
+        
+        existing = self._list_indexes(table_name)
+        existing_keys = [(spec['columns'], spec['unique']) for spec in existing]
+        
+        start_time = time.time()
+        for spec in indexes or []:
+            # Un index demandé déjà présent garde le nom de l'index en place
+            if (list(spec['columns']), spec['unique']) in existing_keys:
+                continue
+            if self._find_index(staging, spec['columns'], spec['unique']) is None:
+                self._try_build_index(table_name, spec, target_table=staging)
+        self._commit_step()
+        index_duration = time.time() - start_time
+        
+        start_time = time.time()
+        # Les vues sur la table remplacée ne doivent pas bloquer le renommage
+        cursor.execute("PRAGMA legacy_alter_table=ON")
+        try:
+            cursor.execute(f"DROP TABLE {quote_identifier(table_name)}")
+            cursor.execute(
+                f"ALTER TABLE {quote_identifier(staging)} RENAME TO {quote_identifier(table_name)}"
+            )
+        finally:
+            conn.execute("PRAGMA legacy_alter_table=OFF")
+        for spec in existing:
+            self._try_build_index(table_name, spec)
+        self._record_temporal_columns(table_name, temporal_columns)
+        self._record_temporal_columns(staging, {})
+        
+        if self.logger:
+            self.logger.info(
+                f"Table '{table_name}' remplacée par '{staging}' "
+                f"(index {index_duration:.2f}s, échange {time.time() - start_time:.3f}s)"
+            )
+    
+    def _try_build_index(self, table_name: str, spec: Dict, target_table: Optional[str] = None) -> None:
+        """
+        Construire un index lors d'un remplacement, sans effectuer de commit.
+        
+        Un index impossible (colonne disparue, doublons) ne bloque pas le
+        remplacement : il est seulement signalé dans le journal.
+        
+        Args:
+            table_name: Nom de la table remplacée
+            spec: Index {columns, unique} et, pour un index de l'ancienne
+                table, son nom d'origine {name}
+            target_table: Table sur laquelle construire l'index
+        """
+        try:
+            self._build_index(
+                table_name, spec['columns'], spec['unique'],
+                target_table=target_table,
+                base_name=spec.get('name')
+            )
+        except (ValueError, sqlite3.Error) as e:
+            if self.logger:
+                self.logger.warning(
+                    f"Index ({', '.join(spec['columns'])}) non construit sur "
+                    f"'{target_table or table_name}': {str(e)}"
+                )
+    
+    def _create_merge_table(
+        self,
+        table_name: str,
+        columns: List[str],
+        merge_key: List[str]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Préparer la fusion dans une table existante.
+        
+        Vérifie la clé, crée au besoin un index unique sur la clé (requis par
+        ON CONFLICT) et une table temporaire aux types de la table cible.
+        L'index unique est permanent (SQLite n'accepte pas d'index temporaire
+        sur une table de la base) : son nom est renvoyé pour en informer
+        l'utilisateur. N'effectue pas de commit.
+        
+        Args:
+            table_name: Nom de la table cible
+            columns: Colonnes des données à fusionner
+            merge_key: Colonnes identifiant une ligne
+        
+        Returns:
+            Tuple (nom de la table temporaire (schéma temp), nom de l'index
+            unique créé sur la clé ou None s'il existait déjà)
+        
+        Raises:
+            ValueError: Si la clé est vide ou absente des données, si une
+                colonne n'existe pas dans la table, ou si la clé n'y est pas
+                unique
+        """
+        if not merge_key:
+            raise ValueError(f"Clé de fusion non déclarée pour '{table_name}'")
+        
+        missing_key = [column for column in merge_key if column not in columns]
+        if missing_key:
+            raise ValueError(
+                f"Colonne(s) de la clé absente(s) de la feuille: {', '.join(missing_key)}"
+            )
+        
+        table_info = self.get_table_info(table_name)
+        declared_types = {column['name']: column['type'] for column in table_info}
+        unknown = [column for column in columns if column not in declared_types]
+        if unknown:
+            raise ValueError(
+                f"Colonne(s) inconnue(s) dans '{table_name}': {', '.join(unknown)}"
+            )
+        
+        # ON CONFLICT exige un index unique (ou une clé primaire) sur la clé
+        conn = self.connect()
+        primary_key = [
+            column['name'] for column in sorted(table_info, key=lambda column: column['cid'])
+            if column['pk']
+        ]
+        unique_keys = [
+            [row[2] for row in conn.execute(f"PRAGMA index_info({quote_identifier(name)})")]
+            for _, name, unique, _, partial in conn.execute(
+                f"PRAGMA index_list({quote_identifier(table_name)})"
+            ).fetchall()
+            if unique and not partial
+        ]
+        index_created = None
+        if sorted(merge_key) != sorted(primary_key) and sorted(merge_key) not in map(sorted, unique_keys):
+            try:
+                index_created = self._build_index(table_name, merge_key, unique=True)
+            except sqlite3.IntegrityError:
+                raise ValueError(
+                    f"La clé ({', '.join(merge_key)}) n'est pas unique dans '{table_name}'"
+                )
+            if self.logger:
+                self.logger.warning(
+                    f"Index unique '{index_created}' créé sur la clé de fusion de '{table_name}'"
+                )
+        
+        merge_table = f"{INTERNAL_TABLE_PREFIX}merge_{table_name}"
+        columns_sql = ', '.join(
+            f"{quote_identifier(column)} {declared_types[column]}" for column in columns
+        )
+        conn.execute(f"DROP TABLE IF EXISTS temp.{quote_identifier(merge_table)}")
+        conn.execute(f"CREATE TEMP TABLE {quote_identifier(merge_table)} ({columns_sql})")
+        
+        return merge_table, index_created
+    
+    def _merge_rows(
+        self,
+        table_name: str,
+        merge_table: str,
+        merge_key: List[str],
+        merge_delete: bool = False
+    ) -> Dict[str, int]:
+        """
+        Fusionner la table temporaire dans la table cible.
+        
+        Une seule requête INSERT ... ON CONFLICT DO UPDATE insère les
+        nouvelles lignes et ne met à jour que celles dont une valeur a
+        changé : les pages des lignes identiques ne sont pas réécrites.
+        N'effectue pas de commit.
+        
+        Args:
+            table_name: Nom de la table cible
+            merge_table: Table temporaire (_create_merge_table)
+            merge_key: Colonnes identifiant une ligne
+            merge_delete: Supprimer les lignes de la cible absentes de la source
+        
+        Returns:
+            Dictionnaire {'inserted', 'updated', 'deleted'} : lignes
+            nouvelles, lignes existantes modifiées et lignes supprimées
+        """
+        conn = self.connect()
+        target = quote_identifier(table_name)
+        source = f"temp.{quote_identifier(merge_table)}"
+        
+        columns = [
+            row[1] for row in conn.execute(f"PRAGMA temp.table_info({quote_identifier(merge_table)})")
+        ]
+        columns_sql = ', '.join(quote_identifier(column) for column in columns)
+        key_sql = ', '.join(quote_identifier(column) for column in merge_key)
+        
+        updated = [column for column in columns if column not in merge_key]
+        if updated:
+            assignments = ', '.join(
+                f"{quote_identifier(column)}=excluded.{quote_identifier(column)}" for column in updated
+            )
+            changed = ' OR '.join(
+                f"{target}.{quote_identifier(column)} IS NOT excluded.{quote_identifier(column)}"
+                for column in updated
+            )
+            on_conflict = f"DO UPDATE SET {assignments} WHERE {changed}"
+        else:
+            on_conflict = "DO NOTHING"
+        
+        # Lignes sans correspondance dans la cible (une clé vide n'entre
+        # jamais en conflit) : insérées ; les autres écritures sont des mises à jour
+        key_matches = ' AND '.join(
+            f"{target}.{quote_identifier(column)} = source.{quote_identifier(column)}"
+            for column in merge_key
+        )
+        new_rows = conn.execute(
+            f"SELECT COUNT(*) FROM {source} AS source "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {target} WHERE {key_matches})"
+        ).fetchone()[0]
+        
+        # "WHERE true" lève l'ambiguïté entre ON CONFLICT et une jointure
+        changes = conn.total_changes
+        conn.execute(
+            f"INSERT INTO {target} ({columns_sql}) SELECT {columns_sql} FROM {source} "
+            f"WHERE true ON CONFLICT ({key_sql}) {on_conflict}"
+        )
+        written = conn.total_changes - changes
+        inserted = min(new_rows, written)
+        updated = written - inserted
+        
+        deleted = 0
+        if merge_delete:
+            conn.execute(
+                f"CREATE INDEX temp.{quote_identifier(merge_table + '_key')} "
+                f"ON {quote_identifier(merge_table)} ({key_sql})"
+            )
+            matches = ' AND '.join(
+                f"source.{quote_identifier(column)} IS {target}.{quote_identifier(column)}"
+                for column in merge_key
+            )
+            changes = conn.total_changes
+            conn.execute(
+                f"DELETE FROM {target} WHERE NOT EXISTS "
+                f"(SELECT 1 FROM {source} AS source WHERE {matches})"
+            )
+            deleted = conn.total_changes - changes
+        
+        conn.execute(f"DROP TABLE {source}")
+        
+        if self.logger:
+            self.logger.info(
+                f"Fusion dans '{table_name}' sur ({', '.join(merge_key)}): "
+                f"{inserted} ligne(s) insérée(s), {updated} modifiée(s), {deleted} supprimée(s)"
+            )
+        
+        return {'inserted': inserted, 'updated': updated, 'deleted': deleted}
+    
+    def create_index(
+        self,
+        table_name: str,
+        columns: List[str],
+        unique: bool = False
+    ) -> Dict:
+        """
+        Créer un index sur une table déjà chargée.
+        
+        À appeler une fois toutes les lignes insérées : construire l'index
+        en une passe est bien plus rapide que de le maintenir ligne à ligne.
+        Un index équivalent (mêmes colonnes, même unicité) déjà présent,
+        par exemple construit avant l'échange d'une table remplacée, est
+        conservé tel quel.
+        
+        Args:
+            table_name: Nom de la table
+            columns: Colonnes indexées (plusieurs pour un index composite)
+            unique: Créer un index unique
+            
+        Returns:
+            Dictionnaire {'name', 'table', 'columns', 'unique', 'duration',
+            'existing'} ('existing' vaut True si l'index était déjà présent)
+            
+        Raises:
+            ValueError: Si une colonne n'existe pas dans la table
+        """
+        start_time = time.time()
+        
+        index_name = self._find_index(table_name, columns, unique)
+        existing = index_name is not None
+        if not existing:
+            index_name = self._build_index(table_name, columns, unique)
+            self.connect().commit()
+            
+            if self.logger:
+                self.logger.info(
+                    f"Index '{index_name}' créé sur '{table_name}' "
+                    f"en {time.time() - start_time:.2f}s"
+                )
+        elif self.logger:
+            self.logger.info(f"Index '{index_name}' déjà présent sur '{table_name}'")
+        
+        return {
+            'name': index_name,
+            'table': table_name,
+            'columns': columns,
+            'unique': unique,
+            'duration': time.time() - start_time,
+            'existing': existing
+        }
+    
+    def _list_indexes(self, table_name: str) -> List[Dict]:
+        """
+        Lister les index d'une table créés par CREATE INDEX.
+        
+        Les index sur expressions et les index partiels ne sont pas décrits
+        par leurs seules colonnes et ne sont pas listés.
+        
+        Returns:
+            Liste de dictionnaires {'name', 'columns', 'unique'}
+        """
+        conn = self.connect()
+        indexes = []
+        
+        for _, name, unique, origin, partial in conn.execute(
+            f"PRAGMA index_list({quote_identifier(table_name)})"
+        ).fetchall():
+            if origin != 'c':
+                continue
+            columns = [
+                row[2] for row in conn.execute(f"PRAGMA index_info({quote_identifier(name)})")
+            ]
+            if partial or None in columns:
+                if self.logger:
+                    self.logger.warning(
+                        f"Index '{name}' de '{table_name}' non reproductible (expression ou partiel)"
+                    )
+                continue
+            indexes.append({'name': name, 'columns': columns, 'unique': bool(unique)})
+        
+        return indexes
+    
+    def _find_index(self, table_name: str, columns: List[str], unique: bool) -> Optional[str]:
+        """Nom d'un index existant sur ces colonnes, None s'il n'y en a pas."""
+        for index in self._list_indexes(table_name):
+            if index['columns'] == list(columns) and index['unique'] == unique:
+                return index['name']
+        return None
+    
+    def _build_index(
+        self,
+        table_name: str,
+        columns: List[str],
+        unique: bool,
+        target_table: Optional[str] = None,
+        base_name: Optional[str] = None
+    ) -> str:
+        """
+        Construire un index sans effectuer de commit.
+        
+        Le nom (`base_name`, ou dérivé de `table_name` même si l'index est
+        construit sur `target_table`) reste correct une fois la table de
+        chargement renommée. Un suffixe numérique évite les noms déjà pris
+        par un autre index de la base.
+        
+        Returns:
+            Nom de l'index créé
+            
+        Raises:
+            ValueError: Si une colonne n'existe pas dans la table
+        """
+        target_table = target_table or table_name
+        
+        existing = {column['name'] for column in self.get_table_info(target_table)}
+        missing = [column for column in columns if column not in existing]
+        if missing:
+            raise ValueError(
+                f"Colonne(s) inconnue(s) dans '{table_name}': {', '.join(missing)}"
+            )
+        
+        conn = self.connect()
+        prefix = 'ux' if unique else 'idx'
+        base_name = base_name or f"{prefix}_{table_name}_{'_'.join(columns)}"
+        index_name = base_name
+        suffix = 1
+        while conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND name=?", (index_name,)
+        ).fetchone():
+            index_name = f"{base_name}_{suffix}"
+            suffix += 1
+        
+        columns_sql = ', '.join(quote_identifier(column) for column in columns)
+        conn.execute(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX "
+            f"{quote_identifier(index_name)} ON {quote_identifier(target_table)} ({columns_sql})"
+        )
+        
+        return index_name
     
     def handle_table_conflict(
         self,
         table_name: str,
         action: ConflictAction
-    ) -> Literal['replace', 'append', 'skip']:
+    ) -> Literal['replace', 'append', 'merge', 'skip']:
         """
         Gérer le conflit lorsqu'une table existe déjà.
         
         Args:
             table_name: Nom de la table en conflit
-            action: Action à effectuer ('overwrite', 'append', 'skip', 'cancel')
+            action: Action à effectuer ('overwrite', 'append', 'merge', 'skip',
+                'cancel')
             
         Returns:
-            Action correspondante pour pandas to_sql ('replace', 'append', 'skip')
+            Action correspondante pour insert_dataframe ('replace', 'append',
+            'merge', 'skip')
             
         Raises:
             ValueError: Si action='cancel'
@@ -243,6 +1344,11 @@ class DatabaseManager:
                 self.logger.info(f"Ajout de données à la table '{table_name}'")
             return 'append'
         
+        elif action == 'merge':
+            if self.logger:
+                self.logger.info(f"Fusion des données dans la table '{table_name}'")
+            return 'merge'
+        
         elif action == 'skip':
             if self.logger:
                 self.logger.info(f"Table '{table_name}' ignorée")
@@ -267,40 +1373,114 @@ class DatabaseManager:
             return 0, "0 B"
         
         size_bytes = self.db_path.stat().st_size
+        return size_bytes, format_file_size(size_bytes)
+    
+    def get_storage_usage(self, per_table: bool = True) -> Dict:
+        """
+        Mesurer la place occupée sur disque par chaque table et ses index.
         
-        # Formater la taille
-        if size_bytes < 1024:
-            size_str = f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            size_str = f"{size_bytes / 1024:.2f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
-        else:
-            size_str = f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+        Les tailles viennent de la table virtuelle dbstat (un seul parcours
+        pour toute la base) ; si SQLite a été compilé sans dbstat, les pages
+        du fichier sont parcourues directement (voir PageWalker).
+        
+        Args:
+            per_table: Mesurer chaque table ; sinon seuls les compteurs de
+                pages (lus dans l'en-tête, sans parcours) sont renvoyés
+        
+        Returns:
+            Dictionnaire avec:
+            - source: 'dbstat', 'page_walk' ou None (tables non mesurées)
+            - page_size, page_count, freelist_count: pages de la base
+            - freelist_ratio: proportion de pages libres (à récupérer par VACUUM)
+            - tables: {nom_table: {'table_bytes', 'index_bytes'}}
+        """
+        conn = self.connect()
+        
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist_count = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        freelist_ratio = freelist_count / page_count if page_count else 0.0
         
-        return size_bytes, size_str
+        if not per_table:
+            return {
+                'source': None,
+                'page_size': page_size,
+                'page_count': page_count,
+                'freelist_count': freelist_count,
+                'freelist_ratio': freelist_ratio,
+                'tables': {}
+            }
+        
+        objects = conn.execute(
+            "SELECT name, tbl_name, type, rootpage FROM sqlite_master "
+            "WHERE type IN ('table', 'index')"
+        ).fetchall()
+        
+        try:
+            sizes = dict(conn.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"
+            ).fetchall())
+            source = 'dbstat'
+        except sqlite3.OperationalError:
+            # Reporter les pages du journal WAL dans le fichier avant de le lire
+            conn.commit()
+            conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            with PageWalker(self.db_path, self.logger) as walker:
+                sizes = walker.btree_sizes({name: rootpage for name, _, _, rootpage in objects})
+            source = 'page_walk'
+        
+        tables: Dict[str, Dict[str, int]] = {}
+        for name, table_name, object_type, _ in objects:
+            usage = tables.setdefault(table_name, {'table_bytes': 0, 'index_bytes': 0})
+            key = 'table_bytes' if object_type == 'table' else 'index_bytes'
+            usage[key] += sizes.get(name) or 0
+        
+        return {
+            'source': source,
+            'page_size': page_size,
+            'page_count': page_count,
+            'freelist_count': freelist_count,
+            'freelist_ratio': freelist_ratio,
+            'tables': tables
+        }
     
-    def get_database_stats(self) -> Dict:
+    def get_database_stats(self, exact: bool = True) -> Dict:
         """
         Obtenir des statistiques sur la base de données.
         
+        Args:
+            exact: Compter les lignes avec COUNT(*) et mesurer la taille de
+                chaque table ; sinon le nombre de lignes est estimé (voir
+                estimate_row_count) et marqué comme tel, et les tailles par
+                table (parcours de toutes les pages) ne sont pas mesurées
+        
         Returns:
-            Dictionnaire avec les statistiques
+            Dictionnaire avec les statistiques (size_bytes et index_bytes des
+            tables à None si elles n'ont pas été mesurées)
         """
         tables = self.get_all_tables()
         total_rows = 0
         
+        storage = self.get_storage_usage(per_table=exact)
+        
         table_stats = []
         for table in tables:
-            row_count = self.get_row_count(table)
+            row_count = None if exact else estimate_row_count(self.connect(), table)
+            rows_estimated = row_count is not None
+            if row_count is None:
+                row_count = self.get_row_count(table)
             total_rows += row_count
             
             columns = self.get_table_info(table)
             
+            usage = storage['tables'].get(table, {}) if exact else {}
             table_stats.append({
                 'name': table,
                 'rows': row_count,
-                'columns': len(columns)
+                'rows_estimated': rows_estimated,
+                'columns': len(columns),
+                'size_bytes': usage.get('table_bytes', 0) if exact else None,
+                'index_bytes': usage.get('index_bytes', 0) if exact else None
             })
         
         size_bytes, size_str = self.get_database_size()
@@ -311,7 +1491,12 @@ class DatabaseManager:
             'size_formatted': size_str,
             'tables_count': len(tables),
             'total_rows': total_rows,
-            'tables': table_stats
+            'tables': table_stats,
+            'page_size': storage['page_size'],
+            'page_count': storage['page_count'],
+            'freelist_count': storage['freelist_count'],
+            'freelist_ratio': storage['freelist_ratio'],
+            'size_source': storage['source']
         }
         
         return stats
@@ -323,4 +1508,4 @@ class DatabaseManager:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Support du context manager."""
-        self.close()
+        self.close(rollback=exc_type is not None)
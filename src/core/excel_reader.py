@@ -3,13 +3,26 @@ Lecture et analyse des fichiers Excel
 """
 import pandas as pd
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterator, Sequence, Any
+import hashlib
 import logging
+import zipfile
 
 from .type_detector import infer_column_types, get_type_stats, convert_datetime_columns
+from .xlsx_inspector import XlsxInspector, HASH_BLOCK_SIZE
 from ..utils.name_cleaner import clean_table_name, clean_and_ensure_unique
 
 
+# Nombre de lignes lues pour l'analyse (aperçu et détection des types)
+DEFAULT_SAMPLE_ROWS = 1000
+
+# Nombre de lignes d'aperçu lues par la découverte rapide des feuilles
+DEFAULT_PREVIEW_ROWS = 10
+
+# Nombre de lignes par bloc lors de la lecture en flux
+DEFAULT_CHUNK_ROWS = 10000
+
+
 class ExcelReader:
     """
     Classe pour lire et analyser des fichiers Excel.
@@ -26,6 +39,7 @@ class ExcelReader:
         self.file_path = Path(file_path)
         self.logger = logger
         self._validate_file()
+        self._excel_file: Optional[pd.ExcelFile] = None
         
     def _validate_file(self) -> None:
         """
@@ -44,6 +58,41 @@ class ExcelReader:
                 "Formats acceptés: .xlsx, .xls, .xlsm"
             )
     
+    def open(self) -> pd.ExcelFile:
+        """
+        Ouvrir le classeur (une seule fois) et retourner le handle partagé.
+        
+        Le classeur ouvert (table des chaînes partagées, styles) est
+        réutilisé par toutes les lectures de feuilles jusqu'à close().
+        
+        Returns:
+            Classeur pandas ouvert
+            
+        Raises:
+            Exception: Si le fichier ne peut pas être lu
+        """
+        if self._excel_file is None:
+            try:
+                self._excel_file = pd.ExcelFile(self.file_path)
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"Erreur lors de la lecture du fichier: {str(e)}")
+                raise Exception(f"Impossible de lire le fichier Excel: {str(e)}")
+            
+            if self.logger:
+                self.logger.info(f"Classeur ouvert: {self.file_path}")
+        return self._excel_file
+    
+    def close(self) -> None:
+        """
+        Fermer le classeur s'il est ouvert.
+        """
+        if self._excel_file is not None:
+            self._excel_file.close()
+            self._excel_file = None
+            if self.logger:
+                self.logger.info("Classeur fermé")
+    
     def get_sheet_names(self) -> List[str]:
         """
         Obtenir la liste des noms de feuilles dans le fichier Excel.
@@ -55,8 +104,7 @@ class ExcelReader:
             Exception: Si le fichier ne peut pas être lu
         """
         try:
-            excel_file = pd.ExcelFile(self.file_path)
-            sheet_names = excel_file.sheet_names
+            sheet_names = self.open().sheet_names
             
             if self.logger:
                 self.logger.info(
@@ -88,8 +136,7 @@ class ExcelReader:
             Exception: Si la feuille ne peut pas être lue
         """
         try:
-            df = pd.read_excel(
-                self.file_path,
+            df = self.open().parse(
                 sheet_name=sheet_name,
                 nrows=nrows
             )
@@ -111,45 +158,273 @@ class ExcelReader:
                 )
             raise Exception(f"Impossible de lire la feuille '{sheet_name}': {str(e)}")
     
-    def get_sheet_info(self, sheet_name: str) -> Dict:
+    def iter_sheet_chunks(
+        self,
+        sheet_name: str,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        skip_rows: int = 0
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lire une feuille Excel par blocs de lignes, en mémoire constante.
+        
+        Les fichiers .xlsx/.xlsm sont lus en flux avec openpyxl en mode
+        lecture seule ; les fichiers .xls (sans lecture en flux possible)
+        sont lus en entier puis découpés.
+        
+        `skip_rows` permet de reprendre une lecture interrompue : les
+        premières lignes de données (lignes vides exclues, comme dans les
+        blocs) sont parcourues sans être converties en DataFrame.
+        
+        Args:
+            sheet_name: Nom de la feuille à lire
+            chunk_rows: Nombre maximum de lignes par bloc
+            skip_rows: Nombre de lignes de données à ignorer
+            
+        Yields:
+            DataFrames d'au plus `chunk_rows` lignes, avec les noms de
+            colonnes nettoyés. Une feuille sans données produit un unique
+            DataFrame vide portant les colonnes de l'en-tête.
+            
+        Raises:
+            Exception: Si la feuille ne peut pas être lue
+        """
+        if self.file_path.suffix.lower() == '.xls':
+            df = self.read_sheet(sheet_name).iloc[skip_rows:]
+            for start in range(0, max(len(df), 1), chunk_rows):
+                yield df.iloc[start:start + chunk_rows]
+            return
+        
+        # Classeur openpyxl en lecture seule partagé avec read_sheet
+        workbook = self.open().book
+        
+        if sheet_name not in workbook.sheetnames:
+            raise Exception(f"Impossible de lire la feuille '{sheet_name}': feuille introuvable")
+        
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        
+        # La première ligne non vide sert d'en-tête
+        header = next((row for row in rows if not _is_empty_row(row)), None)
+        if header is None:
+            return
+        
+        columns = _clean_header(header)
+        buffer: List[Sequence[Any]] = []
+        total_rows = 0
+        skipped = 0
+        
+        for row in rows:
+            if _is_empty_row(row):
+                continue
+            
+            if skipped < skip_rows:
+                skipped += 1
+                continue
+            
+            buffer.append(row)
+            
+            if len(buffer) >= chunk_rows:
+                total_rows += len(buffer)
+                yield _build_frame(buffer, columns)
+                buffer = []
+        
+        if buffer or total_rows == 0:
+            total_rows += len(buffer)
+            yield _build_frame(buffer, columns)
+        
+        if self.logger:
+            self.logger.info(
+                f"Feuille '{sheet_name}' lue en flux: {total_rows} lignes, "
+                f"{len(columns)} colonnes"
+                + (f" ({skipped} lignes déjà converties ignorées)" if skipped else "")
+            )
+    
+    def get_row_counts(self) -> Dict[str, Optional[int]]:
+        """
+        Obtenir le nombre de lignes de données de chaque feuille sans les lire.
+        
+        Le comptage s'appuie sur les dimensions déclarées dans le fichier
+        (balise <dimension> pour .xlsx, en-tête de feuille pour .xls),
+        l'en-tête de colonnes n'est pas compté.
+        
+        Returns:
+            Dictionnaire {nom_feuille: nombre_de_lignes}, None si inconnu
+        """
+        row_counts: Dict[str, Optional[int]] = {}
+        
+        try:
+            excel_file = self.open()
+            book = excel_file.book
+            
+            for sheet_name in excel_file.sheet_names:
+                if hasattr(book, 'sheet_by_name'):
+                    # Classeur .xls (xlrd)
+                    max_row = book.sheet_by_name(sheet_name).nrows
+                else:
+                    # Classeur .xlsx/.xlsm (openpyxl en lecture seule)
+                    max_row = book[sheet_name].max_row
+                
+                row_counts[sheet_name] = max(max_row - 1, 0) if max_row else None
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(
+                    f"Dimensions des feuilles indisponibles: {str(e)}"
+                )
+        
+        return row_counts
+    
+    def get_content_hashes(self) -> Dict[str, str]:
+        """
+        Obtenir une empreinte du contenu de chaque feuille.
+        
+        Pour les fichiers .xlsx/.xlsm, l'empreinte est calculée sur la partie
+        XML brute de chaque feuille (voir XlsxInspector.get_content_hashes).
+        Les autres formats n'ont pas de parties séparées : toutes les feuilles
+        reçoivent l'empreinte du fichier entier.
+        
+        Returns:
+            Dictionnaire {nom_feuille: empreinte_sha256}
+        """
+        if self.file_path.suffix.lower() != '.xls' and zipfile.is_zipfile(self.file_path):
+            with XlsxInspector(self.file_path, self.logger) as inspector:
+                return inspector.get_content_hashes()
+        
+        digest = hashlib.sha256()
+        with open(self.file_path, 'rb') as source:
+            for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+        
+        return {sheet_name: digest.hexdigest() for sheet_name in self.get_sheet_names()}
+    
+    def get_sheet_info(
+        self,
+        sheet_name: str,
+        sample_rows: int = DEFAULT_SAMPLE_ROWS,
+        row_count: Optional[int] = None
+    ) -> Dict:
         """
         Obtenir les informations détaillées sur une feuille.
         
+        Seules les `sample_rows` premières lignes sont lues : l'aperçu et les
+        types sont calculés sur cet échantillon, la feuille complète n'est
+        lue qu'une seule fois, au moment de la conversion.
+        
         Args:
             sheet_name: Nom de la feuille
+            sample_rows: Nombre de lignes lues pour l'analyse
+            row_count: Nombre de lignes connu par ailleurs (dimensions)
             
         Returns:
             Dictionnaire avec les informations de la feuille:
             - name: nom d'origine
             - table_name: nom nettoyé pour SQLite
             - rows: nombre de lignes
+            - rows_estimated: True si le nombre de lignes est une estimation
             - columns: nombre de colonnes
             - column_names: liste des noms de colonnes
             - column_types: types SQLite détectés
             - preview_df: DataFrame avec les premières lignes
         """
-        # Lire toute la feuille pour le comptage complet
-        df_full = self.read_sheet(sheet_name)
+        # Lire uniquement un échantillon pour l'aperçu et les types
+        df_sample = self.read_sheet(sheet_name, nrows=sample_rows)
         
-        # Lire seulement les premières lignes pour l'aperçu
-        df_preview = df_full.head(10)
+        # Si l'échantillon couvre toute la feuille, le comptage est exact
+        rows_estimated = len(df_sample) >= sample_rows and row_count is not None
+        if not rows_estimated:
+            row_count = len(df_sample)
         
         # Détecter automatiquement les types de colonnes
-        column_types = infer_column_types(df_full)
+        column_types = infer_column_types(df_sample)
         
         info = {
             'name': sheet_name,
             'table_name': clean_table_name(sheet_name),
-            'rows': len(df_full),
-            'columns': len(df_full.columns),
-            'column_names': df_full.columns.tolist(),
+            'rows': row_count,
+            'rows_estimated': rows_estimated,
+            'columns': len(df_sample.columns),
+            'column_names': df_sample.columns.tolist(),
             'column_types': column_types,
-            'preview_df': df_preview,
-            'type_stats': get_type_stats(df_full)
+            'preview_df': df_sample.head(10),
+            'type_stats': get_type_stats(df_sample)
         }
         
         return info
     
+    def discover_sheets(self, preview_rows: int = DEFAULT_PREVIEW_ROWS) -> List[Dict]:
+        """
+        Découverte rapide des feuilles à partir des métadonnées du classeur.
+        
+        Pour les fichiers .xlsx/.xlsm, seuls la balise <dimension> et les
+        premières lignes de chaque feuille sont lues dans l'archive zip ; les
+        feuilles sans dimension sont comptées par un parcours en flux. Les
+        autres formats reviennent à get_all_sheets_info().
+        
+        Args:
+            preview_rows: Nombre de lignes de données lues pour l'aperçu
+            
+        Returns:
+            Liste de dictionnaires au même format que get_sheet_info()
+        """
+        if self.file_path.suffix.lower() == '.xls' or not zipfile.is_zipfile(self.file_path):
+            return self.get_all_sheets_info()
+        
+        sheets_info = []
+        
+        with XlsxInspector(self.file_path, self.logger) as inspector:
+            for sheet_name in inspector.get_sheet_parts():
+                try:
+                    dimension = inspector.get_dimension(sheet_name)
+                    if dimension is None:
+                        first_row = 1
+                        max_row, _ = inspector.count_rows(sheet_name)
+                    else:
+                        first_row, max_row = dimension[1], dimension[3]
+                    
+                    # Lire aussi les lignes vides qui précèdent l'en-tête
+                    rows_to_read = first_row + preview_rows
+                    rows_read = inspector.read_first_rows(sheet_name, rows_to_read)
+                except Exception as e:
+                    if self.logger:
+                        self.logger.warning(
+                            f"Impossible de lire la feuille '{sheet_name}': {str(e)}"
+                        )
+                    continue
+                
+                non_empty = [
+                    (position, row) for position, row in enumerate(rows_read, start=1)
+                    if not _is_empty_row(row)
+                ]
+                if non_empty:
+                    header_row, header = non_empty[0]
+                    df_preview = _build_frame([row for _, row in non_empty[1:]], _clean_header(header))
+                else:
+                    header_row = 0
+                    df_preview = pd.DataFrame()
+                
+                # Le comptage est exact si la lecture a atteint la fin des
+                # données (fin de <sheetData> ou dernière ligne de la dimension),
+                # quel que soit le nombre de lignes vides rencontrées
+                rows_estimated = len(rows_read) >= rows_to_read and len(rows_read) < max_row
+                row_count = max(max_row - header_row, 0) if rows_estimated else len(df_preview)
+                
+                sheets_info.append({
+                    'name': sheet_name,
+                    'table_name': clean_table_name(sheet_name),
+                    'rows': row_count,
+                    'rows_estimated': rows_estimated,
+                    'columns': len(df_preview.columns),
+                    'column_names': df_preview.columns.tolist(),
+                    'column_types': infer_column_types(df_preview),
+                    'preview_df': df_preview,
+                    'type_stats': get_type_stats(df_preview)
+                })
+        
+        if self.logger:
+            self.logger.info(
+                f"Découverte rapide: {len(sheets_info)} feuille(s) détectée(s)"
+            )
+        
+        return sheets_info
+    
     def get_all_sheets_info(self) -> List[Dict]:
         """
         Obtenir les informations de toutes les feuilles du fichier.
@@ -158,11 +433,15 @@ class ExcelReader:
             Liste de dictionnaires avec les informations de chaque feuille
         """
         sheet_names = self.get_sheet_names()
+        row_counts = self.get_row_counts()
         sheets_info = []
         
         for sheet_name in sheet_names:
             try:
-                info = self.get_sheet_info(sheet_name)
+                info = self.get_sheet_info(
+                    sheet_name,
+                    row_count=row_counts.get(sheet_name)
+                )
                 sheets_info.append(info)
             except Exception as e:
                 if self.logger:
@@ -173,3 +452,52 @@ class ExcelReader:
                 continue
         
         return sheets_info
+
+    
+    def __enter__(self):
+        """Support du context manager."""
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Support du context manager."""
+        self.close()
+
+
+def _is_empty_row(row: Sequence[Any]) -> bool:
+    """Indiquer si une ligne lue par openpyxl ne contient aucune valeur."""
+    return all(value is None for value in row)
+
+
+def _build_frame(rows: List[Sequence[Any]], columns: List[str]) -> pd.DataFrame:
+    """
+    Construire un DataFrame à partir de lignes brutes de longueurs variables.
+    
+    Les lignes sont complétées ou tronquées à la largeur de l'en-tête.
+    """
+    width = len(columns)
+    records = [
+        tuple(row[:width]) + (None,) * (width - len(row)) if len(row) != width else row
+        for row in rows
+    ]
+    return pd.DataFrame.from_records(records, columns=columns)
+
+
+def _clean_header(header: Sequence[Any]) -> List[str]:
+    """
+    Construire les noms de colonnes à partir de la ligne d'en-tête brute.
+    
+    Reproduit le comportement de pandas.read_excel (colonnes sans nom
+    nommées 'Unnamed: N') avant le nettoyage habituel des noms.
+    """
+    header = list(header)
+    
+    # Ignorer les cellules vides en fin de ligne (dimensions surestimées)
+    while header and header[-1] is None:
+        header.pop()
+    
+    raw_names = [
+        f"Unnamed: {idx}" if value is None else value
+        for idx, value in enumerate(header)
+    ]
+    return clean_and_ensure_unique(raw_names)
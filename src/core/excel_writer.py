@@ -2,40 +2,176 @@
 Écriture de données dans des fichiers Excel
 """
 import pandas as pd
+import re
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Iterable, Callable, Tuple
 import logging
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.styles.stylesheet import write_stylesheet
+from openpyxl.utils import get_column_letter
 from openpyxl.utils.dataframe import dataframe_to_rows
+from openpyxl.xml.functions import tostring
+
+from ..utils.formatting import format_file_size
+
+
+# Nom du style appliqué aux en-têtes, enregistré une fois par classeur
+HEADER_STYLE_NAME = "e2db_header"
+
+# Lignes examinées pour estimer la largeur des colonnes
+DEFAULT_WIDTH_SAMPLE_ROWS = 1000
+MAX_COLUMN_WIDTH = 50
+
+# Contraintes d'Excel sur les noms de feuille
+MAX_SHEET_TITLE_LENGTH = 31
+_INVALID_TITLE_RE = re.compile(r'[\\*?:/\[\]]')
+
+
+def _make_header_style() -> NamedStyle:
+    """Créer le style d'en-tête (gras, blanc sur fond bleu, centré)."""
+    return NamedStyle(
+        name=HEADER_STYLE_NAME,
+        font=Font(bold=True, color="FFFFFF"),
+        fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+        alignment=Alignment(horizontal="center", vertical="center")
+    )
+
+
+def make_sheet_title(name: str, existing: Iterable[str]) -> str:
+    """
+    Construire un nom de feuille valide et unique dans le classeur.
+    
+    Les caractères interdits par Excel sont remplacés par '_', le nom est
+    limité à 31 caractères et un suffixe numérique le distingue (sans tenir
+    compte de la casse) des feuilles déjà présentes.
+    
+    Args:
+        name: Nom souhaité (nom de la table)
+        existing: Noms des feuilles déjà présentes
+        
+    Returns:
+        Nom de la feuille
+        
+    Examples:
+        >>> make_sheet_title('ventes/2024', [])
+        'ventes_2024'
+        >>> make_sheet_title('clients', ['Clients'])
+        'clients1'
+    """
+    taken = {title.lower() for title in existing}
+    base = _INVALID_TITLE_RE.sub('_', str(name))
+    title = base[:MAX_SHEET_TITLE_LENGTH]
+    suffix = 1
+    while title.lower() in taken:
+        title = f"{base[:MAX_SHEET_TITLE_LENGTH - len(str(suffix))]}{suffix}"
+        suffix += 1
+    return title
+
+
+@lru_cache(maxsize=1)
+def workbook_styles() -> Tuple[str, int, int]:
+    """
+    Obtenir la feuille de styles des classeurs exportés.
+    
+    Elle est produite par openpyxl à partir du style d'en-tête et du format
+    des dates d'ExcelWriter, pour les classeurs assemblés sans openpyxl
+    (export parallèle).
+    
+    Returns:
+        Tuple (XML de styles.xml, index du style d'en-tête, index du style
+        des dates) ; les index sont ceux de l'attribut s="N" des cellules
+    """
+    workbook = Workbook()
+    workbook.add_named_style(_make_header_style())
+    ws = workbook.active
+    header = ws.cell(row=1, column=1, value="")
+    header.style = HEADER_STYLE_NAME
+    date = ws.cell(row=2, column=1, value=datetime(1970, 1, 1))
+    
+    # Les styles sont enregistrés dans le classeur à la lecture de style_id
+    header_style, datetime_style = header.style_id, date.style_id
+    styles_xml = tostring(write_stylesheet(workbook)).decode('utf-8')
+    return styles_xml, header_style, datetime_style
+
+
+def estimate_column_widths(
+    df: pd.DataFrame,
+    sample_rows: int = DEFAULT_WIDTH_SAMPLE_ROWS
+) -> List[int]:
+    """
+    Estimer la largeur des colonnes à partir d'un échantillon de lignes.
+    
+    Les lignes sont prises à intervalle régulier dans le DataFrame ; la
+    largeur est la longueur maximale du texte affiché (en-tête compris)
+    plus une marge, bornée à MAX_COLUMN_WIDTH.
+    
+    Args:
+        df: DataFrame à écrire
+        sample_rows: Nombre maximal de lignes examinées
+        
+    Returns:
+        Largeur de chaque colonne, dans l'ordre des colonnes
+    """
+    step = max(1, -(-len(df) // sample_rows))
+    sample = df.iloc[::step]
+    
+    widths = []
+    for position, column in enumerate(df.columns):
+        values = sample.iloc[:, position].dropna()
+        max_length = int(values.astype(str).str.len().max()) if len(values) else 0
+        widths.append(min(max(max_length, len(str(column))) + 2, MAX_COLUMN_WIDTH))
+    
+    return widths
 
 
 class ExcelWriter:
     """
     Classe pour écrire des DataFrames dans un fichier Excel.
+    
+    En mode écriture seule (write_only=True), les lignes sont écrites au fil
+    de l'eau dans le fichier temporaire d'openpyxl au lieu d'être conservées
+    sous forme de cellules : la mémoire utilisée ne dépend plus que de la
+    taille d'un bloc.
     """
     
-    def __init__(self, output_path: Path, logger: Optional[logging.Logger] = None):
+    def __init__(
+        self,
+        output_path: Path,
+        logger: Optional[logging.Logger] = None,
+        write_only: bool = False,
+        autofit: bool = True
+    ):
         """
         Initialiser l'écrivain Excel.
         
         Args:
             output_path: Chemin vers le fichier Excel de sortie
             logger: Logger optionnel
+            write_only: Écriture en flux (les feuilles ne sont plus relisibles)
+            autofit: Ajuster la largeur des colonnes au contenu
         """
         self.output_path = Path(output_path)
         self.logger = logger
+        self.write_only = write_only
+        self.autofit = autofit
         self.workbook: Optional[Workbook] = None
         
     def create_workbook(self) -> None:
         """
         Créer un nouveau classeur Excel.
         """
-        self.workbook = Workbook()
-        # Supprimer la feuille par défaut
+        self.workbook = Workbook(write_only=self.write_only)
+        # Supprimer la feuille par défaut (absente en écriture seule)
         if 'Sheet' in self.workbook.sheetnames:
             self.workbook.remove(self.workbook['Sheet'])
         
+        # Le style d'en-tête est partagé par toutes les cellules d'en-tête
+        self.workbook.add_named_style(_make_header_style())
+        
         if self.logger:
             self.logger.info("Nouveau classeur Excel créé")
     
@@ -53,46 +189,121 @@ class ExcelWriter:
             sheet_name: Nom de la feuille
             style_header: Appliquer un style à l'en-tête (gras, fond coloré)
         """
+        if self.write_only:
+            self.add_dataframe_chunks([df], sheet_name, style_header)
+            return
+        
         if self.workbook is None:
             self.create_workbook()
         
-        # Limiter la longueur du nom de la feuille (max 31 caractères pour Excel)
-        sheet_name = sheet_name[:31]
+        # Nom valide pour Excel (31 caractères au plus) et unique
+        sheet_name = make_sheet_title(sheet_name, self.workbook.sheetnames)
         
         # Créer une nouvelle feuille
         ws = self.workbook.create_sheet(title=sheet_name)
         
-        # Écrire les données du DataFrame
-        for r_idx, row in enumerate(dataframe_to_rows(df, index=False, header=True), 1):
-            for c_idx, value in enumerate(row, 1):
-                cell = ws.cell(row=r_idx, column=c_idx, value=value)
+        # Ajuster la largeur des colonnes d'après un échantillon des données
+        if self.autofit:
+            self._set_column_widths(ws, df)
+        
+        # Écrire l'en-tête puis les lignes de données
+        ws.append(list(df.columns))
+        if style_header:
+            for cell in ws[1]:
+                cell.style = HEADER_STYLE_NAME
+        
+        for row in dataframe_to_rows(df, index=False, header=False):
+            ws.append(row)
+        
+        if self.logger:
+            self.logger.info(
+                f"Feuille '{sheet_name}' ajoutée: {len(df)} lignes, "
+                f"{len(df.columns)} colonnes"
+            )
+    
+    def add_dataframe_chunks(
+        self,
+        chunks: Iterable[pd.DataFrame],
+        sheet_name: str,
+        style_header: bool = True,
+        on_chunk: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Ajouter une feuille écrite bloc par bloc (mode écriture seule).
+        
+        L'en-tête est écrit avec des WriteOnlyCell stylées, puis chaque ligne
+        est ajoutée avec ws.append. La largeur des colonnes doit être fixée
+        avant la première ligne : elle est estimée sur le premier bloc.
+        
+        Args:
+            chunks: Itérable de DataFrames ayant les mêmes colonnes
+            sheet_name: Nom de la feuille
+            style_header: Appliquer un style à l'en-tête (gras, fond coloré)
+            on_chunk: Fonction appelée après chaque bloc avec le nombre total
+                de lignes écrites (suivi de la progression)
+            
+        Returns:
+            Nombre de lignes écrites
+            
+        Raises:
+            ValueError: Si l'écrivain n'est pas en mode écriture seule
+        """
+        if not self.write_only:
+            raise ValueError("add_dataframe_chunks nécessite le mode write_only")
+        
+        if self.workbook is None:
+            self.create_workbook()
+        
+        # Nom valide pour Excel (31 caractères au plus) et unique
+        sheet_name = make_sheet_title(sheet_name, self.workbook.sheetnames)
+        ws = self.workbook.create_sheet(title=sheet_name)
+        
+        rows_written = 0
+        columns = None
+        
+        for chunk in chunks:
+            if columns is None:
+                columns = list(chunk.columns)
                 
-                # Styler la première ligne (en-têtes)
-                if r_idx == 1 and style_header:
-                    cell.font = Font(bold=True, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
-        
-        # Ajuster automatiquement la largeur des colonnes
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
+                # Les largeurs doivent être connues avant la première ligne
+                if self.autofit:
+                    self._set_column_widths(ws, chunk)
+                
+                header = []
+                for column in columns:
+                    cell = WriteOnlyCell(ws, value=column)
+                    if style_header:
+                        cell.style = HEADER_STYLE_NAME
+                    header.append(cell)
+                ws.append(header)
+            
+            # Valeurs manquantes (NaN, NaT, NA) -> cellules vides
+            for row in chunk.to_numpy(dtype=object, na_value=None).tolist():
+                ws.append(row)
             
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
+            rows_written += len(chunk)
             
-            adjusted_width = min(max_length + 2, 50)  # Max 50 caractères
-            ws.column_dimensions[column_letter].width = adjusted_width
+            if on_chunk:
+                on_chunk(rows_written)
         
         if self.logger:
             self.logger.info(
-                f"Feuille '{sheet_name}' ajoutée: {len(df)} lignes, "
-                f"{len(df.columns)} colonnes"
+                f"Feuille '{sheet_name}' ajoutée: {rows_written} lignes, "
+                f"{len(columns or [])} colonnes"
             )
+        
+        return rows_written
+    
+    def _set_column_widths(self, ws, df: pd.DataFrame) -> None:
+        """
+        Fixer la largeur des colonnes d'une feuille avant son écriture.
+        
+        Args:
+            ws: Feuille openpyxl (normale ou en écriture seule)
+            df: Données (ou premier bloc) de la feuille
+        """
+        for c_idx, width in enumerate(estimate_column_widths(df), 1):
+            ws.column_dimensions[get_column_letter(c_idx)].width = width
     
     def add_multiple_dataframes(
         self,
@@ -142,18 +353,7 @@ class ExcelWriter:
             return 0, "0 B"
         
         size_bytes = self.output_path.stat().st_size
-        
-        # Formater la taille
-        if size_bytes < 1024:
-            size_str = f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            size_str = f"{size_bytes / 1024:.2f} KB"
-        elif size_bytes < 1024 * 1024 * 1024:
-            size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
-        else:
-            size_str = f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
-        
-        return size_bytes, size_str
+        return size_bytes, format_file_size(size_bytes)
     
     def __enter__(self):
         """Support du context manager."""
@@ -0,0 +1,190 @@
+"""
+Parcours des pages d'un fichier SQLite (taille des tables sans dbstat)
+"""
+import math
+from pathlib import Path
+from typing import Dict, Optional, Tuple, BinaryIO
+import logging
+
+
+SQLITE_HEADER = b"SQLite format 3\x00"
+FILE_HEADER_SIZE = 100
+
+# Types de pages B-tree (premier octet de l'en-tête de page)
+PAGE_INTERIOR_INDEX = 2
+PAGE_INTERIOR_TABLE = 5
+PAGE_LEAF_INDEX = 10
+PAGE_LEAF_TABLE = 13
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """
+    Décoder un entier de longueur variable SQLite.
+    
+    Returns:
+        Tuple (valeur, position après l'entier)
+    """
+    value = 0
+    for i in range(8):
+        byte = data[offset + i]
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, offset + i + 1
+    return (value << 8) | data[offset + 8], offset + 9
+
+
+class PageWalker:
+    """
+    Classe pour mesurer la place occupée par chaque B-tree d'une base SQLite.
+    
+    Utilisée quand le module dbstat n'est pas compilé dans SQLite : chaque
+    page d'un arbre est lue une seule fois depuis le fichier, et les pages de
+    débordement sont comptées à partir de la taille des enregistrements,
+    sans parcourir leurs chaînes.
+    """
+    
+    def __init__(self, db_path: Path, logger: Optional[logging.Logger] = None):
+        """
+        Initialiser le parcours de pages.
+        
+        Args:
+            db_path: Chemin vers le fichier de base de données SQLite
+            logger: Logger optionnel
+        """
+        self.db_path = Path(db_path)
+        self.logger = logger
+        self._file: Optional[BinaryIO] = None
+        self.page_size = 0
+        self.usable_size = 0
+    
+    def open(self) -> None:
+        """
+        Ouvrir le fichier et lire l'en-tête de la base.
+        
+        Raises:
+            ValueError: Si le fichier n'est pas une base SQLite
+        """
+        if self._file is not None:
+            return
+        
+        self._file = open(self.db_path, 'rb')
+        header = self._file.read(FILE_HEADER_SIZE)
+        
+        if not header.startswith(SQLITE_HEADER):
+            self.close()
+            raise ValueError(f"{self.db_path} n'est pas une base SQLite")
+        
+        page_size = int.from_bytes(header[16:18], 'big')
+        self.page_size = 65536 if page_size == 1 else page_size
+        self.usable_size = self.page_size - header[20]
+    
+    def close(self) -> None:
+        """Fermer le fichier."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+    
+    def _read_page(self, page_number: int) -> bytes:
+        """Lire une page (numérotées à partir de 1)."""
+        self._file.seek((page_number - 1) * self.page_size)
+        return self._file.read(self.page_size)
+    
+    def _overflow_pages(self, payload_size: int, max_local: int) -> int:
+        """Nombre de pages de débordement d'un enregistrement."""
+        if payload_size <= max_local:
+            return 0
+        
+        usable = self.usable_size
+        min_local = (usable - 12) * 32 // 255 - 23
+        local = min_local + (payload_size - min_local) % (usable - 4)
+        if local > max_local:
+            local = min_local
+        
+        return math.ceil((payload_size - local) / (usable - 4))
+    
+    def btree_pages(self, root_page: int) -> int:
+        """
+        Compter les pages d'un B-tree (débordements compris).
+        
+        Args:
+            root_page: Numéro de la page racine (sqlite_master.rootpage)
+        
+        Returns:
+            Nombre de pages occupées par l'arbre
+        """
+        self.open()
+        
+        usable = self.usable_size
+        max_local_table = usable - 35
+        max_local_index = (usable - 12) * 64 // 255 - 23
+        
+        pages = 0
+        pending = [root_page]
+        
+        while pending:
+            page_number = pending.pop()
+            page = self._read_page(page_number)
+            pages += 1
+            
+            # La page 1 commence par l'en-tête du fichier
+            start = FILE_HEADER_SIZE if page_number == 1 else 0
+            page_type = page[start]
+            cell_count = int.from_bytes(page[start + 3:start + 5], 'big')
+            
+            interior = page_type in (PAGE_INTERIOR_INDEX, PAGE_INTERIOR_TABLE)
+            header_size = 12 if interior else 8
+            if interior:
+                pending.append(int.from_bytes(page[start + 8:start + 12], 'big'))
+            
+            pointers = start + header_size
+            for i in range(cell_count):
+                offset = int.from_bytes(page[pointers + 2 * i:pointers + 2 * i + 2], 'big')
+                
+                if interior:
+                    pending.append(int.from_bytes(page[offset:offset + 4], 'big'))
+                    offset += 4
+                
+                if page_type == PAGE_INTERIOR_TABLE:
+                    continue
+                
+                payload_size, _ = _read_varint(page, offset)
+                max_local = max_local_table if page_type == PAGE_LEAF_TABLE else max_local_index
+                pages += self._overflow_pages(payload_size, max_local)
+        
+        return pages
+    
+    def btree_sizes(self, root_pages: Dict[str, int]) -> Dict[str, int]:
+        """
+        Mesurer la taille de plusieurs B-trees en un seul passage.
+        
+        Args:
+            root_pages: Dictionnaire {nom: page_racine}
+        
+        Returns:
+            Dictionnaire {nom: taille_en_octets}
+        """
+        self.open()
+        
+        sizes = {}
+        for name, root_page in root_pages.items():
+            if not root_page:
+                # Tables virtuelles et vues : pas de stockage propre
+                sizes[name] = 0
+                continue
+            sizes[name] = self.btree_pages(root_page) * self.page_size
+        
+        if self.logger:
+            self.logger.info(
+                f"Parcours des pages de {self.db_path.name}: {len(sizes)} arbre(s)"
+            )
+        
+        return sizes
+    
+    def __enter__(self):
+        """Support du context manager."""
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Support du context manager."""
+        self.close()
@@ -0,0 +1,492 @@
+"""
+Lecture parallèle des feuilles d'un classeur Excel
+"""
+import pandas as pd
+import itertools
+import multiprocessing
+import queue
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, Future
+from pathlib import Path
+from typing import List, Dict, Optional, Iterator, Iterable, Tuple, Any, Callable
+import logging
+
+from .excel_reader import ExcelReader, DEFAULT_CHUNK_ROWS
+
+
+# Nombre maximal de blocs lus d'avance par lecture en cours : la mémoire
+# utilisée est bornée à `workers * DEFAULT_MAX_PENDING` blocs, quelle que
+# soit la taille des feuilles
+DEFAULT_MAX_PENDING = 2
+
+# Messages envoyés par les processus de lecture
+_SHEETS = 'sheets'
+_CHUNK = 'chunk'
+_SHEET_END = 'sheet_end'
+_END = 'end'
+_ERROR = 'error'
+
+# Files et signaux d'arrêt des emplacements, hérités par chaque processus
+_worker_slots: List[Tuple[Any, Any]] = []
+
+
+def _init_worker(slots: List[Tuple[Any, Any]]) -> None:
+    """Recevoir les files des emplacements au démarrage d'un processus."""
+    global _worker_slots
+    _worker_slots = slots
+    
+    # Ne pas attendre, à l'arrêt du processus, des blocs que plus personne
+    # ne lira (lecture abandonnée)
+    for messages, _ in slots:
+        messages.cancel_join_thread()
+
+
+def _send(slot: int, task_id: int, kind: str, payload: Any = None) -> bool:
+    """
+    Déposer un message dans la file d'un emplacement.
+    
+    Attend une place libre tant que la lecture n'est pas abandonnée.
+    
+    Returns:
+        False si l'écrivain a abandonné la lecture
+    """
+    messages, stop = _worker_slots[slot]
+    while not stop.is_set():
+        try:
+            messages.put((task_id, kind, payload), timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_sheet_worker(
+    slot: int,
+    task_id: int,
+    file_path: str,
+    sheet_name: str,
+    chunk_rows: int,
+    skip_rows: int = 0
+) -> None:
+    """
+    Lire une feuille dans un processus de travail et envoyer ses blocs en flux.
+    
+    Les blocs sont transmis au fil de la lecture par pickle, qui envoie les
+    colonnes numériques d'un DataFrame sous forme de tampons contigus.
+    """
+    try:
+        with ExcelReader(Path(file_path)) as reader:
+            for chunk in reader.iter_sheet_chunks(sheet_name, chunk_rows, skip_rows):
+                if not _send(slot, task_id, _CHUNK, chunk):
+                    return
+    except Exception as e:
+        _send(slot, task_id, _ERROR, str(e))
+        return
+    
+    _send(slot, task_id, _END)
+
+
+def _sheet_summary(sheet_info: Dict) -> Dict:
+    """Garder les informations utiles à l'écriture (sans l'aperçu)."""
+    return {key: sheet_info[key] for key in ('name', 'table_name', 'rows', 'column_names')}
+
+
+def _read_workbook_worker(slot: int, task_id: int, file_path: str, chunk_rows: int) -> None:
+    """
+    Lire toutes les feuilles d'un classeur dans un processus de travail.
+    
+    Envoie d'abord la liste des feuilles, puis les blocs de chaque feuille
+    (repérés par la position de la feuille) suivis d'une fin de feuille.
+    """
+    try:
+        with ExcelReader(Path(file_path)) as reader:
+            sheets_info = reader.discover_sheets()
+            if not _send(slot, task_id, _SHEETS, [_sheet_summary(info) for info in sheets_info]):
+                return
+            
+            for index, info in enumerate(sheets_info):
+                for chunk in reader.iter_sheet_chunks(info['name'], chunk_rows):
+                    if not _send(slot, task_id, _CHUNK, (index, chunk)):
+                        return
+                if not _send(slot, task_id, _SHEET_END, index):
+                    return
+    except Exception as e:
+        _send(slot, task_id, _ERROR, str(e))
+        return
+    
+    _send(slot, task_id, _END)
+
+
+class _ReadTask:
+    """Lecture en cours dans un processus, reçue par la file de son emplacement."""
+    
+    def __init__(self, pool: '_StreamingPool', slot: int, task_id: int, future: Future):
+        """
+        Initialiser le suivi d'une lecture.
+        
+        Args:
+            pool: Pool propriétaire des emplacements
+            slot: Emplacement (file et signal d'arrêt) de la lecture
+            task_id: Identifiant des messages de la lecture
+            future: Tâche du pool de processus
+        """
+        self.pool = pool
+        self.slot = slot
+        self.task_id = task_id
+        self.future = future
+    
+    def messages(self) -> Iterator[Tuple[str, Any]]:
+        """
+        Recevoir les messages de la lecture, dans l'ordre d'envoi.
+        
+        Raises:
+            Exception: L'erreur de lecture envoyée par le processus, ou l'arrêt
+                inattendu du processus
+        """
+        messages, _ = self.pool.slots[self.slot]
+        
+        while True:
+            try:
+                task_id, kind, payload = messages.get(timeout=0.1)
+            except queue.Empty:
+                if self.future.done() and self.future.exception() is not None:
+                    raise Exception(
+                        f"Impossible de lire le fichier: {str(self.future.exception())}"
+                    )
+                continue
+            
+            # Reste d'une lecture abandonnée sur le même emplacement
+            if task_id != self.task_id:
+                continue
+            if kind == _ERROR:
+                raise Exception(payload)
+            if kind == _END:
+                return
+            yield kind, payload
+    
+    def release(self) -> None:
+        """Arrêter la lecture si elle n'est pas terminée et libérer l'emplacement."""
+        _, stop = self.pool.slots[self.slot]
+        stop.set()
+        try:
+            self.future.result()
+        except Exception:
+            pass
+        stop.clear()
+        self.pool.free_slots.append(self.slot)
+
+
+class _StreamingPool:
+    """
+    Pool de processus dont les lectures renvoient leurs blocs en flux.
+    
+    Chaque lecture en cours occupe un emplacement : une file bornée à
+    `max_pending` blocs et un signal d'arrêt. Un processus dont la file est
+    pleine attend que l'écrivain consomme un bloc.
+    """
+    
+    def __init__(self, workers: int, max_pending: int):
+        """
+        Initialiser le pool.
+        
+        Args:
+            workers: Nombre de processus (et d'emplacements)
+            max_pending: Nombre maximal de blocs en attente par emplacement
+        """
+        context = multiprocessing.get_context()
+        self.slots = [
+            (context.Queue(maxsize=max(1, max_pending)), context.Event())
+            for _ in range(workers)
+        ]
+        self.free_slots = list(range(workers))
+        self._task_ids = itertools.count()
+        self._tasks: List[_ReadTask] = []
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(self.slots,)
+        )
+    
+    def submit(self, worker: Callable, *args) -> _ReadTask:
+        """Lancer une lecture sur un emplacement libre."""
+        slot = self.free_slots.pop(0)
+        task_id = next(self._task_ids)
+        task = _ReadTask(self, slot, task_id, self._executor.submit(worker, slot, task_id, *args))
+        self._tasks.append(task)
+        return task
+    
+    def close(self) -> None:
+        """Arrêter les lectures en cours et le pool."""
+        for _, stop in self.slots:
+            stop.set()
+        for task in self._tasks:
+            try:
+                task.future.result()
+            except Exception:
+                pass
+        self._executor.shutdown(wait=True)
+    
+    def __enter__(self):
+        """Support du context manager."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Support du context manager."""
+        self.close()
+
+
+def _stream_chunks(task: _ReadTask) -> Iterator[pd.DataFrame]:
+    """Restituer les blocs d'une feuille (ou relancer l'erreur du processus)."""
+    for _, chunk in task.messages():
+        yield chunk
+
+
+class _WorkbookStream:
+    """Répartir les blocs reçus d'un classeur entre ses feuilles."""
+    
+    def __init__(self, messages: Iterator[Tuple[str, Any]]):
+        """
+        Initialiser la répartition.
+        
+        Args:
+            messages: Messages de la lecture du classeur (_ReadTask.messages)
+        """
+        self._messages = messages
+    
+    def sheet_chunks(self, index: int) -> Iterator[pd.DataFrame]:
+        """
+        Restituer les blocs de la feuille `index`.
+        
+        Les feuilles sont à parcourir dans l'ordre ; les blocs restants d'une
+        feuille précédente non parcourue jusqu'au bout sont ignorés.
+        """
+        for kind, payload in self._messages:
+            if kind == _CHUNK:
+                sheet_index, chunk = payload
+                if sheet_index == index:
+                    yield chunk
+            elif kind == _SHEET_END and payload >= index:
+                return
+        
+        raise Exception(f"Impossible de lire la feuille n°{index + 1}: lecture du classeur interrompue")
+
+
+class ParallelSheetReader:
+    """
+    Classe pour lire plusieurs feuilles en parallèle dans un pool de processus.
+    
+    Le décodage XML d'openpyxl est limité par le GIL : chaque feuille est donc
+    lue dans un processus distinct. Les blocs sont consommés au fil de la
+    lecture par un seul écrivain (le processus principal), seul propriétaire
+    de la connexion SQLite.
+    """
+    
+    def __init__(
+        self,
+        file_path: Path,
+        workers: int,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        logger: Optional[logging.Logger] = None,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        """
+        Initialiser le lecteur parallèle.
+        
+        Args:
+            file_path: Chemin vers le fichier Excel
+            workers: Nombre de processus de lecture
+            chunk_rows: Nombre de lignes par bloc
+            logger: Logger optionnel
+            max_pending: Nombre maximal de blocs lus d'avance par feuille
+                en cours de lecture
+        """
+        self.file_path = Path(file_path)
+        self.workers = max(1, workers)
+        self.chunk_rows = chunk_rows
+        self.logger = logger
+        self.max_pending = max_pending
+    
+    def iter_sheets(
+        self,
+        sheet_names: List[str],
+        skip_rows: Optional[Dict[str, int]] = None
+    ) -> Iterator[Tuple[str, Iterator[pd.DataFrame]]]:
+        """
+        Lire les feuilles en parallèle et restituer leurs blocs en flux.
+        
+        Au plus `workers` feuilles sont en cours de lecture, chacune avec au
+        plus `max_pending` blocs d'avance : la mémoire reste bornée quelle que
+        soit la taille des feuilles. Une feuille est restituée dès son premier
+        bloc ; en passant à la feuille suivante, la lecture de la précédente
+        est arrêtée si ses blocs n'ont pas tous été consommés.
+        
+        Args:
+            sheet_names: Noms des feuilles à lire
+            skip_rows: Lignes de données déjà converties, par feuille
+                (reprise d'une conversion interrompue)
+        
+        Yields:
+            Tuples (nom_feuille, itérateur de blocs), dans l'ordre demandé.
+            Une erreur de lecture est relancée lors du parcours des blocs de
+            la feuille concernée.
+        """
+        pending_names = list(sheet_names)
+        
+        if self.logger:
+            self.logger.info(
+                f"Lecture parallèle de {len(pending_names)} feuille(s) "
+                f"avec {self.workers} processus"
+            )
+        
+        with _StreamingPool(self.workers, self.max_pending) as pool:
+            in_flight: deque = deque()
+            
+            def submit_pending() -> None:
+                while pending_names and pool.free_slots:
+                    sheet_name = pending_names.pop(0)
+                    in_flight.append((sheet_name, pool.submit(
+                        _read_sheet_worker, str(self.file_path), sheet_name, self.chunk_rows,
+                        (skip_rows or {}).get(sheet_name, 0)
+                    )))
+            
+            submit_pending()
+            
+            while in_flight:
+                sheet_name, task = in_flight.popleft()
+                chunks = _stream_chunks(task)
+                try:
+                    yield sheet_name, chunks
+                finally:
+                    chunks.close()
+                    task.release()
+                
+                submit_pending()
+
+
+class ParallelWorkbookReader:
+    """
+    Classe pour lire une série de classeurs (conversion par lots).
+    
+    Avec plusieurs processus, les classeurs suivants sont lus pendant
+    l'écriture du classeur courant ; ils sont toujours restitués dans
+    l'ordre demandé, pour que les lignes ajoutées à une même table gardent
+    l'ordre des fichiers.
+    """
+    
+    def __init__(
+        self,
+        workers: int = 1,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        logger: Optional[logging.Logger] = None,
+        max_pending: int = DEFAULT_MAX_PENDING
+    ):
+        """
+        Initialiser le lecteur de classeurs.
+        
+        Args:
+            workers: Nombre de processus de lecture (1 = lecture en flux
+                dans le processus principal)
+            chunk_rows: Nombre de lignes par bloc
+            logger: Logger optionnel
+            max_pending: Nombre maximal de blocs lus d'avance par classeur
+                en cours de lecture
+        """
+        self.workers = max(1, workers)
+        self.chunk_rows = chunk_rows
+        self.logger = logger
+        self.max_pending = max_pending
+    
+    def _iter_sequential(
+        self,
+        file_paths: List[Path]
+    ) -> Iterator[Tuple[Path, Optional[List[Tuple[Dict, Iterable[pd.DataFrame]]]], Optional[Exception]]]:
+        """Lire les classeurs un par un, en flux (mémoire constante)."""
+        for file_path in file_paths:
+            try:
+                reader = ExcelReader(file_path, self.logger)
+                sheets_info = reader.discover_sheets()
+            except Exception as e:
+                yield file_path, None, e
+                continue
+            
+            try:
+                yield file_path, [
+                    (_sheet_summary(info), reader.iter_sheet_chunks(info['name'], self.chunk_rows))
+                    for info in sheets_info
+                ], None
+            finally:
+                reader.close()
+    
+    def iter_workbooks(
+        self,
+        file_paths: List[Path]
+    ) -> Iterator[Tuple[Path, Optional[List[Tuple[Dict, Iterable[pd.DataFrame]]]], Optional[Exception]]]:
+        """
+        Lire les classeurs et les restituer dans l'ordre.
+        
+        En parallèle, au plus `workers` classeurs sont en cours de lecture,
+        chacun avec au plus `max_pending` blocs d'avance : comme en lecture
+        séquentielle, la mémoire ne dépend pas de la taille des fichiers.
+        
+        Args:
+            file_paths: Chemins des classeurs
+        
+        Yields:
+            Tuples (chemin, feuilles, erreur) : `feuilles` est une liste de
+            tuples (infos_feuille, blocs) avec infos_feuille = {name,
+            table_name, rows, column_names} ; en cas d'échec de lecture,
+            `feuilles` vaut None et `erreur` contient l'exception. Les blocs
+            sont à consommer dans l'ordre des feuilles, avant de passer au
+            classeur suivant.
+        """
+        file_paths = [Path(file_path) for file_path in file_paths]
+        
+        if self.workers == 1 or len(file_paths) < 2:
+            yield from self._iter_sequential(file_paths)
+            return
+        
+        if self.logger:
+            self.logger.info(
+                f"Lecture parallèle de {len(file_paths)} classeur(s) "
+                f"avec {self.workers} processus"
+            )
+        
+        with _StreamingPool(self.workers, self.max_pending) as pool:
+            pending_paths = list(file_paths)
+            in_flight: deque = deque()
+            
+            def submit_pending() -> None:
+                while pending_paths and pool.free_slots:
+                    file_path = pending_paths.pop(0)
+                    in_flight.append((file_path, pool.submit(
+                        _read_workbook_worker, str(file_path), self.chunk_rows
+                    )))
+            
+            submit_pending()
+            
+            while in_flight:
+                file_path, task = in_flight.popleft()
+                messages = task.messages()
+                
+                # Le premier message est la liste des feuilles du classeur
+                try:
+                    _, summaries = next(messages)
+                    error = None
+                except Exception as e:
+                    summaries, error = None, e
+                
+                try:
+                    if error is not None:
+                        yield file_path, None, error
+                    else:
+                        stream = _WorkbookStream(messages)
+                        yield file_path, [
+                            (summary, stream.sheet_chunks(index))
+                            for index, summary in enumerate(summaries)
+                        ], None
+                finally:
+                    messages.close()
+                    task.release()
+                
+                submit_pending()
@@ -0,0 +1,371 @@
+"""
+Export parallèle de tables SQLite vers un classeur Excel (.xlsx)
+"""
+import pandas as pd
+import numpy as np
+import re
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from pathlib import Path
+from typing import List, Dict, Optional, Iterator, Tuple
+from xml.sax.saxutils import escape
+import logging
+
+from openpyxl.utils import get_column_letter
+from openpyxl.writer.theme import theme_xml
+
+from .database_reader import DatabaseReader, DEFAULT_CHUNK_ROWS
+from .excel_writer import estimate_column_widths, make_sheet_title, workbook_styles
+from ..utils.formatting import format_file_size
+
+
+NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+NS_CONTENT_TYPES = "http://schemas.openxmlformats.org/package/2006/content-types"
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Jours entre l'origine Excel (1899-12-30) et 1970-01-01
+_EXCEL_EPOCH_OFFSET_DAYS = 25569
+_MS_PER_DAY = 86_400_000
+_MAX_CELL_LENGTH = 32767
+
+# Caractères de contrôle refusés dans le XML d'une feuille (comme openpyxl)
+_ILLEGAL_CHARACTERS_RE = re.compile(r'[\000-\010]|[\013-\014]|[\016-\037]')
+
+# Entités supplémentaires pour une valeur d'attribut XML
+_ATTRIBUTE_ENTITIES = {'"': '&quot;'}
+
+def _string_cell(ref: str, value: str, style: int = 0) -> str:
+    """Cellule texte en chaîne en ligne (pas de table de chaînes partagée)."""
+    value = value[:_MAX_CELL_LENGTH]
+    if _ILLEGAL_CHARACTERS_RE.search(value):
+        raise ValueError(f"{value!r} contient des caractères interdits dans une feuille Excel")
+    
+    style_attr = f' s="{style}"' if style else ''
+    space = ' xml:space="preserve"' if value != value.strip() else ''
+    return f'<c r="{ref}" t="inlineStr"{style_attr}><is><t{space}>{escape(value)}</t></is></c>'
+
+
+def _render_rows(
+    chunk: pd.DataFrame,
+    letters: List[str],
+    first_row: int,
+    datetime_style: int
+) -> str:
+    """
+    Produire le XML des lignes d'un bloc.
+    
+    Les colonnes datetime sont converties en numéros de série Excel sur le
+    tableau entier, puis chaque cellule est écrite selon le type de sa valeur.
+    """
+    datetime_columns = set()
+    values = {}
+    
+    for position, column in enumerate(chunk.columns):
+        series = chunk.iloc[:, position]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            stamps = series.dt.tz_localize(None) if isinstance(series.dtype, pd.DatetimeTZDtype) else series
+            stamps = stamps.to_numpy(dtype='datetime64[ms]')
+            serials = stamps.astype(np.int64) / _MS_PER_DAY + _EXCEL_EPOCH_OFFSET_DAYS
+            column_values = serials.astype(object)
+            column_values[np.isnat(stamps)] = None
+            values[position] = column_values
+            datetime_columns.add(position)
+        else:
+            values[position] = series.to_numpy(dtype=object, na_value=None)
+    
+    parts = []
+    columns = [values[position] for position in range(len(chunk.columns))]
+    
+    for offset, row in enumerate(zip(*columns)):
+        row_number = first_row + offset
+        cells = []
+        
+        for position, value in enumerate(row):
+            if value is None:
+                continue
+            
+            ref = f"{letters[position]}{row_number}"
+            
+            if isinstance(value, (bytes, bytearray)):
+                value = bytes(value).decode('utf-8')
+            
+            if isinstance(value, str):
+                cells.append(_string_cell(ref, value))
+            elif isinstance(value, (bool, np.bool_)):
+                cells.append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+            elif isinstance(value, (int, np.integer)):
+                cells.append(f'<c r="{ref}"><v>{int(value)}</v></c>')
+            elif isinstance(value, (float, np.floating)):
+                if not np.isfinite(value):
+                    continue
+                style_attr = f' s="{datetime_style}"' if position in datetime_columns else ''
+                cells.append(f'<c r="{ref}"{style_attr}><v>{float(value)!r}</v></c>')
+            else:
+                cells.append(_string_cell(ref, str(value)))
+        
+        parts.append(f'<row r="{row_number}">{"".join(cells)}</row>')
+    
+    return ''.join(parts)
+
+
+def _render_sheet_worker(
+    db_path: str,
+    table_name: str,
+    part_path: str,
+    chunk_rows: int,
+    autofit: bool
+) -> int:
+    """
+    Écrire la feuille XML d'une table dans un processus de travail.
+    
+    Chaque processus ouvre sa propre connexion en lecture seule et lit la
+    table bloc par bloc ; seul le bloc courant est en mémoire. Les largeurs
+    et les styles sont ceux d'ExcelWriter (estimate_column_widths,
+    workbook_styles).
+    
+    Returns:
+        Nombre de lignes écrites
+    """
+    rows_written = 0
+    _, header_style, datetime_style = workbook_styles()
+    
+    with DatabaseReader(Path(db_path), read_only=True) as reader, \
+            open(part_path, 'w', encoding='utf-8') as part:
+        part.write(XML_DECLARATION + f'<worksheet xmlns="{NS_MAIN}">')
+        letters: List[str] = []
+        
+        for chunk in reader.iter_table_chunks(table_name, chunk_rows):
+            if not letters:
+                letters = [get_column_letter(i) for i in range(1, len(chunk.columns) + 1)]
+                
+                # Les largeurs précèdent les données dans le XML
+                if autofit and letters:
+                    part.write('<cols>')
+                    for c_idx, width in enumerate(estimate_column_widths(chunk), 1):
+                        part.write(f'<col min="{c_idx}" max="{c_idx}" width="{width}" customWidth="1"/>')
+                    part.write('</cols>')
+                
+                header = ''.join(
+                    _string_cell(f"{letter}1", str(column), header_style)
+                    for letter, column in zip(letters, chunk.columns)
+                )
+                part.write(f'<sheetData><row r="1">{header}</row>')
+            
+            part.write(_render_rows(chunk, letters, rows_written + 2, datetime_style))
+            rows_written += len(chunk)
+        
+        if not letters:
+            part.write('<sheetData>')
+        part.write('</sheetData></worksheet>')
+    
+    return rows_written
+
+
+class ParallelExcelExporter:
+    """
+    Classe pour exporter plusieurs tables en parallèle dans un classeur Excel.
+    
+    Chaque table est lue par un processus distinct, avec sa propre connexion
+    SQLite en lecture seule, et rendue directement en XML de feuille dans un
+    fichier temporaire. Le classeur est ensuite assemblé en un seul passage :
+    les feuilles sont ajoutées à l'archive .xlsx avec le classeur, les styles
+    et les relations.
+    """
+    
+    def __init__(
+        self,
+        output_path: Path,
+        db_path: Path,
+        workers: int,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        autofit: bool = True,
+        logger: Optional[logging.Logger] = None
+    ):
+        """
+        Initialiser l'exporteur parallèle.
+        
+        Args:
+            output_path: Chemin vers le fichier Excel de sortie
+            db_path: Chemin vers la base de données SQLite
+            workers: Nombre de processus d'export
+            chunk_rows: Nombre de lignes lues par bloc
+            autofit: Ajuster la largeur des colonnes au contenu
+            logger: Logger optionnel
+        """
+        self.output_path = Path(output_path)
+        self.db_path = Path(db_path)
+        self.workers = max(1, workers)
+        self.chunk_rows = chunk_rows
+        self.autofit = autofit
+        self.logger = logger
+        self._parts: Dict[str, Path] = {}
+        self._table_names: List[str] = []
+        self._temp_dir: Optional[Path] = None
+    
+    def iter_tables(self, table_names: List[str]) -> Iterator[Tuple[str, int, Optional[Exception]]]:
+        """
+        Rendre les feuilles des tables en parallèle.
+        
+        Args:
+            table_names: Noms des tables à exporter
+        
+        Yields:
+            Tuples (nom_table, lignes_écrites, erreur) dans l'ordre de fin
+            d'export ; erreur vaut None si la table a été exportée
+        """
+        if self._temp_dir is None:
+            self._temp_dir = Path(tempfile.mkdtemp(prefix="e2db_xlsx_"))
+        self._table_names = list(table_names)
+        
+        if self.logger:
+            self.logger.info(
+                f"Export parallèle de {len(table_names)} table(s) "
+                f"avec {self.workers} processus"
+            )
+        
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures: Dict[Future, Tuple[str, Path]] = {}
+            for index, table_name in enumerate(table_names, 1):
+                part_path = self._temp_dir / f"sheet{index}.xml"
+                future = executor.submit(
+                    _render_sheet_worker, str(self.db_path), table_name,
+                    str(part_path), self.chunk_rows, self.autofit
+                )
+                futures[future] = (table_name, part_path)
+            
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table_name, part_path = futures[future]
+                    try:
+                        rows_written = future.result()
+                    except Exception as e:
+                        if self.logger:
+                            self.logger.error(
+                                f"Erreur lors de l'export de '{table_name}': {str(e)}"
+                            )
+                        yield table_name, 0, e
+                        continue
+                    
+                    self._parts[table_name] = part_path
+                    yield table_name, rows_written, None
+    
+    def save(self) -> None:
+        """
+        Assembler le classeur à partir des feuilles rendues.
+        
+        Les feuilles suivent l'ordre des tables passé à iter_tables ; les
+        tables en erreur sont ignorées.
+        
+        Raises:
+            Exception: Si le classeur ne peut pas être assemblé
+        """
+        sheets = [(name, self._parts[name]) for name in self._table_names if name in self._parts]
+        
+        try:
+            if not sheets:
+                raise Exception("Aucun classeur à sauvegarder")
+            
+            # Mêmes noms de feuille qu'avec ExcelWriter
+            titles: List[str] = []
+            for table_name, _ in sheets:
+                titles.append(make_sheet_title(table_name, titles))
+            
+            count = len(sheets)
+            sheets_xml = ''.join(
+                f'<sheet name="{escape(title, _ATTRIBUTE_ENTITIES)}" sheetId="{i}" r:id="rId{i}"/>'
+                for i, title in enumerate(titles, 1)
+            )
+            workbook_rels = ''.join(
+                f'<Relationship Id="rId{i}" Type="{NS_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+                for i in range(1, count + 1)
+            )
+            sheet_overrides = ''.join(
+                f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+                'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for i in range(1, count + 1)
+            )
+            
+            with zipfile.ZipFile(self.output_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr('[Content_Types].xml', (
+                    XML_DECLARATION +
+                    f'<Types xmlns="{NS_CONTENT_TYPES}">'
+                    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                    '<Default Extension="xml" ContentType="application/xml"/>'
+                    '<Override PartName="/xl/workbook.xml" '
+                    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+                    '<Override PartName="/xl/styles.xml" '
+                    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+                    '<Override PartName="/xl/theme/theme1.xml" '
+                    'ContentType="application/vnd.openxmlformats-officedocument.theme+xml"/>'
+                    f'{sheet_overrides}</Types>'
+                ))
+                archive.writestr('_rels/.rels', (
+                    XML_DECLARATION +
+                    f'<Relationships xmlns="{NS_PKG_REL}">'
+                    f'<Relationship Id="rId1" Type="{NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+                    '</Relationships>'
+                ))
+                archive.writestr('xl/workbook.xml', (
+                    XML_DECLARATION +
+                    f'<workbook xmlns="{NS_MAIN}" xmlns:r="{NS_REL}">'
+                    f'<sheets>{sheets_xml}</sheets></workbook>'
+                ))
+                archive.writestr('xl/_rels/workbook.xml.rels', (
+                    XML_DECLARATION +
+                    f'<Relationships xmlns="{NS_PKG_REL}">{workbook_rels}'
+                    f'<Relationship Id="rId{count + 1}" Type="{NS_REL}/styles" Target="styles.xml"/>'
+                    f'<Relationship Id="rId{count + 2}" Type="{NS_REL}/theme" Target="theme/theme1.xml"/>'
+                    '</Relationships>'
+                ))
+                # Feuille de styles et thème produits par openpyxl, comme ExcelWriter
+                archive.writestr('xl/styles.xml', workbook_styles()[0])
+                archive.writestr('xl/theme/theme1.xml', theme_xml)
+                
+                for i, (_, part_path) in enumerate(sheets, 1):
+                    archive.write(part_path, f'xl/worksheets/sheet{i}.xml')
+            
+            if self.logger:
+                self.logger.info(f"Fichier Excel sauvegardé: {self.output_path}")
+        except Exception as e:
+            if self.logger:
+                self.logger.error(
+                    f"Erreur lors de la sauvegarde du fichier: {str(e)}"
+                )
+            raise Exception(f"Impossible de sauvegarder le fichier Excel: {str(e)}")
+        finally:
+            self.cleanup()
+    
+    def cleanup(self) -> None:
+        """Supprimer les feuilles temporaires."""
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+            self._parts = {}
+            self._table_names = []
+    
+    def get_file_size(self) -> Tuple[int, str]:
+        """
+        Obtenir la taille du fichier Excel.
+        
+        Returns:
+            Tuple (taille_en_octets, taille_formatée)
+        """
+        if not self.output_path.exists():
+            return 0, "0 B"
+        
+        size_bytes = self.output_path.stat().st_size
+        return size_bytes, format_file_size(size_bytes)
+    
+    def __enter__(self):
+        """Support du context manager."""
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Support du context manager : supprimer les feuilles temporaires."""
+        self.cleanup()
@@ -0,0 +1,86 @@
+"""
+Pipeline producteur/consommateur pour la lecture des blocs
+"""
+import pandas as pd
+import threading
+import queue
+from typing import Iterable, Iterator, Optional
+import logging
+
+
+DEFAULT_MAX_PENDING = 2
+
+# Marqueur de fin de flux déposé par le producteur
+_END = object()
+
+
+class _ProducerError:
+    """Enveloppe d'une exception levée dans le thread de lecture."""
+    
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def prefetch_chunks(
+    chunks: Iterable[pd.DataFrame],
+    max_pending: int = DEFAULT_MAX_PENDING,
+    logger: Optional[logging.Logger] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Lire les blocs dans un thread dédié pendant que l'appelant les insère.
+    
+    Le thread de lecture remplit une file bornée : lorsqu'elle contient
+    `max_pending` blocs, il attend que l'écrivain en consomme un, ce qui
+    limite la mémoire utilisée. La connexion SQLite reste dans le thread
+    appelant.
+    
+    Args:
+        chunks: Itérable de DataFrames (par exemple ExcelReader.iter_sheet_chunks)
+        max_pending: Nombre maximal de blocs lus d'avance
+        logger: Logger optionnel
+    
+    Yields:
+        Les blocs, dans l'ordre de lecture
+    
+    Raises:
+        Exception: L'erreur éventuellement levée pendant la lecture
+    """
+    pending: queue.Queue = queue.Queue(maxsize=max(1, max_pending))
+    stop = threading.Event()
+    
+    def put(item) -> bool:
+        # Attendre une place libre sans bloquer si le consommateur abandonne
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def produce() -> None:
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+            put(_END)
+        except BaseException as e:
+            put(_ProducerError(e))
+    
+    producer = threading.Thread(target=produce, name="excel-reader", daemon=True)
+    producer.start()
+    
+    try:
+        while True:
+            item = pending.get()
+            if item is _END:
+                break
+            if isinstance(item, _ProducerError):
+                if logger:
+                    logger.error(f"Erreur dans le thread de lecture: {str(item.error)}")
+                raise item.error
+            yield item
+    finally:
+        # Libérer le producteur si l'écriture s'est arrêtée en cours de route
+        stop.set()
+        producer.join()
@@ -0,0 +1,13 @@
+"""
+Formats de stockage des colonnes date/heure dans SQLite
+"""
+
+
+# Formats de stockage des colonnes date/heure et type SQLite associé
+TEMPORAL_STORAGE_TYPES = {
+    'iso': 'TEXT',         # 'YYYY-MM-DD HH:MM:SS'
+    'epoch': 'INTEGER',    # secondes depuis 1970-01-01
+    'epoch_ms': 'INTEGER', # millisecondes depuis 1970-01-01
+    'julian': 'REAL',      # jour julien (fractionnaire)
+}
+DEFAULT_TEMPORAL_STORAGE = 'iso'
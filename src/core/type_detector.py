@@ -2,7 +2,27 @@
 Détection et mapping des types de données pandas vers SQLite
 """
 import pandas as pd
-from typing import Dict, Any
+import numpy as np
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+
+from .temporal_formats import TEMPORAL_STORAGE_TYPES, DEFAULT_TEMPORAL_STORAGE
+
+# Jour julien du 1970-01-01 à 00:00
+_UNIX_EPOCH_JULIAN_DAY = 2440587.5
+_MS_PER_DAY = 86_400_000
+
+
+# Taille par défaut de chaque échantillon (tête, queue, réservoir)
+DEFAULT_SAMPLE_SIZE = 1000
+
+# Ordre de promotion des types numériques vers le texte
+_TYPE_ORDER = {'INTEGER': 0, 'REAL': 1, 'TEXT': 2}
+
+# Type déclaré d'une colonne sans aucune valeur (aucune affinité SQLite)
+UNTYPED_COLUMN = ''
 
 
 def pandas_to_sqlite_type(dtype: Any) -> str:
@@ -121,29 +141,476 @@ def get_type_stats(df: pd.DataFrame) -> Dict[str, Dict[str, Any]]:
     return stats
 
 
-def convert_datetime_columns(df: pd.DataFrame) -> pd.DataFrame:
+# Bornes des dates représentables sur 4 chiffres d'année (jours depuis 1970)
+_MIN_ISO_DAY = np.datetime64('0001-01-01', 'D').astype(np.int64)
+_MAX_ISO_DAY = np.datetime64('9999-12-31', 'D').astype(np.int64)
+_SECONDS_PER_DAY = 86400
+
+
+def _iso_codepoints(strings: np.ndarray, width: int) -> np.ndarray:
+    """Convertir des chaînes de longueur fixe en matrice de points de code."""
+    return strings.astype(f'U{width}').view(np.uint32).reshape(len(strings), width)
+
+
+@lru_cache(maxsize=1)
+def _time_of_day_table() -> np.ndarray:
+    """Table des 86400 heures 'HH:MM:SS', indexée par seconde du jour."""
+    seconds = np.arange(_SECONDS_PER_DAY).astype('datetime64[s]')
+    return _iso_codepoints(np.datetime_as_string(seconds, unit='s'), 19)[:, 11:]
+
+
+def _format_datetimes(series: pd.Series) -> np.ndarray:
     """
-    Convertir les colonnes datetime en format ISO 8601 (chaîne de caractères).
+    Formater une colonne datetime en ISO 8601 ('YYYY-MM-DD HH:MM:SS').
     
-    SQLite n'ayant pas de type datetime natif, on convertit en TEXT.
+    Les chaînes sont assemblées sur le tableau entier : la date est formatée
+    une seule fois par jour distinct, l'heure est lue dans une table des
+    86400 secondes de la journée. Les NaT deviennent None.
+    """
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        # Conserver l'heure locale, comme strftime
+        series = series.dt.tz_localize(None)
+    
+    stamps = series.to_numpy(dtype='datetime64[s]')
+    missing = np.isnat(stamps)
+    seconds = np.where(missing, 0, stamps.astype(np.int64))
+    days, second_of_day = np.divmod(seconds, _SECONDS_PER_DAY)
+    
+    if len(days) and (days.min() < _MIN_ISO_DAY or days.max() > _MAX_ISO_DAY):
+        # Années hors de 0001-9999 : formatage générique par numpy
+        strings = np.char.replace(np.datetime_as_string(stamps, unit='s'), 'T', ' ')
+    else:
+        first_day = days.min() if len(days) else 0
+        span = (days.max() - first_day + 1) if len(days) else 0
+        if span <= len(days):
+            day_values = np.arange(first_day, first_day + span)
+            day_index = days - first_day
+        else:
+            day_values, day_index = np.unique(days, return_inverse=True)
+        
+        day_strings = np.datetime_as_string(day_values.astype('datetime64[D]'))
+        chars = np.empty((len(days), 19), dtype=np.uint32)
+        chars[:, :10] = _iso_codepoints(day_strings, 10)[day_index]
+        chars[:, 10] = ord(' ')
+        chars[:, 11:] = _time_of_day_table()[second_of_day]
+        strings = chars.view('U19').ravel()
+    
+    values = strings.astype(object)
+    values[missing] = None
+    return values
+
+
+def _encode_datetimes(series: pd.Series, storage: str) -> np.ndarray:
+    """
+    Encoder une colonne datetime selon le format de stockage demandé.
+    
+    Args:
+        series: Colonne datetime64
+        storage: Format de stockage (voir TEMPORAL_STORAGE_TYPES)
+        
+    Returns:
+        Tableau d'objets Python (str, int ou float), None pour les NaT
+    """
+    if storage == 'iso':
+        return _format_datetimes(series)
+    
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_localize(None)
+    
+    stamps = series.to_numpy(dtype='datetime64[ms]')
+    missing = np.isnat(stamps)
+    milliseconds = np.where(missing, 0, stamps.astype(np.int64))
+    
+    if storage == 'epoch':
+        values = (milliseconds // 1000).astype(object)
+    elif storage == 'epoch_ms':
+        values = milliseconds.astype(object)
+    elif storage == 'julian':
+        values = (milliseconds / _MS_PER_DAY + _UNIX_EPOCH_JULIAN_DAY).astype(object)
+    else:
+        raise ValueError(f"Format de stockage des dates inconnu: {storage}")
+    
+    values[missing] = None
+    return values
+
+
+def convert_datetime_columns(
+    df: pd.DataFrame,
+    storage: str = DEFAULT_TEMPORAL_STORAGE,
+    column_storage: Optional[Dict[str, str]] = None
+) -> pd.DataFrame:
+    """
+    Convertir les colonnes datetime au format de stockage SQLite.
+    
+    SQLite n'ayant pas de type datetime natif, on convertit par défaut en
+    TEXT (ISO 8601), ou en epoch (INTEGER) / jour julien (REAL).
+    Seules les colonnes datetime/timedelta sont converties : le DataFrame
+    n'est pas copié, une copie superficielle est renvoyée si nécessaire.
     
     Args:
         df: DataFrame pandas
+        storage: Format de stockage par défaut des dates
+        column_storage: Format par colonne {nom_colonne: format}, prioritaire
+            sur `storage`. Les colonnes 'object' qui y figurent (dates
+            Python) sont aussi converties ; leurs autres valeurs sont gardées.
         
     Returns:
-        DataFrame avec les colonnes datetime converties en string
-    """
-    df_copy = df.copy()
-    
-    for column in df_copy.columns:
-        if pd.api.types.is_datetime64_any_dtype(df_copy[column]):
-            # Convertir au format ISO 8601
-            df_copy[column] = df_copy[column].dt.strftime('%Y-%m-%d %H:%M:%S')
-            # Remplacer NaT (Not a Time) par None
-            df_copy[column] = df_copy[column].replace('NaT', None)
-        elif pd.api.types.is_timedelta64_dtype(df_copy[column]):
-            # Convertir timedelta en string
-            df_copy[column] = df_copy[column].astype(str)
-            df_copy[column] = df_copy[column].replace('NaT', None)
-    
-    return df_copy
+        DataFrame avec les colonnes datetime converties
+    """
+    column_storage = column_storage or {}
+    converted = {}
+    
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            converted[column] = _encode_datetimes(series, column_storage.get(column, storage))
+        elif pd.api.types.is_timedelta64_dtype(series):
+            # Convertir timedelta en string, NaT -> None
+            values = series.astype(str).to_numpy(dtype=object)
+            values[series.isna().to_numpy()] = None
+            converted[column] = values
+        elif column in column_storage and pd.api.types.is_object_dtype(series):
+            stamps = pd.to_datetime(series, errors='coerce')
+            values = _encode_datetimes(stamps, column_storage[column])
+            others = (stamps.isna() & series.notna()).to_numpy()
+            values[others] = series.to_numpy(dtype=object)[others]
+            converted[column] = values
+    
+    if not converted:
+        return df
+    
+    result = df.copy(deep=False)
+    for column, values in converted.items():
+        result[column] = pd.Series(values, index=df.index, dtype=object)
+    
+    return result
+
+
+def restore_datetime_columns(df: pd.DataFrame, column_storage: Dict[str, str]) -> pd.DataFrame:
+    """
+    Reconvertir en datetime les colonnes stockées par convert_datetime_columns.
+    
+    Une colonne dont une valeur ne peut pas être relue comme une date est
+    laissée telle quelle.
+    
+    Args:
+        df: DataFrame lu depuis SQLite
+        column_storage: Format de stockage par colonne {nom_colonne: format}
+        
+    Returns:
+        DataFrame avec les colonnes date/heure en datetime64
+    """
+    restored = {}
+    
+    for column, storage in column_storage.items():
+        if column not in df.columns:
+            continue
+        
+        series = df[column]
+        if storage == 'iso':
+            stamps = pd.to_datetime(series, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+        else:
+            numbers = pd.to_numeric(series, errors='coerce')
+            if storage == 'epoch':
+                stamps = pd.to_datetime(numbers, unit='s', errors='coerce')
+            elif storage == 'epoch_ms':
+                stamps = pd.to_datetime(numbers, unit='ms', errors='coerce')
+            else:
+                milliseconds = ((numbers - _UNIX_EPOCH_JULIAN_DAY) * _MS_PER_DAY).round()
+                stamps = pd.to_datetime(milliseconds, unit='ms', errors='coerce')
+        
+        if not (stamps.isna() & series.notna()).any():
+            restored[column] = stamps
+    
+    if not restored:
+        return df
+    
+    result = df.copy(deep=False)
+    for column, stamps in restored.items():
+        result[column] = stamps
+    
+    return result
+
+
+def infer_value_type(value: Any) -> Optional[str]:
+    """
+    Déterminer le type d'une valeur Python isolée.
+    
+    Args:
+        value: Valeur lue dans une cellule
+        
+    Returns:
+        'INTEGER', 'REAL', 'TEXT', 'DATETIME' ou None pour une valeur nulle
+        
+    Examples:
+        >>> infer_value_type(42)
+        'INTEGER'
+        >>> infer_value_type(None) is None
+        True
+    """
+    if value is None or value is pd.NaT:
+        return None
+    
+    if isinstance(value, (bool, np.bool_, int, np.integer)):
+        return 'INTEGER'
+    
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else 'REAL'
+    
+    if isinstance(value, (datetime, date, np.datetime64)):
+        return 'DATETIME'
+    
+    # time, timedelta, chaînes et autres objets
+    return 'TEXT'
+
+
+def promote_type(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """
+    Calculer le plus petit type couvrant deux types détectés.
+    
+    INTEGER < REAL < TEXT ; une date mélangée à un autre type devient TEXT.
+    
+    Args:
+        current: Type actuel (None si aucune valeur vue)
+        new: Type observé
+        
+    Returns:
+        Type promu
+        
+    Examples:
+        >>> promote_type('INTEGER', 'REAL')
+        'REAL'
+        >>> promote_type('DATETIME', 'INTEGER')
+        'TEXT'
+    """
+    if current is None:
+        return new
+    if new is None or new == current:
+        return current
+    if 'DATETIME' in (current, new):
+        return 'TEXT'
+    return max(current, new, key=_TYPE_ORDER.__getitem__)
+
+
+def _series_type(series: pd.Series) -> Optional[str]:
+    """
+    Déterminer le type des valeurs non nulles d'une série.
+    
+    Les dtypes homogènes sont traités sans parcourir les valeurs ; seules
+    les colonnes 'object' sont examinées valeur par valeur.
+    """
+    values = series.dropna()
+    if values.empty:
+        return None
+    
+    dtype = values.dtype
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'DATETIME'
+    if pd.api.types.is_object_dtype(dtype):
+        detected = None
+        for value in values:
+            detected = promote_type(detected, infer_value_type(value))
+            if detected == 'TEXT':
+                break
+        return detected
+    
+    return 'TEXT'
+
+
+class TypeSampler:
+    """
+    Moteur d'inférence des types par échantillonnage, utilisable en flux.
+    
+    Chaque bloc de lignes passé à update() contribue trois échantillons :
+    - la tête : les `sample_size` premières lignes de la feuille ;
+    - le réservoir : un échantillon aléatoire uniforme de toutes les lignes
+      (algorithme R), tiré bloc par bloc ;
+    - la queue : les `sample_size` dernières lignes, examinées par finalize().
+    
+    Le type d'une colonne n'est jamais rétrogradé : il est promu
+    (INTEGER -> REAL -> TEXT) dès qu'une valeur échantillonnée ne rentre
+    plus dans le type courant. Le schéma peut ainsi être créé dès le premier
+    bloc, avant la lecture complète de la feuille.
+    """
+    
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE, seed: Optional[int] = None):
+        """
+        Initialiser le moteur d'échantillonnage.
+        
+        Args:
+            sample_size: Taille de chaque échantillon (tête, queue, réservoir)
+            seed: Graine du générateur aléatoire (reproductibilité)
+        """
+        self.sample_size = sample_size
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._types: Dict[str, Optional[str]] = {}
+        self._sampled: Dict[str, int] = {}
+        self._non_null: Dict[str, int] = {}
+        self._promoted: Dict[str, bool] = {}
+        self._tail: Optional[pd.DataFrame] = None
+        self._tail_rows = 0
+    
+    def _observe(self, sample: pd.DataFrame, count_values: bool = True) -> List[str]:
+        """
+        Intégrer un échantillon de lignes et promouvoir les types si besoin.
+        
+        Args:
+            sample: Lignes échantillonnées
+            count_values: Compter les valeurs examinées (faux pour la queue,
+                qui recoupe la tête et le réservoir)
+        
+        Returns:
+            Liste des colonnes dont le type a été promu
+        """
+        promoted = []
+        
+        for column in sample.columns:
+            name = str(column)
+            detected = _series_type(sample[column])
+            current = self._types.get(name)
+            new_type = promote_type(current, detected)
+            
+            if current is not None and new_type != current:
+                self._promoted[name] = True
+                promoted.append(name)
+            
+            self._types[name] = new_type
+            if count_values:
+                self._sampled[name] = self._sampled.get(name, 0) + int(sample[column].count())
+        
+        return promoted
+    
+    def update(self, chunk: pd.DataFrame) -> List[str]:
+        """
+        Examiner un nouveau bloc de lignes.
+        
+        Args:
+            chunk: Bloc de lignes (dans l'ordre de la feuille)
+            
+        Returns:
+            Liste des colonnes dont le type a été promu par ce bloc
+        """
+        n = len(chunk)
+        
+        for column, count in chunk.count().items():
+            self._non_null[str(column)] = self._non_null.get(str(column), 0) + int(count)
+            self._types.setdefault(str(column), None)
+        
+        # Tête + réservoir : la ligne d'indice global i est retenue avec la
+        # probabilité sample_size / (i + 1), soit 1 pour les premières lignes
+        positions = np.arange(self.rows_seen, self.rows_seen + n)
+        accepted = self._rng.random(n) * (positions + 1) < self.sample_size
+        promoted = self._observe(chunk.iloc[np.flatnonzero(accepted)])
+        
+        # Queue glissante : un bloc plus court que l'échantillon complète la
+        # queue précédente au lieu de la remplacer
+        if self._tail is None or n >= self.sample_size:
+            self._tail = chunk.tail(self.sample_size)
+        else:
+            self._tail = pd.concat([self._tail, chunk]).tail(self.sample_size)
+        self.rows_seen += n
+        return promoted
+    
+    def finalize(self) -> List[str]:
+        """
+        Examiner l'échantillon de queue une fois toutes les lignes vues.
+        
+        Returns:
+            Liste des colonnes dont le type a été promu par la queue
+        """
+        if self._tail is None:
+            return []
+        
+        promoted = self._observe(self._tail, count_values=False)
+        self._tail_rows = len(self._tail)
+        self._tail = None
+        return promoted
+    
+    @property
+    def detected_types(self) -> Dict[str, Optional[str]]:
+        """Types détectés pour chaque colonne ('DATETIME' compris)."""
+        return dict(self._types)
+    
+    @property
+    def column_types(self) -> Dict[str, str]:
+        """
+        Types SQLite retenus pour chaque colonne.
+        
+        Les dates sont stockées au format ISO 8601 (TEXT). Une colonne
+        entièrement vide n'a pas de type déclaré (chaîne vide) : SQLite
+        garde alors le type propre de chaque valeur, et des nombres arrivant
+        après la création de la table ne sont pas convertis en texte.
+        """
+        return {
+            name: 'TEXT' if detected == 'DATETIME' else (detected or UNTYPED_COLUMN)
+            for name, detected in self._types.items()
+        }
+    
+    def get_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Obtenir le détail de l'inférence pour chaque colonne.
+        
+        La confiance est la proportion minimale (à 95 %, règle de trois) de
+        valeurs conformes au type retenu : 1 - 3/n pour n valeurs examinées,
+        et 1.0 lorsque toutes les lignes ont été examinées.
+        
+        Returns:
+            Dictionnaire {colonne: {detected_type, sqlite_type, confidence,
+            sampled_values, non_null_count, promoted}}
+        """
+        sqlite_types = self.column_types
+        report = {}
+        
+        # La tête (premières lignes) et la queue examinée (dernières lignes)
+        # couvrent à elles seules toutes les lignes
+        complete = self.rows_seen <= self.sample_size + self._tail_rows
+        
+        for name, detected in self._types.items():
+            sampled = self._sampled.get(name, 0)
+            non_null = self._non_null.get(name, 0)
+            
+            if complete:
+                confidence = 1.0
+            else:
+                confidence = max(0.0, 1 - 3 / sampled) if sampled else 0.0
+            
+            report[name] = {
+                'detected_type': detected,
+                'sqlite_type': sqlite_types[name],
+                'confidence': round(confidence, 4),
+                'sampled_values': sampled,
+                'non_null_count': non_null,
+                'promoted': self._promoted.get(name, False)
+            }
+        
+        return report
+
+
+def infer_column_types_sampled(
+    df: pd.DataFrame,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+    seed: Optional[int] = None
+) -> Dict[str, str]:
+    """
+    Détecter les types SQLite d'un DataFrame à partir d'échantillons.
+    
+    Contrairement à infer_column_types, les colonnes 'object' ne sont
+    examinées que sur la tête, la queue et un échantillon aléatoire.
+    
+    Args:
+        df: DataFrame pandas à analyser
+        sample_size: Taille de chaque échantillon
+        seed: Graine du générateur aléatoire
+        
+    Returns:
+        Dictionnaire {nom_colonne: type_sqlite}
+    """
+    sampler = TypeSampler(sample_size, seed)
+    sampler.update(df)
+    sampler.finalize()
+    return sampler.column_types
@@ -0,0 +1,508 @@
+"""
+Lecture des métadonnées d'un classeur .xlsx directement dans l'archive zip
+"""
+import hashlib
+import posixpath
+import re
+import zipfile
+import logging
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple, Any
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.cell import column_index_from_string, coordinate_from_string
+from openpyxl.utils.datetime import from_excel, CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+
+
+# Types de relations OOXML utilisés pour localiser les parties du classeur
+REL_OFFICE_DOCUMENT = 'officeDocument'
+REL_WORKSHEET = 'worksheet'
+REL_SHARED_STRINGS = 'sharedStrings'
+REL_STYLES = 'styles'
+
+# Taille des blocs lus pour le calcul des empreintes
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Motifs repérés dans le XML brut des feuilles pour les empreintes, sans
+# décoder les cellules : valeur d'une cellule à chaîne partagée (t="s"),
+# identifiant de style (s="N") et fin de ligne (limite de découpage du flux)
+_SHARED_STRING_CELL = re.compile(rb'( t="s"[^>]*>\s*<(?:\w+:)?v>)(\d+)(?=<)')
+_STYLE_ATTRIBUTE = re.compile(rb' s="(\d+)"')
+_ROW_END = b'row>'
+
+
+def _local_name(tag: str) -> str:
+    """Retirer l'espace de noms d'une balise XML ('{ns}row' -> 'row')."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _resolve_target(base_part: str, target: str) -> str:
+    """Résoudre la cible d'une relation par rapport à la partie source."""
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base_part), target))
+
+
+def _rels_path(part: str) -> str:
+    """Chemin du fichier de relations associé à une partie ('xl/_rels/workbook.xml.rels')."""
+    directory, name = posixpath.split(part)
+    return posixpath.join(directory, '_rels', f'{name}.rels')
+
+
+class XlsxInspector:
+    """
+    Classe pour inspecter un classeur .xlsx/.xlsm sans le charger.
+    
+    Les dimensions et les premières lignes de chaque feuille sont lues en flux
+    dans l'archive zip : ni la table complète des chaînes partagées ni les
+    données des feuilles ne sont chargées, quelle que soit la taille du fichier.
+    Seul le calcul des empreintes lit toute la table des chaînes partagées.
+    """
+    
+    def __init__(self, file_path: Path, logger: Optional[logging.Logger] = None):
+        """
+        Initialiser l'inspecteur.
+        
+        Args:
+            file_path: Chemin vers le fichier .xlsx/.xlsm
+            logger: Logger optionnel
+        """
+        self.file_path = Path(file_path)
+        self.logger = logger
+        self.archive: Optional[zipfile.ZipFile] = None
+        self._workbook_part: Optional[str] = None
+        self._sheet_parts: Optional[Dict[str, str]] = None
+        self._shared_strings_part: Optional[str] = None
+        self._styles_part: Optional[str] = None
+        self._date1904 = False
+        self._date_styles: Optional[List[bool]] = None
+    
+    def open(self) -> zipfile.ZipFile:
+        """
+        Ouvrir l'archive du classeur.
+        
+        Returns:
+            Archive zip ouverte
+        """
+        if self.archive is None:
+            self.archive = zipfile.ZipFile(self.file_path)
+        return self.archive
+    
+    def close(self) -> None:
+        """
+        Fermer l'archive du classeur.
+        """
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+    
+    def _read_relationships(self, part: str) -> Dict[str, Tuple[str, str]]:
+        """
+        Lire les relations d'une partie.
+        
+        Returns:
+            Dictionnaire {id_relation: (type_court, chemin_cible)}
+        """
+        archive = self.open()
+        rels_part = _rels_path(part)
+        
+        if rels_part not in archive.namelist():
+            return {}
+        
+        relationships = {}
+        root = ET.fromstring(archive.read(rels_part))
+        for rel in root:
+            if _local_name(rel.tag) != 'Relationship' or rel.get('TargetMode') == 'External':
+                continue
+            rel_type = rel.get('Type', '').rsplit('/', 1)[-1]
+            relationships[rel.get('Id')] = (rel_type, _resolve_target(part, rel.get('Target', '')))
+        
+        return relationships
+    
+    def get_sheet_parts(self) -> Dict[str, str]:
+        """
+        Obtenir les feuilles du classeur et leur partie XML dans l'archive.
+        
+        Returns:
+            Dictionnaire ordonné {nom_feuille: chemin_partie}
+        
+        Raises:
+            ValueError: Si l'archive n'est pas un classeur .xlsx valide
+        """
+        if self._sheet_parts is not None:
+            return self._sheet_parts
+        
+        # Le classeur principal est désigné par les relations du paquet
+        package_rels = self._read_relationships('')
+        workbook_part = next(
+            (target for rel_type, target in package_rels.values() if rel_type == REL_OFFICE_DOCUMENT),
+            None
+        )
+        if workbook_part is None:
+            raise ValueError(f"{self.file_path.name} n'est pas un classeur Excel valide")
+        
+        workbook_rels = self._read_relationships(workbook_part)
+        for rel_type, target in workbook_rels.values():
+            if rel_type == REL_SHARED_STRINGS:
+                self._shared_strings_part = target
+            elif rel_type == REL_STYLES:
+                self._styles_part = target
+        
+        sheet_parts: Dict[str, str] = {}
+        root = ET.fromstring(self.open().read(workbook_part))
+        for element in root.iter():
+            name = _local_name(element.tag)
+            if name == 'workbookPr':
+                self._date1904 = element.get('date1904') in ('1', 'true')
+            elif name == 'sheet':
+                rel_id = next(
+                    (value for key, value in element.attrib.items()
+                     if key.startswith('{') and _local_name(key) == 'id'),
+                    None
+                )
+                rel = workbook_rels.get(rel_id)
+                # Les feuilles de graphiques n'ont pas de données tabulaires
+                if rel is not None and rel[0] == REL_WORKSHEET:
+                    sheet_parts[element.get('name')] = rel[1]
+        
+        self._workbook_part = workbook_part
+        self._sheet_parts = sheet_parts
+        return sheet_parts
+    
+    def get_dimension(self, sheet_name: str) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Lire la balise <dimension ref="A1:F2000"> d'une feuille.
+        
+        Seul le début de la partie XML est lu. Une référence réduite à une
+        seule cellule (souvent écrite par défaut) est considérée comme absente.
+        
+        Args:
+            sheet_name: Nom de la feuille
+        
+        Returns:
+            Tuple (min_col, min_row, max_col, max_row) ou None si absente
+        """
+        part = self.get_sheet_parts()[sheet_name]
+        
+        with self.open().open(part) as source:
+            for _, element in ET.iterparse(source, events=('start',)):
+                name = _local_name(element.tag)
+                if name == 'dimension':
+                    ref = element.get('ref', '')
+                    if ':' not in ref:
+                        return None
+                    start, end = ref.split(':', 1)
+                    min_col, min_row = coordinate_from_string(start)
+                    max_col, max_row = coordinate_from_string(end)
+                    return (
+                        column_index_from_string(min_col), min_row,
+                        column_index_from_string(max_col), max_row
+                    )
+                if name == 'sheetData':
+                    return None
+        
+        return None
+    
+    def count_rows(self, sheet_name: str) -> Tuple[int, int]:
+        """
+        Compter les lignes d'une feuille en parcourant sa partie XML en flux.
+        
+        Utilisé lorsque la balise <dimension> est absente ; les cellules ne
+        sont pas décodées et la mémoire utilisée reste constante.
+        
+        Args:
+            sheet_name: Nom de la feuille
+        
+        Returns:
+            Tuple (dernière_ligne, dernière_colonne)
+        """
+        part = self.get_sheet_parts()[sheet_name]
+        max_row = 0
+        max_col = 0
+        
+        with self.open().open(part) as source:
+            sheet_data = None
+            for event, element in ET.iterparse(source, events=('start', 'end')):
+                name = _local_name(element.tag)
+                if event == 'start':
+                    if name == 'sheetData':
+                        sheet_data = element
+                    continue
+                if name != 'row':
+                    continue
+                max_row = int(element.get('r', max_row + 1))
+                spans = element.get('spans')
+                if spans and ':' in spans:
+                    max_col = max(max_col, int(spans.split(':')[1]))
+                else:
+                    max_col = max(max_col, len(element))
+                # Libérer les lignes déjà comptées
+                if sheet_data is not None:
+                    sheet_data.clear()
+        
+        return max_row, max_col
+    
+    def _load_date_styles(self) -> List[bool]:
+        """
+        Déterminer, pour chaque style de cellule, s'il s'agit d'un format de date.
+        
+        Returns:
+            Liste indexée par l'attribut s="N" des cellules
+        """
+        if self._date_styles is not None:
+            return self._date_styles
+        
+        self.get_sheet_parts()
+        date_styles: List[bool] = []
+        
+        if self._styles_part and self._styles_part in self.open().namelist():
+            root = ET.fromstring(self.open().read(self._styles_part))
+            custom_formats = {}
+            cell_xfs = None
+            
+            for element in root:
+                name = _local_name(element.tag)
+                if name == 'numFmts':
+                    for fmt in element:
+                        custom_formats[int(fmt.get('numFmtId'))] = fmt.get('formatCode', '')
+                elif name == 'cellXfs':
+                    cell_xfs = element
+            
+            for xf in (cell_xfs if cell_xfs is not None else []):
+                fmt_id = int(xf.get('numFmtId', 0))
+                fmt_code = custom_formats.get(fmt_id, BUILTIN_FORMATS.get(fmt_id, 'General'))
+                date_styles.append(is_date_format(fmt_code))
+        
+        self._date_styles = date_styles
+        return date_styles
+    
+    def _read_shared_strings(self, max_index: Optional[int] = None) -> List[str]:
+        """
+        Lire la table des chaînes partagées jusqu'à l'index demandé inclus.
+        
+        Args:
+            max_index: Dernier index nécessaire (None pour toute la table)
+        
+        Returns:
+            Liste des chaînes lues (éventuellement plus courte que demandé)
+        """
+        self.get_sheet_parts()
+        strings: List[str] = []
+        
+        if (max_index is not None and max_index < 0) or not self._shared_strings_part:
+            return strings
+        if self._shared_strings_part not in self.open().namelist():
+            return strings
+        
+        with self.open().open(self._shared_strings_part) as source:
+            for _, element in ET.iterparse(source, events=('end',)):
+                if _local_name(element.tag) != 'si':
+                    continue
+                # Texte brut ou texte enrichi (<r><t>), sans les annotations phonétiques
+                text = ''.join(
+                    node.text or ''
+                    for child in element
+                    if _local_name(child.tag) in ('t', 'r')
+                    for node in child.iter()
+                    if _local_name(node.tag) == 't'
+                )
+                strings.append(text)
+                element.clear()
+                if max_index is not None and len(strings) > max_index:
+                    break
+        
+        return strings
+    
+    def _parse_cell(self, cell: ET.Element, date_styles: List[bool]) -> Any:
+        """
+        Décoder la valeur brute d'une cellule <c>.
+        
+        Les références aux chaînes partagées sont renvoyées sous la forme
+        ('sst', index) pour être résolues en une seule lecture de la table.
+        """
+        cell_type = cell.get('t', 'n')
+        value = None
+        
+        for child in cell:
+            name = _local_name(child.tag)
+            if name == 'v':
+                value = child.text
+            elif name == 'is':
+                value = ''.join(node.text or '' for node in child.iter() if _local_name(node.tag) == 't')
+        
+        if value is None:
+            return None
+        
+        if cell_type == 's':
+            return ('sst', int(value))
+        if cell_type in ('str', 'inlineStr', 'e'):
+            return value
+        if cell_type == 'b':
+            return value == '1'
+        if cell_type == 'd':
+            try:
+                return datetime.fromisoformat(value)
+            except ValueError:
+                return value
+        
+        style = int(cell.get('s', 0))
+        if style < len(date_styles) and date_styles[style]:
+            epoch = CALENDAR_MAC_1904 if self._date1904 else CALENDAR_WINDOWS_1900
+            return from_excel(float(value), epoch=epoch)
+        
+        return int(value) if value.lstrip('-').isdigit() else float(value)
+    
+    def read_first_rows(self, sheet_name: str, nrows: int) -> List[List[Any]]:
+        """
+        Lire les premières lignes d'une feuille (valeurs uniquement).
+        
+        La lecture s'arrête dès que `nrows` lignes ont été décodées ; les
+        lignes absentes du fichier sont restituées comme lignes vides.
+        
+        Args:
+            sheet_name: Nom de la feuille
+            nrows: Nombre de lignes à lire
+        
+        Returns:
+            Liste de lignes (listes de valeurs), de longueur au plus `nrows`
+        """
+        part = self.get_sheet_parts()[sheet_name]
+        date_styles = self._load_date_styles()
+        rows: List[List[Any]] = []
+        
+        with self.open().open(part) as source:
+            for _, element in ET.iterparse(source, events=('end',)):
+                if _local_name(element.tag) != 'row':
+                    continue
+                
+                row_idx = int(element.get('r', len(rows) + 1))
+                while len(rows) < min(row_idx - 1, nrows):
+                    rows.append([])
+                if len(rows) >= nrows:
+                    break
+                
+                values: List[Any] = []
+                for cell in element:
+                    if _local_name(cell.tag) != 'c':
+                        continue
+                    ref = cell.get('r')
+                    col_idx = column_index_from_string(coordinate_from_string(ref)[0]) if ref else len(values) + 1
+                    values.extend([None] * (col_idx - 1 - len(values)))
+                    values.append(self._parse_cell(cell, date_styles))
+                
+                rows.append(values)
+                element.clear()
+                if len(rows) >= nrows:
+                    break
+        
+        # Résoudre les chaînes partagées en une seule lecture partielle
+        indexes = [
+            value[1] for row in rows for value in row
+            if isinstance(value, tuple) and value[0] == 'sst'
+        ]
+        if indexes:
+            strings = self._read_shared_strings(max(indexes))
+            rows = [
+                [
+                    (strings[value[1]] if value[1] < len(strings) else None)
+                    if isinstance(value, tuple) else value
+                    for value in row
+                ]
+                for row in rows
+            ]
+        
+        return rows
+    
+    def _hash_sheet(self, part: Optional[str], strings: List[str], digest) -> List[int]:
+        """
+        Ajouter le contenu d'une feuille à une empreinte (lecture en flux).
+        
+        Le XML brut est lu par blocs découpés en fin de ligne ; l'index de
+        chaque cellule à chaîne partagée y est remplacé par le texte de la
+        chaîne, sans décoder les autres cellules.
+        
+        Args:
+            part: Partie XML de la feuille
+            strings: Table des chaînes partagées
+            digest: Empreinte à compléter
+            
+        Returns:
+            Identifiants de style utilisés par la feuille, triés
+        """
+        styles = set()
+        if part is None or part not in self.open().namelist():
+            digest.update(b'\0')
+            return []
+        
+        def resolve(match: re.Match) -> bytes:
+            index = int(match.group(2))
+            text = strings[index] if index < len(strings) else ''
+            return match.group(1) + escape(text).encode('utf-8')
+        
+        def consume(data: bytes) -> None:
+            styles.update(_STYLE_ATTRIBUTE.findall(data))
+            digest.update(_SHARED_STRING_CELL.sub(resolve, data))
+        
+        pending = b''
+        with self.open().open(part) as source:
+            for block in iter(lambda: source.read(HASH_BLOCK_SIZE), b''):
+                pending += block
+                cut = pending.rfind(_ROW_END) + len(_ROW_END)
+                if cut >= len(_ROW_END):
+                    consume(pending[:cut])
+                    pending = pending[cut:]
+        consume(pending)
+        
+        return sorted(int(style) for style in styles)
+    
+    def get_content_hashes(self) -> Dict[str, str]:
+        """
+        Calculer une empreinte du contenu de chaque feuille.
+        
+        L'empreinte porte sur la partie XML brute de la feuille, sans décoder
+        les cellules, les index de chaînes partagées étant remplacés par leur
+        texte. S'y ajoutent, pour les seuls styles utilisés par la feuille,
+        leur nature (date ou non) et, si l'un d'eux est une date, le
+        calendrier 1904 : ajouter une chaîne ou un style au classeur ne
+        change que l'empreinte des feuilles qui les utilisent.
+        
+        Returns:
+            Dictionnaire ordonné {nom_feuille: empreinte_sha256}
+        """
+        sheet_parts = self.get_sheet_parts()
+        strings = self._read_shared_strings()
+        date_styles = self._load_date_styles()
+        
+        hashes: Dict[str, str] = {}
+        for sheet_name, part in sheet_parts.items():
+            digest = hashlib.sha256()
+            styles = self._hash_sheet(part, strings, digest)
+            
+            used_dates = [
+                style for style in styles
+                if style < len(date_styles) and date_styles[style]
+            ]
+            digest.update(f"\0dates:{used_dates}".encode('ascii'))
+            if used_dates:
+                digest.update(b'1904' if self._date1904 else b'1900')
+            
+            hashes[sheet_name] = digest.hexdigest()
+        
+        if self.logger:
+            self.logger.info(
+                f"Empreintes calculées pour {len(hashes)} feuille(s) de {self.file_path.name}"
+            )
+        
+        return hashes
+    
+    def __enter__(self):
+        """Support du context manager."""
+        self.open()
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Support du context manager."""
+        self.close()
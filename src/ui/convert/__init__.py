@@ -12,7 +12,9 @@ from .prompts import (
     prompt_chunk_size
 )
 from .display import (
-    show_conversion_summary
+    show_conversion_summary,
+    show_merge_result,
+    show_batch_summary
 )
 
 __all__ = [
@@ -24,5 +26,7 @@ __all__ = [
     'prompt_new_database_name',
     'confirm_action',
     'prompt_chunk_size',
-    'show_conversion_summary'
+    'show_conversion_summary',
+    'show_merge_result',
+    'show_batch_summary'
 ]
@@ -5,6 +5,7 @@ from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich import box
+from typing import Dict, List, Optional
 
 console = Console()
 
@@ -15,9 +16,10 @@ def show_conversion_summary(
     total_rows: int,
     duration: float,
     db_size: str,
-    log_file: str
+    log_file: str,
+    indexes: Optional[List[Dict]] = None
 ) -> None:
-    """Afficher le résumé final de la conversion."""
+    """Afficher le résumé final de la conversion (et le temps de création des index)."""
     rows_per_second = int(total_rows / duration) if duration > 0 else 0
     
     console.print()
@@ -43,4 +45,133 @@ def show_conversion_summary(
         padding=(1, 2)
     ))
     
+    if indexes:
+        table = Table(
+            show_header=True,
+            header_style="bold white on blue",
+            border_style="bright_blue",
+            box=box.ROUNDED,
+            expand=True
+        )
+        table.add_column("Index", style="cyan")
+        table.add_column("Table", style="white")
+        table.add_column("Colonnes", style="blue")
+        table.add_column("Unique", justify="center", style="yellow")
+        table.add_column("Durée", justify="right", style="magenta")
+        
+        for index in indexes:
+            table.add_row(
+                index['name'],
+                index['table'],
+                ', '.join(index['columns']),
+                "oui" if index['unique'] else "non",
+                f"{index['duration']:.2f}s"
+            )
+        
+        console.print(table)
+    
+    console.print()
+
+
+def show_merge_result(table_name: str, rows_read: int, merge: Dict) -> None:
+    """
+    Afficher le bilan d'une fusion dans une table existante.
+    
+    Args:
+        table_name: Nom de la table fusionnée
+        rows_read: Nombre de lignes lues dans la feuille
+        merge: Bilan {inserted, updated, deleted, index_created}
+            (DatabaseManager.last_merge)
+    """
+    console.print(
+        f"[cyan]Fusion dans '{table_name}':[/cyan] {rows_read:,} ligne(s) lue(s), "
+        f"[green]{merge['inserted']:,} insérée(s)[/green], "
+        f"[yellow]{merge['updated']:,} modifiée(s)[/yellow], "
+        f"[red]{merge['deleted']:,} supprimée(s)[/red]"
+    )
+    if merge['index_created']:
+        console.print(
+            f"[blue]ℹ️  Index unique '{merge['index_created']}' créé sur la clé de "
+            f"fusion de '{table_name}' (conservé dans la base)[/blue]"
+        )
+
+
+def show_batch_summary(
+    db_path: str,
+    results: List[Dict],
+    duration: float,
+    db_size: str,
+    log_file: str,
+    indexes: Optional[List[Dict]] = None
+) -> None:
+    """
+    Afficher le résumé d'une conversion par lots (un fichier par ligne).
+    
+    Args:
+        db_path: Chemin de la base de données
+        results: Résultats par fichier {file, sheets, rows, duration, error}
+        duration: Durée totale de la conversion
+        db_size: Taille de la base formatée
+        log_file: Chemin du fichier de log
+        indexes: Index créés après le chargement
+    """
+    table = Table(
+        show_header=True,
+        header_style="bold white on blue",
+        border_style="bright_blue",
+        box=box.ROUNDED,
+        expand=True
+    )
+    table.add_column("Fichier", style="cyan")
+    table.add_column("Feuilles", justify="right", style="white")
+    table.add_column("Lignes", justify="right", style="white")
+    table.add_column("Durée", justify="right", style="magenta")
+    table.add_column("Lignes/s", justify="right", style="blue")
+    table.add_column("Statut", style="white")
+    
+    for result in results:
+        rows_per_second = int(result['rows'] / result['duration']) if result['duration'] > 0 else 0
+        table.add_row(
+            result['file'],
+            f"{result['sheets']}",
+            f"{result['rows']:,}",
+            f"{result['duration']:.2f}s",
+            f"{rows_per_second:,}",
+            "[green]✓[/green]" if result['error'] is None else f"[red]✗ {result['error']}[/red]"
+        )
+    
+    console.print()
+    console.print(table)
+    
+    converted = [result for result in results if result['error'] is None]
+    total_rows = sum(result['rows'] for result in converted)
+    rows_per_second = int(total_rows / duration) if duration > 0 else 0
+    
+    grid = Table.grid(padding=(0, 2), expand=True)
+    grid.add_column(style="bold cyan", justify="right")
+    grid.add_column(style="white")
+    
+    grid.add_row("Fichiers convertis:", f"{len(converted)} / {len(results)}")
+    grid.add_row("Feuilles converties:", f"{sum(result['sheets'] for result in converted)}")
+    grid.add_row("Lignes insérées:", f"{total_rows:,}")
+    grid.add_row("Base de données:", f"{db_path}")
+    grid.add_row("Taille:", f"{db_size}")
+    grid.add_row("Durée:", f"{duration:.2f}s")
+    grid.add_row("Performance:", f"{rows_per_second:,} lignes/s")
+    if indexes:
+        grid.add_row("Index créés:", f"{len(indexes)}")
+    grid.add_row("Fichier de log:", f"{log_file}")
+    
+    all_converted = len(converted) == len(results)
+    console.print(Panel(
+        grid,
+        title=(
+            "[bold] Conversion par lots terminée[/bold]" if all_converted
+            else "[bold] Conversion par lots terminée avec des erreurs[/bold]"
+        ),
+        title_align="left",
+        border_style="green" if all_converted else "yellow",
+        box=box.ROUNDED,
+        padding=(1, 2)
+    ))
     console.print()
@@ -197,7 +197,10 @@ def prompt_select_sheets(sheets_info: List[dict]) -> Optional[List[str]]:
     # Préparer les choix pour questionary avec checked
     choices = [
         questionary.Choice(
-            title=f"{info['name']} ({info['rows']:,} lignes × {info['columns']} colonnes)",
+            title=(
+                f"{info['name']} ({'~' if info.get('rows_estimated') else ''}"
+                f"{info['rows']:,} lignes × {info['columns']} colonnes)"
+            ),
             value=info['name'],
             checked=True  # Présélectionné par défaut
         )
@@ -221,13 +224,18 @@ def prompt_select_sheets(sheets_info: List[dict]) -> Optional[List[str]]:
     return selected
 
 
-def prompt_conflict_action(table_name: str, existing_rows: int) -> Optional[ConflictAction]:
+def prompt_conflict_action(
+    table_name: str,
+    existing_rows: int,
+    merge_key: Optional[List[str]] = None
+) -> Optional[ConflictAction]:
     """
     Demander l'action à effectuer en cas de conflit de table existante.
     
     Args:
         table_name: Nom de la table en conflit
         existing_rows: Nombre de lignes dans la table existante
+        merge_key: Clé de fusion déclarée pour la table (propose la fusion)
         
     Returns:
         Action choisie ou None si annulé
@@ -242,16 +250,23 @@ def prompt_conflict_action(table_name: str, existing_rows: int) -> Optional[Conf
         box=box.HEAVY
     ))
     
+    choices = [
+        questionary.Choice("🔴 Écraser - Supprimer et recréer la table", value="overwrite"),
+        questionary.Choice("➕ Ajouter - Ajouter les données à la table existante", value="append"),
+        questionary.Choice("⊘ Ignorer - Passer à la feuille suivante", value="skip"),
+        questionary.Choice("✗ Annuler - Arrêter l'opération complète", value="cancel")
+    ]
+    if merge_key:
+        choices.insert(2, questionary.Choice(
+            f"🔀 Fusionner - Mettre à jour les lignes selon la clé ({', '.join(merge_key)})",
+            value="merge"
+        ))
+    
     # Utiliser questionary.select pour une navigation au clavier
     action = questionary.select(
         "Choisissez une action :",
-        choices=[
-            questionary.Choice("🔴 Écraser - Supprimer et recréer la table", value="overwrite"),
-            questionary.Choice("➕ Ajouter - Ajouter les données à la table existante", value="append"),
-            questionary.Choice("⊘ Ignorer - Passer à la feuille suivante", value="skip"),
-            questionary.Choice("✗ Annuler - Arrêter l'opération complète", value="cancel")
-        ],
-        default="append"
+        choices=choices,
+        default="merge" if merge_key else "append"
     ).ask()
     
     if action is None:
@@ -261,6 +276,7 @@ def prompt_conflict_action(table_name: str, existing_rows: int) -> Optional[Conf
     messages = {
         "overwrite": "[red]⚠️  La table sera écrasée[/red]",
         "append": "[green]✓ Les données seront ajoutées[/green]",
+        "merge": "[green]✓ Les données seront fusionnées[/green]",
         "skip": "[yellow]⊘ Feuille ignorée[/yellow]",
         "cancel": "[dim]✗ Opération annulée[/dim]"
     }
@@ -9,9 +9,14 @@ from rich.text import Text
 from rich import box
 from typing import Dict, Optional
 
+from ..utils.formatting import format_file_size
+
 # Console avec thème personnalisé
 console = Console()
 
+# Proportion de pages libres à partir de laquelle un VACUUM est conseillé
+VACUUM_FREELIST_RATIO = 0.2
+
 
 def clear_screen():
     """Effacer l'écran pour une navigation fluide entre les écrans."""
@@ -122,26 +127,55 @@ def show_database_stats(stats: Dict) -> None:
     table.add_column("Table", style="cyan")
     table.add_column("Lignes", justify="right", style="yellow")
     table.add_column("Colonnes", justify="right", style="blue")
-    table.add_column("Taille estimée", justify="right", style="magenta")
+    table.add_column("Taille", justify="right", style="magenta")
+    table.add_column("Index", justify="right", style="magenta")
     
     total_rows = 0
+    total_index_bytes = 0
+    sizes_measured = stats['size_source'] is not None
     for table_info in stats['tables']:
-        # Estimer la taille approximative par table
-        estimated_size = (table_info['rows'] * table_info['columns'] * 100) / (1024 * 1024)
-        size_str = f"{estimated_size:.2f} MB" if estimated_size > 0.01 else "< 0.01 MB"
+        # Taille réelle sur disque (pages de la table et de ses index),
+        # non mesurée en mode approximatif
+        if sizes_measured:
+            size_str = format_file_size(table_info['size_bytes'])
+            index_str = format_file_size(table_info['index_bytes']) if table_info['index_bytes'] else "-"
+            total_index_bytes += table_info['index_bytes']
+        else:
+            size_str = index_str = "?"
         
+        # Préfixe '~' : nombre de lignes estimé
+        approx_marker = "~" if table_info.get('rows_estimated') else ""
         table.add_row(
             table_info['name'],
-            f"{table_info['rows']:,}",
+            f"{approx_marker}{table_info['rows']:,}",
             str(table_info['columns']),
-            size_str
+            size_str,
+            index_str
         )
         total_rows += table_info['rows']
     
     # Ajouter une ligne de pied de page avec les totaux
     table.columns[0].footer = Text("TOTAL", style="bold white")
-    table.columns[1].footer = Text(f"{total_rows:,}", style="bold yellow")
+    any_estimated = any(table_info.get('rows_estimated') for table_info in stats['tables'])
+    table.columns[1].footer = Text(f"{'~' if any_estimated else ''}{total_rows:,}", style="bold yellow")
     table.columns[2].footer = Text(f"{stats['tables_count']} tables", style="bold blue")
     table.columns[3].footer = Text(stats['size_formatted'], style="bold magenta")
+    if sizes_measured:
+        index_footer = format_file_size(total_index_bytes) if total_index_bytes else "-"
+    else:
+        index_footer = "?"
+    table.columns[4].footer = Text(index_footer, style="bold magenta")
     
     console.print(table)
+    
+    # Pages libres : place récupérable par VACUUM
+    free_bytes = stats['freelist_count'] * stats['page_size']
+    freelist_line = (
+        f"[dim]Pages libres : {stats['freelist_count']:,} / {stats['page_count']:,} "
+        f"({stats['freelist_ratio']:.1%}, {format_file_size(free_bytes)})[/dim]"
+    )
+    if stats['freelist_ratio'] >= VACUUM_FREELIST_RATIO:
+        freelist_line += " [yellow]— VACUUM conseillé[/yellow]"
+    console.print(freelist_line)
+    if not sizes_measured:
+        console.print("[dim]Taille des tables non mesurée (--approx)[/dim]")
@@ -83,7 +83,7 @@ def show_table_list(tables_info: list) -> None:
     for info in tables_info:
         table.add_row(
             info['name'],
-            f"{info['rows']:,}",
+            f"{'~' if info.get('rows_estimated') else ''}{info['rows']:,}",
             str(info['columns'])
         )
     
@@ -163,7 +163,10 @@ def prompt_select_tables(tables_info: List[dict]) -> Optional[List[str]]:
     # Préparer les choix pour questionary avec checked
     choices = [
         questionary.Choice(
-            title=f"{info['name']} ({info['rows']:,} lignes × {info['columns']} colonnes)",
+            title=(
+                f"{info['name']} ({'~' if info.get('rows_estimated') else ''}"
+                f"{info['rows']:,} lignes × {info['columns']} colonnes)"
+            ),
             value=info['name'],
             checked=True  # Présélectionné par défaut
         )
@@ -0,0 +1,29 @@
+"""
+Formatage des valeurs affichées à l'utilisateur
+"""
+
+
+def format_file_size(size_bytes: int) -> str:
+    """
+    Formater une taille de fichier (B, KB, MB, GB).
+    
+    Args:
+        size_bytes: Taille en octets
+        
+    Returns:
+        Taille formatée
+        
+    Examples:
+        >>> format_file_size(512)
+        '512 B'
+        >>> format_file_size(1536)
+        '1.50 KB'
+    """
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    elif size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.2f} KB"
+    elif size_bytes < 1024 * 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.2f} MB"
+    else:
+        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
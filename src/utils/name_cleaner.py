@@ -151,3 +151,26 @@ def clean_and_ensure_unique(names: List[str]) -> List[str]:
     """
     cleaned = [clean_column_name(name) for name in names]
     return ensure_unique_names(cleaned)
+
+
+def is_id_column(name: str) -> bool:
+    """
+    Indiquer si un nom de colonne nettoyé désigne un identifiant.
+    
+    Sont reconnus : 'id', les noms préfixés par 'id_' (produits par
+    clean_column_name à partir de "ID Client", par exemple) et les noms
+    suffixés par '_id'.
+    
+    Args:
+        name: Nom de colonne nettoyé
+        
+    Returns:
+        True si la colonne ressemble à un identifiant
+        
+    Examples:
+        >>> is_id_column('id_client')
+        True
+        >>> is_id_column('idee')
+        False
+    """
+    return name == 'id' or name.startswith('id_') or name.endswith('_id')
@@ -0,0 +1,83 @@
+"""
+Configuration commune des tests
+"""
+import logging
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+
+# Rendre le package src importable sans installation
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+# Les bancs d'essai (mesures de durée) ne tournent que sur demande :
+# E2DB_BENCHMARK=1 python -m pytest tests
+BENCHMARK_ENV = "E2DB_BENCHMARK"
+
+# Logger de l'application (voir src.utils.logger.setup_logger)
+LOGGER_NAME = "excel_to_sqlite"
+
+
+def pytest_configure(config):
+    """Déclarer le marqueur des bancs d'essai."""
+    config.addinivalue_line(
+        "markers", f"benchmark: mesure de durée, lancée seulement avec {BENCHMARK_ENV}=1"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Ignorer les bancs d'essai sauf demande explicite."""
+    if os.environ.get(BENCHMARK_ENV) == "1":
+        return
+    skip = pytest.mark.skip(reason=f"banc d'essai ({BENCHMARK_ENV}=1 pour le lancer)")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
+def _reset_logger() -> None:
+    """Fermer les fichiers ouverts par le logger de l'application."""
+    logger = logging.getLogger(LOGGER_NAME)
+    for handler in list(logger.handlers):
+        handler.close()
+        logger.removeHandler(handler)
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    """Chemin d'une base SQLite temporaire."""
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def cli(tmp_path: Path, monkeypatch):
+    """
+    Lancer une commande de main.py dans le processus de test.
+    
+    Le journal est écrit dans le répertoire temporaire du test et non dans
+    celui du projet.
+    
+    Returns:
+        Fonction cli(*args) renvoyant le résultat de typer.testing.CliRunner
+    """
+    from typer.testing import CliRunner
+    
+    import main
+    
+    setup_logger = main.setup_logger
+    
+    def setup_test_logger(log_file=None, **kwargs):
+        return setup_logger(log_file=tmp_path / "excel_to_db.log", **kwargs)
+    
+    monkeypatch.setattr(main, "setup_logger", setup_test_logger)
+    
+    def invoke(*args):
+        return CliRunner().invoke(main.app, [str(arg) for arg in args])
+    
+    _reset_logger()
+    yield invoke
+    _reset_logger()
@@ -0,0 +1,311 @@
+"""
+Tests de la commande convert
+"""
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from src.core.database_reader import DatabaseReader
+from src.core.db_manager import DatabaseManager
+
+
+@pytest.mark.parametrize("error, exit_code", [(RuntimeError("disque plein"), 1), (KeyboardInterrupt(), 0)])
+def test_fast_load_profile_is_reverted_after_an_error(tmp_path, db_path, monkeypatch, cli, error, exit_code):
+    """Une conversion interrompue rétablit le journal d'origine de la base."""
+    excel_path = tmp_path / "data.xlsx"
+    workbook = Workbook()
+    workbook.active.title = "data"
+    workbook.active.append(["id"])
+    workbook.active.append([1])
+    workbook.save(excel_path)
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE data (id INTEGER)")
+    conn.close()
+    
+    def fail(self, table_name):
+        raise error
+    
+    # Erreur levée une fois la base ouverte avec le profil de chargement massif
+    monkeypatch.setattr(DatabaseManager, "get_manifest_entry", fail)
+    
+    result = cli("convert", "-f", excel_path, "-d", db_path, "-y", "--fast-load", "--incremental")
+    
+    assert result.exit_code == exit_code, result.output
+    conn = sqlite3.connect(db_path)
+    journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    assert journal_mode == "delete"
+    assert not db_path.with_name(db_path.name + "-wal").exists()
+
+
+def _make_workbook(path, sheets):
+    """Créer un classeur {nom_feuille: nombre de lignes} avec une colonne id."""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name, rows in sheets.items():
+        sheet = workbook.create_sheet(name)
+        sheet.append(["id", "label"])
+        for i in range(rows):
+            sheet.append([i, f"{name}-{i}"])
+    workbook.save(path)
+
+
+def _row_counts(db_path):
+    """Nombre de lignes de chaque table utilisateur."""
+    conn = sqlite3.connect(db_path)
+    tables = [
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE '\\_%' ESCAPE '\\'"
+        )
+    ]
+    counts = {table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables}
+    conn.close()
+    return counts
+
+
+def test_failed_sheet_does_not_stop_parallel_pipeline(tmp_path, db_path, monkeypatch, cli):
+    """Avec --workers et le pipeline, l'échec d'une feuille n'arrête pas les suivantes."""
+    excel_path = tmp_path / "three.xlsx"
+    _make_workbook(excel_path, {"alpha": 25_000, "beta": 25_000, "gamma": 25_000})
+    
+    insert_dataframe = DatabaseManager.insert_dataframe
+    
+    def failing_insert(self, chunks, table_name, *args, **kwargs):
+        if table_name == "beta":
+            # Le thread de lecture a déjà des blocs d'avance
+            next(iter(chunks))
+            raise RuntimeError("échec simulé")
+        return insert_dataframe(self, chunks, table_name, *args, **kwargs)
+    
+    monkeypatch.setattr(DatabaseManager, "insert_dataframe", failing_insert)
+    
+    result = cli("convert", "-f", excel_path, "-d", db_path, "-y", "--workers", 2, "--pipeline")
+    
+    assert result.exit_code == 0, result.output
+    assert "échec simulé" in result.output
+    assert _row_counts(db_path) == {"alpha": 25_000, "gamma": 25_000}
+
+
+def test_resume_continues_after_the_last_committed_chunk(tmp_path, db_path, monkeypatch, cli):
+    """Une conversion interrompue puis relancée avec --resume charge chaque ligne une fois."""
+    excel_path = tmp_path / "data.xlsx"
+    _make_workbook(excel_path, {"data": 25_000})
+    
+    insert_dataframe = DatabaseManager.insert_dataframe
+    
+    def interrupted_insert(self, df, table_name, **kwargs):
+        def stop(rows):
+            raise KeyboardInterrupt
+        
+        # Ctrl+C juste après la validation du premier bloc de 10 000 lignes
+        kwargs["on_chunk"] = stop
+        return insert_dataframe(self, df, table_name, **kwargs)
+    
+    monkeypatch.setattr(DatabaseManager, "insert_dataframe", interrupted_insert)
+    result = cli("convert", "-f", excel_path, "-d", db_path, "-y", "--resume")
+    
+    assert result.exit_code == 0, result.output
+    assert _row_counts(db_path) == {"data": 10_000}
+    
+    monkeypatch.setattr(DatabaseManager, "insert_dataframe", insert_dataframe)
+    result = cli("convert", "-f", excel_path, "-d", db_path, "-y", "--resume")
+    
+    assert result.exit_code == 0, result.output
+    assert "Reprise de 'data' après 10,000 lignes" in result.output
+    conn = sqlite3.connect(db_path)
+    ids = [row[0] for row in conn.execute("SELECT id FROM data ORDER BY id")]
+    checkpoints = conn.execute("SELECT COUNT(*) FROM _e2db_checkpoints").fetchone()[0]
+    conn.close()
+    assert ids == list(range(25_000))
+    assert checkpoints == 0
+
+
+@pytest.mark.parametrize("source", ["dir", "files"])
+def test_batch_loads_each_workbook_into_one_database(tmp_path, db_path, cli, source):
+    """--dir/--pattern ou --file répété : une base, un résumé par fichier."""
+    batch_dir = tmp_path / "lot"
+    batch_dir.mkdir()
+    _make_workbook(batch_dir / "ventes-01.xlsx", {"ventes": 3, "clients": 2})
+    _make_workbook(batch_dir / "ventes-02.xlsx", {"ventes": 4})
+    # Hors du motif : ignoré
+    _make_workbook(batch_dir / "stock.xlsx", {"stock": 5})
+    
+    if source == "dir":
+        args = ("--dir", batch_dir, "--pattern", "ventes-*.xlsx")
+    else:
+        args = ("-f", batch_dir / "ventes-01.xlsx", "-f", batch_dir / "ventes-02.xlsx")
+    result = cli("convert", *args, "-d", db_path)
+    
+    assert result.exit_code == 0, result.output
+    assert _row_counts(db_path) == {"ventes": 7, "clients": 2}
+    output = " ".join(result.output.split())
+    assert "Fichiers convertis: 2 / 2" in output
+    assert "Feuilles converties: 3" in output
+    assert "Lignes insérées: 9" in output
+
+
+def test_failed_workbook_is_rolled_back_without_stopping_the_batch(tmp_path, db_path, monkeypatch, cli):
+    """Un classeur en erreur au milieu du lot est annulé en entier, les autres sont validés."""
+    files = [tmp_path / f"ventes-0{i}.xlsx" for i in (1, 2, 3)]
+    _make_workbook(files[0], {"ventes": 3})
+    _make_workbook(files[1], {"ventes": 4, "erreur": 2})
+    _make_workbook(files[2], {"ventes": 5})
+    
+    insert_dataframe = DatabaseManager.insert_dataframe
+    
+    def failing_insert(self, df, table_name, **kwargs):
+        if table_name == "erreur":
+            raise RuntimeError("échec simulé")
+        return insert_dataframe(self, df, table_name, **kwargs)
+    
+    monkeypatch.setattr(DatabaseManager, "insert_dataframe", failing_insert)
+    result = cli("convert", "--dir", tmp_path, "--pattern", "ventes-*.xlsx", "-d", db_path)
+    
+    assert result.exit_code == 0, result.output
+    # Les 4 lignes de ventes du deuxième classeur sont annulées avec lui
+    assert _row_counts(db_path) == {"ventes": 8}
+    output = " ".join(result.output.split())
+    assert "ventes-02.xlsx: échec simulé" in output
+    assert "Fichiers convertis: 2 / 3" in output
+    assert "Lignes insérées: 8" in output
+
+
+def _make_dated_workbook(path, dates):
+    """Créer un classeur « ventes » avec deux colonnes de dates identiques."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "ventes"
+    sheet.append(["id", "commande", "livraison"])
+    for i, value in enumerate(dates):
+        sheet.append([i, value, value])
+    workbook.save(path)
+
+
+@pytest.mark.parametrize("storage, sql_type", [
+    ("epoch", "integer"),
+    ("epoch_ms", "integer"),
+    ("julian", "real"),
+])
+def test_numeric_date_storage_round_trip(tmp_path, db_path, cli, storage, sql_type):
+    """Dates numériques relues en datetime ; --column-storage l'emporte sur --datetime-storage."""
+    dates = [datetime(1969, 12, 31, 23, 59, 59), datetime(2024, 2, 29, 12, 30, 5)]
+    excel_path = tmp_path / "ventes.xlsx"
+    _make_dated_workbook(excel_path, dates)
+    
+    result = cli(
+        "convert", "-f", excel_path, "-d", db_path, "-y",
+        "--datetime-storage", storage, "--column-storage", "ventes:livraison=iso"
+    )
+    
+    assert result.exit_code == 0, result.output
+    conn = sqlite3.connect(db_path)
+    stored = conn.execute("SELECT typeof(commande), typeof(livraison) FROM ventes").fetchall()
+    conn.close()
+    assert stored == [(sql_type, "text")] * len(dates)
+    
+    with DatabaseReader(db_path, read_only=True) as reader:
+        df = pd.concat(reader.iter_table_chunks("ventes", 1))
+    
+    for column in ("commande", "livraison"):
+        assert df[column].dtype.kind == "M"
+        assert df[column].dt.round("s").tolist() == [pd.Timestamp(value) for value in dates]
+
+
+def _make_orders_workbook(path, refs):
+    """Créer un classeur « commandes » avec une référence par ligne."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "commandes"
+    sheet.append(["id_client", "jour", "ref"])
+    for i, ref in enumerate(refs):
+        sheet.append([i % 3, f"2024-01-0{i % 9 + 1}", ref])
+    workbook.save(path)
+
+
+def _indexes(db_path, table_name):
+    """Index d'une table : {colonnes: unique}."""
+    conn = sqlite3.connect(db_path)
+    indexes = {}
+    for _, name, unique, _, _ in conn.execute(f'PRAGMA index_list("{table_name}")'):
+        columns = tuple(row[2] for row in conn.execute(f'PRAGMA index_info("{name}")'))
+        indexes[columns] = bool(unique)
+    conn.close()
+    return indexes
+
+
+def test_indexes_are_created_after_the_load(tmp_path, db_path, monkeypatch, cli):
+    """--index, --unique-index et --auto-index créent leurs index une fois les lignes insérées."""
+    excel_path = tmp_path / "commandes.xlsx"
+    _make_orders_workbook(excel_path, [f"C{i}" for i in range(20)])
+    
+    calls = []
+    insert_dataframe = DatabaseManager.insert_dataframe
+    create_index = DatabaseManager.create_index
+    
+    def recording_insert(self, df, table_name, **kwargs):
+        rows = insert_dataframe(self, df, table_name, **kwargs)
+        calls.append("insert")
+        return rows
+    
+    def recording_create_index(self, table_name, columns, unique=False):
+        calls.append("index")
+        return create_index(self, table_name, columns, unique=unique)
+    
+    monkeypatch.setattr(DatabaseManager, "insert_dataframe", recording_insert)
+    monkeypatch.setattr(DatabaseManager, "create_index", recording_create_index)
+    result = cli(
+        "convert", "-f", excel_path, "-d", db_path, "-y",
+        "--index", "commandes:jour", "--unique-index", "commandes:ref", "--auto-index"
+    )
+    
+    assert result.exit_code == 0, result.output
+    assert calls == ["insert", "index", "index", "index"]
+    assert _indexes(db_path, "commandes") == {
+        ("jour",): False,
+        ("ref",): True,
+        ("id_client",): False,
+    }
+
+
+def test_unique_index_violation_keeps_the_loaded_rows(tmp_path, db_path, cli):
+    """Des doublons empêchent l'index unique sans annuler le chargement."""
+    excel_path = tmp_path / "commandes.xlsx"
+    _make_orders_workbook(excel_path, ["C1", "C2", "C1"])
+    
+    result = cli("convert", "-f", excel_path, "-d", db_path, "-y", "--unique-index", "commandes:ref")
+    
+    assert result.exit_code == 0, result.output
+    assert "Impossible de créer l'index sur 'commandes' (ref)" in " ".join(result.output.split())
+    assert _row_counts(db_path) == {"commandes": 3}
+    assert _indexes(db_path, "commandes") == {}
+
+
+def test_incremental_skips_unchanged_sheets_and_replaces_changed_ones(tmp_path, db_path, cli):
+    """--incremental : feuille inchangée ignorée, feuille modifiée remplacée (et non complétée)."""
+    excel_path = tmp_path / "data.xlsx"
+    _make_workbook(excel_path, {"alpha": 3, "beta": 4})
+    
+    result = cli("convert", "-f", excel_path, "-d", db_path, "-y", "--incremental")
+    assert result.exit_code == 0, result.output
+    assert _row_counts(db_path) == {"alpha": 3, "beta": 4}
+    # Marque effacée si la table était réécrite
+    conn = sqlite3.connect(db_path)
+    conn.execute("UPDATE alpha SET label = 'intact'")
+    conn.commit()
+    conn.close()
+    
+    _make_workbook(excel_path, {"alpha": 3, "beta": 6})
+    result = cli("convert", "-f", excel_path, "-d", db_path, "-y", "--incremental")
+    
+    assert result.exit_code == 0, result.output
+    output = " ".join(result.output.split())
+    assert "Feuille 'alpha' inchangée, ignorée" in output
+    assert "Feuille 'beta' inchangée" not in output
+    assert _row_counts(db_path) == {"alpha": 3, "beta": 6}
+    conn = sqlite3.connect(db_path)
+    labels = {row[0] for row in conn.execute("SELECT label FROM alpha")}
+    conn.close()
+    assert labels == {"intact"}
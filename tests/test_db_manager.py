@@ -0,0 +1,252 @@
+"""
+Tests du chargement des feuilles dans SQLite (DatabaseManager)
+"""
+import sqlite3
+import time
+
+import pytest
+from openpyxl import Workbook
+
+from src.core.database_reader import DatabaseReader
+from src.core.db_manager import DatabaseManager, estimate_row_count
+from src.core.excel_reader import ExcelReader
+
+
+# Taille du banc d'essai executemany / to_sql (E2DB_BENCHMARK=1)
+BENCH_ROWS = 1_000_000
+BENCH_COLUMNS = 20
+
+
+def _mixed_frame(rows: int, columns: int):
+    """DataFrame d'entiers, de réels et de textes en proportions égales."""
+    import numpy as np
+    import pandas as pd
+    
+    rng = np.random.default_rng(0)
+    data = {}
+    for i in range(columns):
+        if i % 3 == 0:
+            data[f"i{i}"] = rng.integers(0, 1_000_000, rows)
+        elif i % 3 == 1:
+            data[f"f{i}"] = rng.random(rows)
+        else:
+            data[f"t{i}"] = pd.Series(rng.integers(0, 1000, rows)).astype(str).radd("v")
+    return pd.DataFrame(data)
+
+
+def test_column_empty_in_first_chunk_keeps_numbers(tmp_path, db_path):
+    """Une colonne vide sur tout le premier bloc ne force pas le type TEXT."""
+    excel_path = tmp_path / "late_numbers.xlsx"
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "data"
+    sheet.append(["id", "x"])
+    for i in range(12000):
+        sheet.append([i, None if i < 11000 else i * 0.5])
+    workbook.save(excel_path)
+    
+    with ExcelReader(excel_path) as reader:
+        chunks = reader.iter_sheet_chunks("data", chunk_rows=10000)
+        with DatabaseManager(db_path) as db_manager:
+            db_manager.insert_dataframe(chunks, "data")
+    
+    conn = sqlite3.connect(db_path)
+    declared = {row[1]: row[2] for row in conn.execute('PRAGMA table_info("data")')}
+    stored = conn.execute(
+        'SELECT typeof(x), x FROM "data" WHERE x IS NOT NULL ORDER BY id LIMIT 1'
+    ).fetchone()
+    conn.close()
+    
+    assert declared == {"id": "INTEGER", "x": ""}
+    assert stored == ("real", 5500.0)
+
+
+def test_merge_reports_inserted_updated_and_deleted_rows(db_path):
+    """Le bilan d'une fusion distingue lignes nouvelles, modifiées et supprimées."""
+    import pandas as pd
+    
+    with DatabaseManager(db_path) as db_manager:
+        db_manager.insert_dataframe(
+            pd.DataFrame({"id": [1, 2, 3, 4], "qty": [10, 20, 30, 40]}), "stock"
+        )
+        rows_read = db_manager.insert_dataframe(
+            pd.DataFrame({"id": [1, 2, 3, 5], "qty": [10, 21, 30, 50]}),
+            "stock",
+            if_exists='merge',
+            merge_key=["id"],
+            merge_delete=True
+        )
+        merge = db_manager.last_merge
+    
+    assert rows_read == 4
+    assert merge == {'inserted': 1, 'updated': 1, 'deleted': 1, 'index_created': 'ux_stock_id'}
+
+
+def test_merge_into_a_table_whose_name_needs_quoting(db_path):
+    """Fusion et comptage des lignes d'une table dont le nom contient espace et tiret."""
+    import pandas as pd
+    
+    with DatabaseManager(db_path) as db_manager:
+        db_manager.insert_dataframe(pd.DataFrame({"id": [1, 2], "qty": [10, 20]}), "stock 2024-T1")
+        db_manager.insert_dataframe(
+            pd.DataFrame({"id": [2, 3], "qty": [21, 30]}),
+            "stock 2024-T1",
+            if_exists='merge',
+            merge_key=["id"]
+        )
+        merge = db_manager.last_merge
+        row_count = db_manager.get_row_count("stock 2024-T1")
+        stats = db_manager.get_database_stats()
+    
+    assert (merge['inserted'], merge['updated']) == (1, 1)
+    assert row_count == 3
+    assert [(table['name'], table['rows']) for table in stats['tables']] == [("stock 2024-T1", 3)]
+
+
+def test_approximate_stats_skip_the_size_scan(db_path):
+    """info --approx ne parcourt pas les pages pour mesurer les tables."""
+    import pandas as pd
+    
+    with DatabaseManager(db_path) as db_manager:
+        db_manager.insert_dataframe(pd.DataFrame({"id": range(100)}), "numbers")
+        approx = db_manager.get_database_stats(exact=False)
+        exact = db_manager.get_database_stats(exact=True)
+    
+    assert approx['size_source'] is None
+    assert approx['tables'][0]['size_bytes'] is None
+    assert approx['page_count'] == exact['page_count']
+    assert exact['size_source'] in ('dbstat', 'page_walk')
+    assert exact['tables'][0]['size_bytes'] > 0
+
+
+def test_wide_frame_exceeding_the_variable_limit_loads(tmp_path, db_path):
+    """Une feuille large passe là où to_sql(method='multi') dépasse la limite de variables."""
+    df = _mixed_frame(10_000, 30)
+    
+    conn = sqlite3.connect(tmp_path / "to_sql.db")
+    limit = conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    if df.size <= limit:
+        conn.close()
+        pytest.skip(f"limite de variables SQLite trop haute ({limit})")
+    with pytest.raises(Exception, match="too many SQL variables"):
+        df.to_sql("wide", conn, index=False, method="multi", chunksize=10_000)
+    conn.close()
+    
+    with DatabaseManager(db_path) as db_manager:
+        assert db_manager.insert_dataframe(df, "wide") == 10_000
+    
+    conn = sqlite3.connect(db_path)
+    count = conn.execute('SELECT COUNT(*) FROM "wide"').fetchone()[0]
+    conn.close()
+    assert count == 10_000
+
+
+@pytest.mark.benchmark
+def test_executemany_insert_keeps_up_with_to_sql(tmp_path, db_path):
+    """Banc d'essai : le chargement executemany n'est pas plus lent que to_sql(method='multi')."""
+    df = _mixed_frame(BENCH_ROWS, BENCH_COLUMNS)
+    # to_sql multi : un INSERT par bloc, sous la limite de variables
+    chunksize = 200_000 // BENCH_COLUMNS
+    
+    started = time.perf_counter()
+    conn = sqlite3.connect(tmp_path / "to_sql.db")
+    df.to_sql("bench", conn, index=False, method="multi", chunksize=chunksize)
+    conn.commit()
+    conn.close()
+    to_sql_seconds = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    with DatabaseManager(db_path) as db_manager:
+        db_manager.insert_dataframe(df, "bench")
+    executemany_seconds = time.perf_counter() - started
+    
+    # Marge pour les variations de charge de la machine
+    assert executemany_seconds < to_sql_seconds * 1.5
+
+
+def test_replace_keeps_index_names(db_path):
+    """Les index de la table remplacée gardent leur nom d'un remplacement à l'autre."""
+    import pandas as pd
+    
+    with DatabaseManager(db_path) as db_manager:
+        db_manager.insert_dataframe(pd.DataFrame({"id": [1, 2], "nom": ["a", "b"]}), "commandes")
+        conn = db_manager.connect()
+        conn.execute('CREATE INDEX "idx_commandes_nom" ON "commandes" ("nom")')
+        conn.execute('CREATE UNIQUE INDEX "commandes_2024" ON "commandes" ("id")')
+        conn.commit()
+        
+        for _ in range(2):
+            db_manager.insert_dataframe(
+                pd.DataFrame({"id": [1, 2, 3], "nom": ["a", "b", "c"]}),
+                "commandes",
+                if_exists='replace',
+                indexes=[{"columns": ["nom"], "unique": False}, {"columns": ["id", "nom"], "unique": False}]
+            )
+        indexes = {
+            name: table for name, table in conn.execute(
+                "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+    
+    assert indexes == {
+        "idx_commandes_nom": "commandes",
+        "commandes_2024": "commandes",
+        "idx_commandes_id_nom": "commandes",
+    }
+
+
+def test_row_estimate_ignores_sparse_integer_keys(db_path):
+    """Clé INTEGER PRIMARY KEY espacée : sqlite_stat1 ou comptage, jamais MAX(rowid)."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE sparse (id INTEGER PRIMARY KEY, v TEXT)")
+    conn.executemany("INSERT INTO sparse VALUES (?, ?)", [(1, "a"), (1_000_000, "b")])
+    # Colonne nommée rowid : le vrai rowid reste lu sous un autre nom
+    conn.execute("CREATE TABLE shadowed (rowid INTEGER, v TEXT)")
+    conn.executemany("INSERT INTO shadowed VALUES (?, ?)", [(5_000, "a"), (9_000, "b")])
+    conn.commit()
+    
+    assert estimate_row_count(conn, "sparse") is None
+    assert estimate_row_count(conn, "shadowed") == 2
+    
+    conn.execute("ANALYZE")
+    conn.execute("INSERT INTO sparse VALUES (2, 'c')")
+    conn.commit()
+    
+    # Nombre enregistré par ANALYZE, même s'il a vieilli depuis
+    assert estimate_row_count(conn, "sparse") == 2
+    conn.close()
+    
+    with DatabaseManager(db_path) as db_manager:
+        stats = {table['name']: table for table in db_manager.get_database_stats(exact=False)['tables']}
+    assert stats['sparse']['rows'] == 2
+    assert stats['sparse']['rows_estimated']
+
+
+def test_replace_and_index_a_table_whose_name_needs_quoting(db_path):
+    """Un nom de table avec espace ou tiret est protégé lors du remplacement et de l'indexation."""
+    import pandas as pd
+    
+    with DatabaseManager(db_path) as db_manager:
+        db_manager.insert_dataframe(pd.DataFrame({"id": [1, 2], "nom": ["a", "b"]}), "ventes 2024-T1")
+        db_manager.insert_dataframe(
+            pd.DataFrame({"id": [1, 2, 3], "nom": ["a", "b", "c"]}),
+            "ventes 2024-T1",
+            if_exists='replace',
+            indexes=[{"columns": ["id"], "unique": True}]
+        )
+        db_manager.create_index("ventes 2024-T1", ["nom"])
+        columns = [column['name'] for column in db_manager.get_table_info("ventes 2024-T1")]
+        indexes = [
+            row[0] for row in db_manager.connect().execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' ORDER BY name"
+            )
+        ]
+    
+    with DatabaseReader(db_path, read_only=True) as reader:
+        info = reader.get_table_info("ventes 2024-T1")
+        df = reader.read_table("ventes 2024-T1")
+    
+    assert columns == ["id", "nom"]
+    assert len(indexes) == 2
+    assert (info['rows'], info['column_names']) == (3, ["id", "nom"])
+    assert df["nom"].tolist() == ["a", "b", "c"]
@@ -0,0 +1,86 @@
+"""
+Tests de la lecture Excel (découverte des feuilles, nombre de passes)
+"""
+import pytest
+from openpyxl import Workbook
+
+from src.core.excel_reader import ExcelReader
+
+
+def _make_sheet(path, data_rows, header_row=1):
+    """Créer une feuille dont l'en-tête est à la ligne `header_row`."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "data"
+    sheet.cell(row=header_row, column=1, value="id")
+    sheet.cell(row=header_row, column=2, value="name")
+    for i in range(data_rows):
+        sheet.cell(row=header_row + 1 + i, column=1, value=i)
+        sheet.cell(row=header_row + 1 + i, column=2, value=f"n{i}")
+    workbook.save(path)
+    return path
+
+
+def _discover(path, preview_rows=10):
+    with ExcelReader(path) as reader:
+        return reader.discover_sheets(preview_rows=preview_rows)[0]
+
+
+def test_small_sheet_with_header_below_blank_rows_is_counted_exactly(tmp_path):
+    """Les lignes vides avant l'en-tête ne tronquent pas le comptage exact."""
+    info = _discover(_make_sheet(tmp_path / "offset.xlsx", data_rows=30, header_row=5))
+    
+    assert info['column_names'] == ["id", "name"]
+    assert info['rows_estimated'] is True
+    assert info['rows'] == 30
+
+
+def test_sheet_covered_by_preview_is_exact(tmp_path):
+    """Une feuille lue en entière par l'aperçu est comptée exactement."""
+    info = _discover(_make_sheet(tmp_path / "short.xlsx", data_rows=6, header_row=5))
+    
+    assert info['rows_estimated'] is False
+    assert info['rows'] == 6
+    assert len(info['preview_df']) == 6
+
+
+def test_large_sheet_is_estimated_from_dimension(tmp_path):
+    """Au-delà de l'aperçu, le nombre de lignes vient de la dimension."""
+    info = _discover(_make_sheet(tmp_path / "large.xlsx", data_rows=100, header_row=3))
+    
+    assert info['rows_estimated'] is True
+    assert info['rows'] == 100
+    assert len(info['preview_df']) == 10
+
+
+def test_convert_parses_each_sheet_once(tmp_path, db_path, monkeypatch, cli):
+    """convert n'analyse chaque feuille qu'une fois (l'analyse lit un aperçu)."""
+    from collections import Counter
+    
+    from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+    
+    excel_path = tmp_path / "two_sheets.xlsx"
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for name in ("alpha", "beta"):
+        sheet = workbook.create_sheet(name)
+        sheet.append(["id", "label"])
+        for i in range(3000):
+            sheet.append([i, f"{name}-{i}"])
+    workbook.save(excel_path)
+    
+    # Chaque parcours complet d'une feuille passe par _cells_by_row
+    parses = Counter()
+    cells_by_row = ReadOnlyWorksheet._cells_by_row
+    
+    def counting_cells_by_row(self, *args, **kwargs):
+        parses[self.title] += 1
+        return cells_by_row(self, *args, **kwargs)
+    
+    monkeypatch.setattr(ReadOnlyWorksheet, "_cells_by_row", counting_cells_by_row)
+    monkeypatch.setattr(ExcelReader, "read_sheet", lambda *args, **kwargs: pytest.fail("read_sheet appelé"))
+    
+    result = cli("convert", "-f", excel_path, "-d", db_path, "-y")
+    
+    assert result.exit_code == 0, result.output
+    assert parses == {"alpha": 1, "beta": 1}
@@ -0,0 +1,66 @@
+"""
+Tests de la lecture parallèle en flux (ParallelSheetReader, ParallelWorkbookReader)
+"""
+from openpyxl import Workbook
+
+from src.core.excel_reader import ExcelReader
+from src.core.parallel_reader import ParallelSheetReader, ParallelWorkbookReader
+
+
+def _make_workbook(path, sheets=3, rows=2500):
+    """Créer un classeur de `sheets` feuilles de `rows` lignes."""
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    for index in range(sheets):
+        sheet = workbook.create_sheet(f"S{index}")
+        sheet.append(["id", "value"])
+        for i in range(rows):
+            sheet.append([i, f"{index}-{i}"])
+    workbook.save(path)
+    return path
+
+
+def test_sheets_are_streamed_in_chunks(tmp_path):
+    """Les feuilles arrivent bloc par bloc, identiques à la lecture séquentielle."""
+    excel_path = _make_workbook(tmp_path / "multi.xlsx")
+    reader = ParallelSheetReader(excel_path, workers=2, chunk_rows=1000, max_pending=1)
+    
+    received = {
+        name: [len(chunk) for chunk in chunks]
+        for name, chunks in reader.iter_sheets(["S0", "S1", "S2"])
+    }
+    
+    assert received == {name: [1000, 1000, 500] for name in ("S0", "S1", "S2")}
+    
+    with ExcelReader(excel_path) as sequential:
+        expected = list(sequential.iter_sheet_chunks("S1", 1000))
+    streamed = dict(ParallelSheetReader(excel_path, 2, 1000).iter_sheets(["S1"]))
+    for got, want in zip(streamed["S1"], expected):
+        assert got.equals(want)
+
+
+def test_abandoned_sheets_stop_their_workers(tmp_path):
+    """Abandonner des feuilles en cours de lecture ne bloque pas le pool."""
+    excel_path = _make_workbook(tmp_path / "multi.xlsx")
+    reader = ParallelSheetReader(excel_path, workers=2, chunk_rows=500, max_pending=1)
+    
+    first_chunks = []
+    for name, chunks in reader.iter_sheets(["S0", "S1", "S2"]):
+        first_chunks.append(len(next(chunks)))
+    
+    assert first_chunks == [500, 500, 500]
+
+
+def test_workbooks_are_streamed_in_file_order(tmp_path):
+    """Les classeurs sont restitués dans l'ordre, feuille par feuille."""
+    paths = [_make_workbook(tmp_path / f"book{i}.xlsx", sheets=2, rows=1200) for i in range(3)]
+    reader = ParallelWorkbookReader(workers=2, chunk_rows=500, max_pending=1)
+    
+    received = []
+    for path, sheets, error in reader.iter_workbooks(paths):
+        assert error is None
+        # La première feuille n'est pas lue : ses blocs sont ignorés
+        info, chunks = sheets[1]
+        received.append((path.name, info['name'], sum(len(chunk) for chunk in chunks)))
+    
+    assert received == [(f"book{i}.xlsx", "S1", 1200) for i in range(3)]
@@ -0,0 +1,124 @@
+"""
+Tests de l'export parallèle vers Excel (ParallelExcelExporter)
+"""
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from src.core.database_reader import DatabaseReader
+from src.core.db_manager import DatabaseManager
+from src.core.excel_writer import ExcelWriter
+from src.core.parallel_writer import ParallelExcelExporter
+
+
+# Noms de table à assainir ou à distinguer une fois tronqués à 31 caractères
+TABLE_NAMES = [
+    "ventes/2024",
+    "ventes:2024",
+    "commandes_fournisseurs_annuelles_a",
+    "commandes_fournisseurs_annuelles_b",
+]
+
+
+def _make_database(db_path):
+    """Base contenant une table avec une colonne date par nom de TABLE_NAMES."""
+    with DatabaseManager(db_path) as db_manager:
+        for name in TABLE_NAMES:
+            db_manager.insert_dataframe(pd.DataFrame({
+                "id": range(5),
+                "libelle": [f"{name}-{i}" for i in range(5)],
+                "quand": pd.date_range("2024-01-01 08:30", periods=5, freq="D"),
+            }), name)
+
+
+def _export(db_path, excel_path, workers):
+    """Exporter toutes les tables comme la commande reverse."""
+    if workers > 1:
+        exporter = ParallelExcelExporter(excel_path, db_path, workers)
+        for _, _, error in exporter.iter_tables(TABLE_NAMES):
+            assert error is None
+        exporter.save()
+        return
+    
+    writer = ExcelWriter(excel_path, write_only=True)
+    writer.create_workbook()
+    with DatabaseReader(db_path, read_only=True) as reader:
+        for name in TABLE_NAMES:
+            writer.add_dataframe_chunks(reader.iter_table_chunks(name, 1000), name)
+    writer.save()
+
+
+def _describe(excel_path):
+    """Noms, en-têtes, valeurs, formats et largeurs de chaque feuille."""
+    workbook = load_workbook(excel_path)
+    sheets = {}
+    for ws in workbook.worksheets:
+        rows = list(ws.iter_rows())
+        sheets[ws.title] = {
+            "header_style": {cell.style for cell in rows[0]},
+            "header_fill": rows[0][0].fill.fgColor.rgb,
+            "values": [[cell.value for cell in row] for row in rows],
+            "date_format": rows[1][2].number_format,
+            "widths": [ws.column_dimensions[letter].width for letter in "ABC"],
+        }
+    return sheets
+
+
+def test_parallel_export_matches_excel_writer(tmp_path, db_path):
+    """Avec ou sans --workers, les feuilles ont les mêmes noms, styles et largeurs."""
+    _make_database(db_path)
+    sequential = tmp_path / "sequential.xlsx"
+    parallel = tmp_path / "parallel.xlsx"
+    
+    _export(db_path, sequential, workers=1)
+    _export(db_path, parallel, workers=2)
+    
+    expected = _describe(sequential)
+    assert list(expected) == [
+        "ventes_2024",
+        "ventes_20241",
+        "commandes_fournisseurs_annuelle",
+        "commandes_fournisseurs_annuell1",
+    ]
+    assert _describe(parallel) == expected
+    
+    with zipfile.ZipFile(sequential) as first, zipfile.ZipFile(parallel) as second:
+        assert second.read("xl/styles.xml") == first.read("xl/styles.xml")
+
+
+def test_temporary_sheets_are_removed_when_export_stops(tmp_path, db_path, monkeypatch, cli):
+    """Les feuilles temporaires sont supprimées si l'export échoue avant save()."""
+    _make_database(db_path)
+    temp_root = tmp_path / "tmp"
+    temp_root.mkdir()
+    monkeypatch.setattr("tempfile.tempdir", str(temp_root))
+    
+    iter_tables = ParallelExcelExporter.iter_tables
+    
+    def failing_iter_tables(self, table_names):
+        for result in iter_tables(self, table_names):
+            yield result
+            raise RuntimeError("échec simulé")
+    
+    monkeypatch.setattr(ParallelExcelExporter, "iter_tables", failing_iter_tables)
+    result = cli("reverse", "-d", db_path, "-o", tmp_path / "out.xlsx", "-y", "--workers", 2)
+    
+    assert result.exit_code == 1
+    assert "échec simulé" in result.output
+    assert list(temp_root.iterdir()) == []
+
+
+def test_save_without_sheets_removes_temporary_sheets(tmp_path, db_path):
+    """Sans aucune feuille exportée, save() échoue et nettoie le répertoire temporaire."""
+    _make_database(db_path)
+    exporter = ParallelExcelExporter(tmp_path / "out.xlsx", db_path, 2)
+    for _ in exporter.iter_tables(["absente"]):
+        pass
+    temp_dir = exporter._temp_dir
+    
+    with pytest.raises(Exception, match="Aucun classeur à sauvegarder"):
+        exporter.save()
+    
+    assert not temp_dir.exists()
@@ -0,0 +1,62 @@
+"""
+Tests de la lecture anticipée des blocs (prefetch_chunks)
+"""
+import threading
+from itertools import count
+
+import pandas as pd
+import pytest
+
+from src.core.pipeline import prefetch_chunks
+
+
+def _frames(n: int):
+    """Blocs d'une ligne numérotés de 0 à n - 1."""
+    for i in range(n):
+        yield pd.DataFrame({"n": [i]})
+
+
+def _reader_threads():
+    """Threads de lecture encore actifs."""
+    return [thread for thread in threading.enumerate() if thread.name == "excel-reader"]
+
+
+def test_chunks_keep_their_order():
+    """Les blocs sont rendus dans l'ordre de lecture, puis le thread se termine."""
+    chunks = list(prefetch_chunks(_frames(50), max_pending=2))
+    
+    assert [chunk["n"].iloc[0] for chunk in chunks] == list(range(50))
+    assert _reader_threads() == []
+
+
+def test_reader_error_reaches_the_consumer():
+    """Une erreur de lecture est relevée chez l'appelant après les blocs déjà lus."""
+    def failing():
+        yield from _frames(2)
+        raise ValueError("feuille illisible")
+    
+    received = []
+    with pytest.raises(ValueError, match="feuille illisible"):
+        for chunk in prefetch_chunks(failing()):
+            received.append(chunk["n"].iloc[0])
+    
+    assert received == [0, 1]
+    assert _reader_threads() == []
+
+
+def test_early_stop_joins_the_reader_thread():
+    """Abandonner la lecture arrête le producteur, qui ne lit que max_pending blocs d'avance."""
+    produced = []
+    
+    def endless():
+        for i in count():
+            produced.append(i)
+            yield pd.DataFrame({"n": [i]})
+    
+    chunks = prefetch_chunks(endless(), max_pending=2)
+    assert next(chunks)["n"].iloc[0] == 0
+    chunks.close()
+    
+    assert _reader_threads() == []
+    # Le bloc consommé, la file pleine et le bloc en attente d'une place
+    assert len(produced) <= 4
@@ -0,0 +1,102 @@
+"""
+Tests du temps de démarrage de la CLI (imports différés)
+"""
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+# Modules lourds que version et info ne doivent pas charger
+HEAVY_MODULES = ('pandas', 'numpy', 'openpyxl', 'questionary', 'prompt_toolkit')
+
+# Budget d'import des commandes légères (somme des imports de premier niveau),
+# vérifié seulement en banc d'essai : environ 120 ms mesurées, contre plus de
+# 400 ms pour le seul import de pandas
+STARTUP_BUDGET_MS = 250
+
+# Meilleure de plusieurs mesures, pour lisser le bruit de la machine
+RUNS = 3
+
+# Lancement de main.py avec un journal hors du répertoire du projet :
+# python -c _BOOTSTRAP <journal> <arguments de main.py>
+_BOOTSTRAP = (
+    "import sys; from pathlib import Path; import main; "
+    "setup_logger = main.setup_logger; log_path = Path(sys.argv[1]); "
+    "main.setup_logger = lambda log_file=None, **kwargs: setup_logger(log_path, **kwargs); "
+    "sys.argv = ['main.py'] + sys.argv[2:]; "
+    "main.app()"
+)
+
+
+def _import_profile(log_file: Path, *args: str):
+    """
+    Lancer main.py sous `python -X importtime`.
+    
+    Args:
+        log_file: Journal de l'application
+        args: Arguments de main.py
+    
+    Returns:
+        Tuple (modules importés, durée cumulée des imports de premier niveau en ms)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _BOOTSTRAP, str(log_file), *args],
+        capture_output=True,
+        text=True,
+        cwd=PROJECT_DIR
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    
+    modules = set()
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        modules.add(name.strip())
+        # Les modules indentés sont déjà comptés dans leur parent
+        if not name[1:].startswith(' '):
+            total_us += int(cumulative)
+    
+    return modules, total_us / 1000
+
+
+@pytest.fixture
+def small_db(tmp_path):
+    """Petite base SQLite pour la commande info."""
+    db_path = tmp_path / "small.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE t (id INTEGER, name TEXT)")
+    conn.executemany("INSERT INTO t VALUES (?, ?)", [(i, f"n{i}") for i in range(100)])
+    conn.commit()
+    conn.close()
+    return db_path
+
+
+def _command_args(command: str, small_db: Path):
+    """Arguments de main.py pour une commande légère."""
+    return ["info", str(small_db)] if command == "info" else [command]
+
+
+@pytest.mark.parametrize("command", ["version", "info"])
+def test_light_commands_skip_heavy_imports(command, small_db, tmp_path):
+    """version et info démarrent sans pandas, openpyxl ni questionary."""
+    modules, _ = _import_profile(tmp_path / "excel_to_db.log", *_command_args(command, small_db))
+    
+    assert not [module for module in HEAVY_MODULES if module in modules]
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("command", ["version", "info"])
+def test_light_commands_import_budget(command, small_db, tmp_path):
+    """Banc d'essai : les imports de version et info restent sous le budget."""
+    args = _command_args(command, small_db)
+    totals = [_import_profile(tmp_path / "excel_to_db.log", *args)[1] for _ in range(RUNS)]
+    
+    assert min(totals) < STARTUP_BUDGET_MS
@@ -0,0 +1,202 @@
+"""
+Tests de la détection des types (TypeSampler) et de l'encodage des dates
+"""
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.type_detector import (
+    TypeSampler,
+    convert_datetime_columns,
+    infer_column_types_sampled,
+    restore_datetime_columns,
+)
+
+
+# Taille du banc d'essai de la conversion des dates (E2DB_BENCHMARK=1)
+BENCH_ROWS = 1_000_000
+
+
+def _chunks(df: pd.DataFrame, size: int):
+    """Découper un DataFrame en blocs consécutifs."""
+    for start in range(0, len(df), size):
+        yield df.iloc[start:start + size]
+
+
+def test_later_chunk_promotes_the_type():
+    """Un bloc qui ne rentre plus dans le type courant le promeut."""
+    sampler = TypeSampler(sample_size=100, seed=0)
+    
+    assert sampler.update(pd.DataFrame({"n": [1, 2, 3]})) == []
+    assert sampler.column_types == {"n": "INTEGER"}
+    
+    assert sampler.update(pd.DataFrame({"n": [4.5, 5.0]})) == ["n"]
+    assert sampler.update(pd.DataFrame({"n": ["n/a"]})) == ["n"]
+    assert sampler.column_types == {"n": "TEXT"}
+    assert sampler.get_report()["n"]["promoted"]
+
+
+def test_tail_sample_catches_values_missed_by_the_reservoir():
+    """Une valeur texte en dernière ligne est vue par l'échantillon de queue."""
+    values = pd.Series(np.arange(50_000), dtype=object)
+    values.iloc[-1] = "total"
+    df = pd.DataFrame({"n": values})
+    
+    sampler = TypeSampler(sample_size=100, seed=0)
+    for chunk in _chunks(df, 10_000):
+        sampler.update(chunk)
+    
+    assert sampler.detected_types == {"n": "INTEGER"}
+    assert sampler.finalize() == ["n"]
+    assert sampler.column_types == {"n": "TEXT"}
+
+
+def test_confidence_reflects_sample_coverage():
+    """Confiance de 1 si toutes les lignes sont examinées, 1 - 3/n sinon."""
+    small = TypeSampler(sample_size=100, seed=0)
+    small.update(pd.DataFrame({"n": range(150)}))
+    small.finalize()
+    
+    assert small.get_report()["n"]["confidence"] == 1.0
+    
+    large = TypeSampler(sample_size=100, seed=0)
+    for chunk in _chunks(pd.DataFrame({"n": range(100_000)}), 10_000):
+        large.update(chunk)
+    large.finalize()
+    report = large.get_report()["n"]
+    
+    assert report["non_null_count"] == 100_000
+    assert 100 <= report["sampled_values"] < 2_000
+    assert report["confidence"] == round(1 - 3 / report["sampled_values"], 4)
+
+
+def test_tail_spans_short_last_chunk():
+    """Un dernier bloc court complète la queue : aucune ligne n'échappe à l'examen."""
+    values = pd.Series(np.arange(200), dtype=object)
+    values.iloc[120] = "n/a"
+    df = pd.DataFrame({"n": values})
+    
+    # Graine pour laquelle le réservoir ne retient pas la ligne 120
+    sampler = TypeSampler(sample_size=100, seed=3)
+    sampler.update(df.iloc[:150])
+    sampler.update(df.iloc[150:])
+    sampler.finalize()
+    
+    assert sampler.column_types == {"n": "TEXT"}
+    assert sampler.get_report()["n"]["confidence"] == 1.0
+    
+    longer = TypeSampler(sample_size=100, seed=0)
+    longer.update(pd.DataFrame({"n": range(150)}))
+    longer.update(pd.DataFrame({"n": range(150, 251)}))
+    longer.finalize()
+    
+    assert longer.get_report()["n"]["confidence"] < 1.0
+
+
+def test_dates_are_stored_as_text_and_mixed_dates_become_text():
+    """Les dates sont stockées en TEXT ; mêlées à des nombres, la colonne est TEXT."""
+    df = pd.DataFrame({
+        "quand": pd.to_datetime(["2024-01-01", None, "2024-03-01"]),
+        "mixte": pd.Series([datetime(2024, 1, 1), 3, None], dtype=object),
+        "vide": [None, None, None],
+    })
+    
+    sampler = TypeSampler(seed=0)
+    sampler.update(df)
+    sampler.finalize()
+    
+    assert sampler.detected_types == {"quand": "DATETIME", "mixte": "TEXT", "vide": None}
+    assert sampler.column_types == {"quand": "TEXT", "mixte": "TEXT", "vide": ""}
+    assert infer_column_types_sampled(df, seed=0) == sampler.column_types
+
+
+def _timestamps() -> pd.DataFrame:
+    """Dates avant et après 1970, avec un NaT, et une colonne numérique."""
+    return pd.DataFrame({
+        "quand": pd.to_datetime(["1969-12-31 23:59:59", None, "2024-02-29 12:30:05"]),
+        "n": [1.5, 2.5, 3.5],
+    })
+
+
+def test_iso_encoding_matches_strftime():
+    """Le format ISO vectorisé donne les mêmes chaînes que strftime, NaT -> None."""
+    df = _timestamps()
+    df["zone"] = df["quand"].dt.tz_localize("Europe/Paris")
+    expected = df["quand"].dt.strftime("%Y-%m-%d %H:%M:%S")
+    
+    result = convert_datetime_columns(df)
+    
+    assert result["quand"].tolist() == [expected[0], None, expected[2]]
+    assert result["zone"].tolist() == result["quand"].tolist()
+
+
+@pytest.mark.parametrize("storage, expected", [
+    ("epoch", [-1, None, 1709209805]),
+    ("epoch_ms", [-1000, None, 1709209805000]),
+    ("julian", [2440587.5 - 1 / 86400, None, 2460370.0 + 0.5 + 45005 / 86400]),
+])
+def test_numeric_encodings(storage, expected):
+    """epoch, epoch_ms et julian, NaT -> None, relus à l'identique."""
+    df = _timestamps()
+    
+    result = convert_datetime_columns(df, storage=storage)
+    
+    assert result["quand"][1] is None
+    assert result["quand"][[0, 2]].tolist() == pytest.approx([expected[0], expected[2]])
+    restored = restore_datetime_columns(result, {"quand": storage})
+    pd.testing.assert_series_equal(
+        restored["quand"].astype("datetime64[ns]"), df["quand"].astype("datetime64[ns]")
+    )
+
+
+def test_only_datetime_columns_are_copied():
+    """Les colonnes non datetime sont partagées avec le DataFrame d'origine."""
+    df = _timestamps()
+    
+    result = convert_datetime_columns(df)
+    
+    assert np.shares_memory(result["n"].to_numpy(), df["n"].to_numpy())
+    assert df["quand"].dtype.kind == "M"
+    numbers = df[["n"]]
+    assert convert_datetime_columns(numbers) is numbers
+
+
+def _best_time(function, runs: int = 3) -> float:
+    """Meilleur temps d'exécution sur plusieurs essais (secondes)."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def _strftime_conversion(df: pd.DataFrame) -> pd.DataFrame:
+    """Ancienne conversion : copie complète, strftime puis NaT -> None."""
+    result = df.copy()
+    for column in result.select_dtypes(include=["datetime64"]).columns:
+        strings = result[column].dt.strftime("%Y-%m-%d %H:%M:%S").astype(object)
+        result[column] = strings.where(strings.notna(), None)
+    return result
+
+
+@pytest.mark.benchmark
+def test_iso_encoding_benchmark():
+    """Banc d'essai : le format ISO vectorisé est plus rapide que .dt.strftime."""
+    rng = np.random.default_rng(0)
+    seconds = rng.integers(0, 40 * 365 * 86400, BENCH_ROWS)
+    stamps = pd.Series(pd.to_datetime(seconds, unit="s"))
+    stamps[::100] = pd.NaT
+    df = pd.DataFrame({"quand": stamps, "n": rng.random(BENCH_ROWS)})
+    
+    expected = _strftime_conversion(df)
+    result = convert_datetime_columns(df)
+    assert result["quand"].tolist() == expected["quand"].tolist()
+    
+    strftime_seconds = _best_time(lambda: _strftime_conversion(df))
+    vectorized_seconds = _best_time(lambda: convert_datetime_columns(df))
+    
+    assert vectorized_seconds < strftime_seconds
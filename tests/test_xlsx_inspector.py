@@ -0,0 +1,90 @@
+"""
+Tests de la lecture directe des classeurs .xlsx (XlsxInspector)
+"""
+import re
+import zipfile
+from datetime import datetime
+
+from openpyxl import Workbook
+
+from src.core.xlsx_inspector import XlsxInspector
+
+
+def _share_strings(path):
+    """
+    Remplacer les chaînes en ligne écrites par openpyxl par une table de
+    chaînes partagées, numérotée dans l'ordre des feuilles comme Excel.
+    """
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+    
+    strings = {}
+    
+    def share(match):
+        index = strings.setdefault(match.group(1), len(strings))
+        return b't="s"><v>%d</v>' % index
+    
+    for name in sorted(parts):
+        if name.startswith("xl/worksheets/sheet"):
+            parts[name] = re.sub(rb't="inlineStr"><is><t>(.*?)</t></is>', share, parts[name])
+    
+    parts["xl/sharedStrings.xml"] = (
+        b'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        + b"".join(b"<si><t>%s</t></si>" % text for text in strings)
+        + b"</sst>"
+    )
+    parts["xl/_rels/workbook.xml.rels"] = parts["xl/_rels/workbook.xml.rels"].replace(
+        b"</Relationships>",
+        b'<Relationship Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+        b'relationships/sharedStrings" Target="sharedStrings.xml" Id="rIdSst" />'
+        b"</Relationships>"
+    )
+    
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+
+
+def _make_workbook(path, first_rows, second_rows):
+    """Créer un classeur de deux feuilles 'un' et 'deux' à chaînes partagées."""
+    workbook = Workbook()
+    first = workbook.active
+    first.title = "un"
+    for row in first_rows:
+        first.append(row)
+    second = workbook.create_sheet("deux")
+    for row in second_rows:
+        second.append(row)
+    workbook.save(path)
+    _share_strings(path)
+    
+    with XlsxInspector(path) as inspector:
+        assert inspector.read_first_rows("deux", len(second_rows)) == second_rows
+        return inspector.get_content_hashes()
+
+
+def test_hash_only_changes_for_the_sheet_using_new_strings(tmp_path):
+    """Une chaîne ou un style ajouté à une feuille ne change pas l'empreinte des autres."""
+    second_rows = [["nom", "ville"], ["Durand", "Lyon"], ["Martin", "Paris"]]
+    before = _make_workbook(tmp_path / "before.xlsx", [["id", "code"], [1, "A"]], second_rows)
+    
+    # Nouvelle chaîne en tête de la table partagée (décale les index de
+    # la seconde feuille) et nouveau style de date sur la première feuille
+    after = _make_workbook(
+        tmp_path / "after.xlsx",
+        [["id", "code", "quand"], [1, "A", datetime(2024, 1, 1)], [2, "nouveau", None]],
+        second_rows
+    )
+    
+    assert after["un"] != before["un"]
+    assert after["deux"] == before["deux"]
+
+
+def test_hash_changes_with_the_strings_of_the_sheet(tmp_path):
+    """Modifier une chaîne utilisée par une feuille change son empreinte."""
+    first_rows = [["id"], [1]]
+    before = _make_workbook(tmp_path / "before.xlsx", first_rows, [["nom"], ["Durand"]])
+    after = _make_workbook(tmp_path / "after.xlsx", first_rows, [["nom"], ["Dupont"]])
+    
+    assert after["un"] == before["un"]
+    assert after["deux"] != before["deux"]